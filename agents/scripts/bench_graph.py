@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Benchmark the PlebChat LangGraph pipeline without a real LLM or wallet.
+
+Runs the compiled `graph` from src/plebchat/graph.py under N concurrent
+conversations using:
+- a deterministic fake chat model (configurable TTFT and tokens/sec)
+- a stub wallet server answering /check and /receive on localhost
+
+and reports per-node latency (validate_payment, agent, finalize), the
+pipeline overhead per turn (turn time minus LLM time minus simulated wallet
+time) and traced memory growth as the conversation history gets longer.
+
+Usage:
+    # 10 concurrent conversations, 20 turns each (defaults)
+    python scripts/bench_graph.py
+
+    # Slow model, slow wallet
+    python scripts/bench_graph.py --ttft-ms 800 --tokens-per-sec 20 --wallet-latency-ms 150
+
+    # Machine-readable output
+    python scripts/bench_graph.py --conversations 50 --turns 40 --json > bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Make `src.plebchat` importable when run as `python scripts/bench_graph.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+NODES = ("validate_payment", "agent", "finalize")
+
+
+# =============================================================================
+# FAKE CHAT MODEL
+# =============================================================================
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model that emits `response_tokens` tokens.
+
+    The first token arrives after `ttft_ms`, the rest at `tokens_per_sec`.
+    """
+
+    ttft_ms: float = 300.0
+    tokens_per_sec: float = 50.0
+    response_tokens: int = 64
+
+    @property
+    def _llm_type(self) -> str:
+        return "plebchat-bench-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.expected_seconds)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content = ""
+        async for chunk in self._astream(messages, stop=stop, run_manager=run_manager):
+            content += chunk.text
+        return self._result(content)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.ttft_ms / 1000)
+        for i in range(self.response_tokens):
+            if i:
+                await asyncio.sleep(1 / self.tokens_per_sec)
+            last = i == self.response_tokens - 1
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=f"tok{i} ",
+                    response_metadata={"finish_reason": "stop"} if last else {},
+                )
+            )
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    @property
+    def expected_seconds(self) -> float:
+        """Wall time of one completion as simulated by this model."""
+        return self.ttft_ms / 1000 + max(self.response_tokens - 1, 0) / self.tokens_per_sec
+
+    def _result(self, content: str | None = None) -> ChatResult:
+        if content is None:
+            content = "".join(f"tok{i} " for i in range(self.response_tokens))
+        message = AIMessage(content=content, response_metadata={"finish_reason": "stop"})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+# =============================================================================
+# STUB WALLET SERVER
+# =============================================================================
+
+
+class StubWalletServer:
+    """Minimal HTTP/1.1 server mimicking the backend's /api/wallet endpoints.
+
+    Supports keep-alive so pooled clients are measured fairly.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, amount: int = 1000):
+        self.latency_ms = latency_ms
+        self.amount = amount
+        self.requests = 0
+        self.connections = 0
+        self._server: asyncio.base_events.Server | None = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api/wallet"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode().split(" ", 2)
+                content_length = 0
+                keep_alive = True
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        content_length = int(value.strip())
+                    elif name.lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                self.requests += 1
+                await asyncio.sleep(self.latency_ms / 1000)
+
+                if path.endswith("/check"):
+                    payload = {"valid": True, "spent": False, "amount": self.amount, "error": None}
+                elif path.endswith("/receive"):
+                    payload = {"success": True, "amount": self.amount, "error": None, "mint": None}
+                else:
+                    payload = {"detail": "Not Found"}
+                body = json.dumps(payload).encode()
+                status = "200 OK" if "detail" not in payload else "404 Not Found"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+
+
+class TurnTimer(AsyncCallbackHandler):
+    """Collects per-node and LLM wall times for a single graph invocation."""
+
+    def __init__(self):
+        self.node_ms: dict[str, float] = {}
+        self.llm_ms = 0.0
+        self._starts: dict[Any, tuple[str | None, float]] = {}
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node runnable itself (not routers or nested chains)
+        if node and kwargs.get("name") == node:
+            self._starts[run_id] = (node, time.perf_counter())
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._starts.pop(run_id, None)
+        if started:
+            node, t0 = started
+            self.node_ms[node] = self.node_ms.get(node, 0.0) + (time.perf_counter() - t0) * 1000
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = (None, time.perf_counter())
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._starts.pop(run_id, None)
+        if started:
+            self.llm_ms += (time.perf_counter() - started[1]) * 1000
+
+
+def _summarize(values: list[float]) -> dict[str, float]:
+    """Return mean/p50/p95/max for a list of milliseconds."""
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "max": ordered[-1],
+    }
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark and return the raw report."""
+    wallet = StubWalletServer(latency_ms=args.wallet_latency_ms)
+    await wallet.start()
+    os.environ["WALLET_URL"] = wallet.url
+
+    graph_module = importlib.import_module("src.plebchat.graph")
+    logging_module = importlib.import_module("src.plebchat.logging")
+
+    model = FakeChatModel(
+        ttft_ms=args.ttft_ms,
+        tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens,
+    )
+    graph_module.create_model = lambda: model
+
+    log_dir = tempfile.mkdtemp(prefix="plebchat-bench-")
+    graph_module.agent_logger = logging_module.AgentLogger(log_dir=log_dir)
+
+    graph = graph_module.graph
+
+    node_samples: dict[str, list[float]] = {node: [] for node in NODES}
+    turn_samples: list[float] = []
+    overhead_samples: list[float] = []
+    llm_samples: list[float] = []
+    memory: list[dict[str, Any]] = []
+
+    async def run_rounds(trace_memory: bool) -> None:
+        """Run every conversation for `args.turns` rounds.
+
+        Latency and memory are measured in separate passes because
+        tracemalloc slows down allocation-heavy code considerably.
+        """
+        histories: list[list] = [[] for _ in range(args.conversations)]
+        thread_ids = [str(uuid.uuid4()) for _ in range(args.conversations)]
+
+        async def run_turn(index: int, turn: int) -> None:
+            timer = TurnTimer()
+            messages = histories[index] + [
+                HumanMessage(content=f"Question {turn} from conversation {index}")
+            ]
+            t0 = time.perf_counter()
+            result = await graph.ainvoke(
+                {
+                    "messages": messages,
+                    "payment": {"ecash_token": f"cashuBbench{uuid.uuid4().hex}", "amount_sats": 50},
+                },
+                config={"configurable": {"thread_id": thread_ids[index]}, "callbacks": [timer]},
+            )
+            total_ms = (time.perf_counter() - t0) * 1000
+            histories[index] = result["messages"]
+
+            if trace_memory:
+                return
+            turn_samples.append(total_ms)
+            llm_samples.append(timer.llm_ms)
+            overhead_samples.append(total_ms - timer.llm_ms - 2 * args.wallet_latency_ms)
+            for node, ms in timer.node_ms.items():
+                node_samples.setdefault(node, []).append(ms)
+
+        if trace_memory:
+            tracemalloc.start()
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        try:
+            for turn in range(args.turns):
+                await asyncio.gather(*(run_turn(i, turn) for i in range(args.conversations)))
+                if trace_memory:
+                    gc.collect()
+                    current = tracemalloc.get_traced_memory()[0]
+                    memory.append({
+                        "turn": turn + 1,
+                        "history_messages": len(histories[0]),
+                        "traced_kb": (current - baseline) / 1024,
+                    })
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+    started = time.perf_counter()
+    try:
+        # The graph prints progress on every node; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            await run_rounds(trace_memory=False)
+            elapsed = time.perf_counter() - started
+            wallet_requests, wallet_connections = wallet.requests, wallet.connections
+            if not args.skip_memory:
+                await run_rounds(trace_memory=True)
+    finally:
+        await graph_module.close_wallet_client()
+        await wallet.stop()
+
+    return {
+        "config": {
+            "conversations": args.conversations,
+            "turns": args.turns,
+            "ttft_ms": args.ttft_ms,
+            "tokens_per_sec": args.tokens_per_sec,
+            "response_tokens": args.response_tokens,
+            "wallet_latency_ms": args.wallet_latency_ms,
+        },
+        "elapsed_s": elapsed,
+        "turns_per_sec": len(turn_samples) / elapsed if elapsed else 0.0,
+        "wallet_requests": wallet_requests,
+        "wallet_connections": wallet_connections,
+        "nodes_ms": {node: _summarize(samples) for node, samples in node_samples.items()},
+        "turn_ms": _summarize(turn_samples),
+        "llm_ms": _summarize(llm_samples),
+        "overhead_ms": _summarize(overhead_samples),
+        "memory": memory,
+        "log_dir": log_dir,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Format the benchmark report as a human-readable table."""
+    cfg = report["config"]
+    lines = [
+        "=" * 70,
+        f"PlebChat graph benchmark: {cfg['conversations']} conversations x {cfg['turns']} turns",
+        f"Fake LLM: TTFT {cfg['ttft_ms']}ms, {cfg['tokens_per_sec']} tok/s, "
+        f"{cfg['response_tokens']} tokens | wallet stub: {cfg['wallet_latency_ms']}ms",
+        "=" * 70,
+        f"{'Metric (ms)':<22} {'mean':>10} {'p50':>10} {'p95':>10} {'max':>10}",
+        "-" * 70,
+    ]
+
+    def row(label: str, stats: dict[str, float]) -> str:
+        return (
+            f"{label:<22} {stats['mean']:>10.2f} {stats['p50']:>10.2f} "
+            f"{stats['p95']:>10.2f} {stats['max']:>10.2f}"
+        )
+
+    for node, stats in report["nodes_ms"].items():
+        lines.append(row(f"node:{node}", stats))
+    lines.append(row("llm", report["llm_ms"]))
+    lines.append(row("turn total", report["turn_ms"]))
+    lines.append(row("overhead per turn", report["overhead_ms"]))
+    lines.append("-" * 70)
+    lines.append(
+        f"Throughput: {report['turns_per_sec']:.1f} turns/s over {report['elapsed_s']:.1f}s | "
+        f"wallet: {report['wallet_requests']} requests on {report['wallet_connections']} connections"
+    )
+    lines.append("")
+    lines.append(f"{'Turn':>6} {'History msgs':>14} {'Traced KB':>12} {'Delta KB':>10}")
+    previous = 0.0
+    for sample in report["memory"]:
+        delta = sample["traced_kb"] - previous
+        previous = sample["traced_kb"]
+        lines.append(
+            f"{sample['turn']:>6} {sample['history_messages']:>14} "
+            f"{sample['traced_kb']:>12.1f} {delta:>10.1f}"
+        )
+    lines.append("=" * 70)
+    lines.append(f"Agent logs written to: {report['log_dir']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the PlebChat graph with a fake LLM and stub wallet",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--conversations", "-n", type=int, default=10, help="Concurrent conversations")
+    parser.add_argument("--turns", "-t", type=int, default=20, help="Turns per conversation")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Fake LLM time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="Fake LLM generation speed")
+    parser.add_argument("--response-tokens", type=int, default=64, help="Tokens per fake response")
+    parser.add_argument("--wallet-latency-ms", type=float, default=20.0, help="Stub wallet latency per call")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc memory pass")
+    parser.add_argument("--json", action="store_true", help="Output the raw report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
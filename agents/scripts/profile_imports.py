@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Profile agent startup import time and enforce an import-time budget.
+
+Runs the shared profiler (scripts/profile_imports.py at the repo root) on
+src.plebchat.graph and fails if langchain_openai or openai is loaded at
+startup or the import takes over 2000 ms. Other arguments are passed through.
+
+Usage:
+    python scripts/profile_imports.py                  # report top 25 imports, check the budget
+    python scripts/profile_imports.py --budget-ms 0    # report only
+    python scripts/profile_imports.py --module src.plebchat.logging
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+AGENTS_DIR = Path(__file__).parent.parent
+PROFILER = AGENTS_DIR.parent / "scripts" / "profile_imports.py"
+
+# Import-time budget in ms (override with --budget-ms)
+BUDGET_MS = 2000
+
+# Modules that must only be imported on first use, never at startup
+FORBIDDEN = ["langchain_openai", "openai"]
+
+if __name__ == "__main__":
+    sys.exit(subprocess.call([
+        sys.executable, str(PROFILER),
+        "--cwd", str(AGENTS_DIR),
+        "--module", "src.plebchat.graph",
+        "--forbid", ",".join(FORBIDDEN),
+        "--budget-ms", str(BUDGET_MS),
+        *sys.argv[1:],
+    ]))
@@ -1,5 +1,21 @@
-"""PlebChat LangGraph Agent."""
+"""PlebChat LangGraph Agent.
 
-from src.plebchat.graph import graph
+`graph` is the compiled graph (also exposed as `src.plebchat.graph:graph`,
+see langgraph.json). It is only built on first access.
+"""
 
-__all__ = ["graph"]
\ No newline at end of file
+from src.plebchat.graph import get_graph
+
+# Importing the submodule bound `graph` to it; unbind it so the name
+# resolves to the compiled graph through __getattr__
+globals().pop("graph")
+
+
+def __getattr__(name: str):
+    """Resolve `graph` lazily, like `src.plebchat.graph` does."""
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["graph", "get_graph"]
@@ -13,21 +13,49 @@ Payment flow (redeem-first):
 5. On LLM failure: user loses payment (we already did the work of receiving)
 
 This ensures we NEVER call the LLM without confirmed payment.
+
+Startup cost: langchain_openai is imported on first model creation and the
+graph is compiled on first access of `graph` (see `get_graph`), so LangGraph
+worker spawns don't pay for either before the first run.
+
+The model is built once per provider config (see `get_model`) and its
+connection to the LLM endpoint is warmed while the payment is being checked,
+so connection setup stays out of time-to-first-token.
+
+Speculative mode (SPECULATIVE_LLM=1): once the token passes /check, the LLM
+call starts alongside /receive with its output held back. agent_node releases
+it only after redemption succeeded; a failed redemption cancels it. The
+guarantee above still holds: no LLM output reaches the client unpaid.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 import uuid
-from typing import Annotated, Literal, TypedDict
+from typing import Annotated, Any, Literal, TypedDict
 
 import httpx
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    message_chunk_to_message,
+)
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 
+from src.plebchat.history import (
+    current_summary,
+    forget_summary,
+    history_token_budget,
+    schedule_summary,
+    split_history,
+    summary_enabled,
+)
 from src.plebchat.logging import agent_logger
 
 
@@ -63,6 +91,8 @@ class AgentState(TypedDict):
     refund_token: str | None  # Token to return for refund (unredeemed)
     error: str | None  # Error message if request failed
     run_id: str | None  # Unique ID for this run (for logging)
+    summary: str | None  # Rolling summary of turns trimmed from the prompt
+    summary_through: str | None  # Id of the last message folded into the summary
 
 
 # =============================================================================
@@ -94,6 +124,130 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", LLM_PROVIDER_PLEBCHAT).lower()
 XAI_API_BASE_URL = "https://api.x.ai/v1"
 XAI_DEFAULT_MODEL = "grok-4-fast-non-thinking"
 
+# Connection pool of each model's HTTP client
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_KEEPALIVE_EXPIRY_SECONDS = 120.0
+LLM_CONNECT_TIMEOUT_SECONDS = 10.0
+LLM_READ_TIMEOUT_SECONDS = 120.0
+
+
+def _model_config() -> tuple[str, str | None, str | None, str | None]:
+    """Current provider config from the environment: (provider, base URL, model, API key)."""
+    provider = os.getenv("LLM_PROVIDER", LLM_PROVIDER_PLEBCHAT).lower()
+    if provider == LLM_PROVIDER_GROK:
+        return (
+            provider,
+            XAI_API_BASE_URL,
+            os.getenv("XAI_DEFAULT_MODEL", XAI_DEFAULT_MODEL),
+            os.getenv("XAI_API_KEY"),
+        )
+    return provider, os.getenv("LLM_BASE_URL"), os.getenv("LLM_MODEL"), os.getenv("LLM_API_KEY")
+
+
+# Model registry: (provider config, event loop) -> model. Only the current
+# config is kept; the pooled HTTP client is bound to the loop it runs on.
+_models: dict[tuple, Any] = {}
+_warmups: dict[tuple, asyncio.Task] = {}
+# Background tasks closing the clients of replaced models
+_closing: set[asyncio.Task] = set()
+
+
+def _registry_key() -> tuple:
+    return (*_model_config(), id(asyncio.get_running_loop()))
+
+
+def get_model():
+    """Get the chat model for the current provider config, building it once.
+
+    Connections (and TLS sessions) to the LLM endpoint stay open in the
+    model's pooled HTTP client across turns. Changing LLM_PROVIDER,
+    the base URL, model or API key builds a new model on the next turn
+    and closes the old model's client in the background.
+    Must be called from the event loop that runs the graph.
+    """
+    key = _registry_key()
+    model = _models.get(key)
+    if model is None:
+        replaced = list(_models.values())
+        _models.clear()
+        model = create_model()
+        _models[key] = model
+        loop = asyncio.get_running_loop()
+        for old in replaced:
+            task = loop.create_task(_close_model_client(old))
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+    return model
+
+
+async def _close_model_client(model: Any) -> None:
+    """Close a model's pooled HTTP client, if it has one."""
+    client = getattr(model, "http_async_client", None)
+    if client is None:
+        return
+    try:
+        await client.aclose()
+    except Exception as e:
+        # A client bound to a loop that has since closed can't be closed cleanly
+        print(f"[LLM] Closing model client failed: {e}")
+
+
+async def close_models() -> None:
+    """Close the pooled HTTP clients of all registered models."""
+    models = list(_models.values())
+    _models.clear()
+    _warmups.clear()
+    for model in models:
+        await _close_model_client(model)
+
+
+async def warm_model() -> None:
+    """Build the model and open a pooled connection to its endpoint."""
+    started = time.perf_counter()
+    try:
+        model = get_model()
+        client = getattr(model, "http_async_client", None)
+        base_url = getattr(model, "openai_api_base", None)
+        if client is None or not base_url:
+            return
+        api_key = getattr(model, "openai_api_key", None)
+        headers = {"Authorization": f"Bearer {api_key.get_secret_value()}"} if api_key else {}
+        # Any response will do: the point is the TCP/TLS connection left in the pool
+        await client.get(f"{base_url.rstrip('/')}/models", headers=headers)
+        print(f"[LLM] Warmed connection to {base_url} in {(time.perf_counter() - started) * 1000:.0f}ms")
+    except Exception as e:
+        print(f"[LLM] Connection warmup failed: {e}")
+
+
+def schedule_model_warmup() -> None:
+    """Warm the current model in the background, once per provider config.
+
+    Disabled with LLM_WARMUP=0. Without a running event loop this is a
+    no-op and the first turn connects instead.
+    """
+    if os.getenv("LLM_WARMUP", "1") == "0":
+        return
+    try:
+        key = _registry_key()
+    except RuntimeError:
+        return
+    if key not in _warmups:
+        _warmups.clear()
+        _warmups[key] = asyncio.get_running_loop().create_task(warm_model())
+
+
+def _create_http_async_client() -> httpx.AsyncClient:
+    """Keep-alive HTTP client with a tuned pool for one model."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_READ_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+
 
 def create_model():
     """Create the LLM model based on the configured provider.
@@ -103,8 +257,9 @@ def create_model():
     - grok: xAI Grok API (grok-4-fast-non-thinking)
 
     Set LLM_PROVIDER environment variable to switch between them.
+    Builds a new client every call; use `get_model` to reuse one.
     """
-    provider = LLM_PROVIDER
+    provider = _model_config()[0]
 
     if provider == LLM_PROVIDER_GROK:
         return _create_grok_model()
@@ -132,6 +287,8 @@ def _create_grok_model():
             "Get your API key from https://console.x.ai/"
         )
 
+    from langchain_openai import ChatOpenAI
+
     print(f"[LLM] Using Grok provider: {model_name}")
 
     return ChatOpenAI(
@@ -140,6 +297,7 @@ def _create_grok_model():
         model=model_name,
         temperature=0.7,
         streaming=True,
+        http_async_client=_create_http_async_client(),
     )
 
 
@@ -165,6 +323,8 @@ def _create_plebchat_model():
             "Set it to your model name (e.g., llama3.2, mistral, etc.)"
         )
 
+    from langchain_openai import ChatOpenAI
+
     print(f"[LLM] Using PlebChat provider: {model_name} at {base_url}")
 
     return ChatOpenAI(
@@ -173,6 +333,7 @@ def _create_plebchat_model():
         model=model_name,
         temperature=0.7,
         streaming=True,
+        http_async_client=_create_http_async_client(),
     )
 
 
@@ -211,53 +372,113 @@ def get_required_amount(agent_id: str = "plebchat", is_first_message: bool = Tru
 # PAYMENT VALIDATION
 # =============================================================================
 
+# Connection pool of the wallet backend client
+WALLET_MAX_CONNECTIONS = 50
+WALLET_MAX_KEEPALIVE_CONNECTIONS = 20
+WALLET_KEEPALIVE_EXPIRY_SECONDS = 60.0
+WALLET_CONNECT_TIMEOUT_SECONDS = 5.0
+WALLET_READ_TIMEOUT_SECONDS = 30.0  # /receive waits on a mint swap
+
+# Event loop id -> wallet backend client (only the current loop's is kept)
+_wallet_clients: dict[int, httpx.AsyncClient] = {}
+
+
+def get_wallet_client() -> httpx.AsyncClient:
+    """Get the shared keep-alive client for WALLET_URL, creating it on first use.
+
+    Must be called from the event loop that runs the graph.
+    """
+    key = id(asyncio.get_running_loop())
+    client = _wallet_clients.get(key)
+    if client is None or client.is_closed:
+        _wallet_clients.clear()
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=WALLET_MAX_CONNECTIONS,
+                max_keepalive_connections=WALLET_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=WALLET_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(WALLET_READ_TIMEOUT_SECONDS, connect=WALLET_CONNECT_TIMEOUT_SECONDS),
+        )
+        _wallet_clients[key] = client
+    return client
+
+
+async def close_wallet_client() -> None:
+    """Close the shared wallet backend client, if any."""
+    clients = list(_wallet_clients.values())
+    _wallet_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def _post_to_wallet(
+    endpoint: str, payload: dict, thread_id: str, run_id: str
+) -> httpx.Response:
+    """POST to the wallet backend, logging the call's latency."""
+    wallet_url = os.getenv("WALLET_URL", "http://localhost:8000/api/wallet")
+    started = time.perf_counter()
+    status_code = None
+    error = None
+    try:
+        response = await get_wallet_client().post(f"{wallet_url}{endpoint}", json=payload)
+        status_code = response.status_code
+        return response
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        agent_logger.log_backend_call(
+            thread_id,
+            run_id,
+            endpoint,
+            status_code=status_code,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+            error=error,
+        )
+
 
 async def validate_token_with_backend(
-    token: str, required_amount: int
+    token: str, required_amount: int, thread_id: str = "unknown", run_id: str = "unknown"
 ) -> tuple[bool, int, str | None]:
     """Validate token via backend - checks format, spend state, and amount.
     
     Args:
         token: The cashu ecash token string
         required_amount: Minimum amount required in sats
+        thread_id: Thread to log the backend call under
+        run_id: Run to log the backend call under
         
     Returns:
         Tuple of (is_valid, actual_amount, error_message)
     """
-    wallet_url = os.getenv("WALLET_URL", "http://localhost:8000/api/wallet")
-    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{wallet_url}/check",
-                json={"token": token},
-                timeout=30.0,
-            )
-            
-            if response.status_code != 200:
-                print(f"[Payment] Backend check failed: {response.status_code}")
-                return False, 0, f"Backend error: {response.status_code}"
-            
-            result = response.json()
-            
-            if not result.get("valid"):
-                error = result.get("error", "Invalid token")
-                print(f"[Payment] Token invalid: {error}")
-                return False, 0, error
-            
-            if result.get("spent"):
-                print("[Payment] Token already spent")
-                return False, 0, "Token already spent"
-            
-            actual_amount = result.get("amount", 0)
-            
-            if actual_amount < required_amount:
-                error = f"Insufficient amount: {actual_amount} < {required_amount} sats required"
-                print(f"[Payment] {error}")
-                return False, actual_amount, error
-            
-            print(f"[Payment] Token validated: {actual_amount} sats (required: {required_amount})")
-            return True, actual_amount, None
+        response = await _post_to_wallet("/check", {"token": token}, thread_id, run_id)
+        
+        if response.status_code != 200:
+            print(f"[Payment] Backend check failed: {response.status_code}")
+            return False, 0, f"Backend error: {response.status_code}"
+        
+        result = response.json()
+        
+        if not result.get("valid"):
+            error = result.get("error", "Invalid token")
+            print(f"[Payment] Token invalid: {error}")
+            return False, 0, error
+        
+        if result.get("spent"):
+            print("[Payment] Token already spent")
+            return False, 0, "Token already spent"
+        
+        actual_amount = result.get("amount", 0)
+        
+        if actual_amount < required_amount:
+            error = f"Insufficient amount: {actual_amount} < {required_amount} sats required"
+            print(f"[Payment] {error}")
+            return False, actual_amount, error
+        
+        print(f"[Payment] Token validated: {actual_amount} sats (required: {required_amount})")
+        return True, actual_amount, None
             
     except httpx.TimeoutException:
         print("[Payment] Backend timeout during validation")
@@ -267,36 +488,186 @@ async def validate_token_with_backend(
         return False, 0, f"Validation failed: {str(e)}"
 
 
-async def redeem_token_to_wallet(token: str) -> bool:
-    """Redeem a Cashu token to the backend wallet service."""
-    wallet_url = os.getenv("WALLET_URL", "http://localhost:8000/api/wallet")
-
+async def redeem_token_to_wallet(
+    token: str, agent_id: str = "plebchat", thread_id: str = "unknown", run_id: str = "unknown"
+) -> bool:
+    """Redeem a Cashu token to the backend wallet service.
+    
+    The agent id is passed along so the backend can break revenue down by agent.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{wallet_url}/receive",
-                json={"token": token},
-                timeout=30.0,
-            )
+        response = await _post_to_wallet(
+            "/receive", {"token": token, "agent_id": agent_id}, thread_id, run_id
+        )
 
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    amount = result.get("amount", 0)
-                    print(f"[Payment] Successfully redeemed {amount} sats to wallet")
-                    return True
-                else:
-                    print(f"[Payment] Wallet rejected token: {result.get('error')}")
-                    return False
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("success"):
+                amount = result.get("amount", 0)
+                print(f"[Payment] Successfully redeemed {amount} sats to wallet")
+                return True
             else:
-                print(f"[Payment] Failed to redeem: {response.text}")
+                print(f"[Payment] Wallet rejected token: {result.get('error')}")
                 return False
+        else:
+            print(f"[Payment] Failed to redeem: {response.text}")
+            return False
 
     except Exception as e:
         print(f"[Payment] Redemption error: {e}")
         return False
 
 
+# =============================================================================
+# LLM STREAMING
+# =============================================================================
+
+
+def build_prompt(state: AgentState) -> tuple[list[BaseMessage], list[BaseMessage]]:
+    """Messages sent to the LLM for the current turn.
+
+    History is trimmed to the token budget (see history.py); the rolling
+    summary, if any, is appended to the system prompt.
+
+    Returns:
+        (prompt, older messages left out of it)
+    """
+    messages = state["messages"]
+    budget = history_token_budget()
+    older, recent = split_history(messages, budget)
+    if older:
+        print(f"[Agent] History trimmed to {len(recent)} of {len(messages)} messages ({budget} token budget)")
+    system_prompt = SYSTEM_PROMPT
+    if state.get("summary"):
+        system_prompt += f"\nSummary of the earlier conversation:\n{state['summary']}\n"
+    return [SystemMessage(content=system_prompt)] + recent, older
+
+
+async def stream_completion(
+    model: Any, messages: list[BaseMessage], config: RunnableConfig
+) -> tuple[AIMessage, dict[str, Any]]:
+    """Stream a completion under the node's config and accumulate its chunks.
+
+    LangGraph's message streaming picks each chunk up through the config's
+    callbacks, so the client sees tokens as they are generated.
+
+    Returns:
+        (complete message, stats with ttft_ms, output_tokens and tokens_per_sec)
+    """
+    started = time.perf_counter()
+    first_token_at = None
+    content_chunks = 0
+    response = None
+    async for chunk in model.astream(messages, config=config):
+        if chunk.content:
+            content_chunks += 1
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+        response = chunk if response is None else response + chunk
+    finished = time.perf_counter()
+
+    if response is None:
+        raise RuntimeError("LLM returned an empty stream")
+    # Chunk count stands in for tokens when the endpoint reports no usage
+    usage = response.usage_metadata or {}
+    output_tokens = usage.get("output_tokens") or content_chunks
+    generating = finished - first_token_at if first_token_at is not None else 0.0
+    stats = {
+        "ttft_ms": int((first_token_at - started) * 1000) if first_token_at is not None else None,
+        "output_tokens": output_tokens,
+        "tokens_per_sec": round(output_tokens / generating, 1) if generating > 0 else None,
+    }
+    return message_chunk_to_message(response), stats
+
+
+# =============================================================================
+# SPECULATIVE LLM START
+# =============================================================================
+
+# Seconds a speculative call waits for agent_node before it is discarded, for
+# runs cancelled or failed between validate_payment_node and agent_node
+SPECULATIVE_MAX_WAIT_SECONDS = 120.0
+
+# Run id -> (LLM call started before redemption finished, its chunk buffer,
+# start time, timer discarding it after SPECULATIVE_MAX_WAIT_SECONDS)
+_speculative_runs: dict[str, tuple[asyncio.Task, asyncio.Queue, float, asyncio.TimerHandle]] = {}
+
+
+def speculative_llm_enabled() -> bool:
+    """Whether to start the LLM while the token is being redeemed (SPECULATIVE_LLM=1)."""
+    return os.getenv("SPECULATIVE_LLM", "0") == "1"
+
+
+async def _speculate(model: Any, messages: list[BaseMessage], buffer: asyncio.Queue) -> float:
+    try:
+        # No callbacks: LangGraph streams tokens to the client through them
+        async for chunk in model.astream(messages, config={"callbacks": []}):
+            buffer.put_nowait(chunk)
+    finally:
+        buffer.put_nowait(None)
+    return time.perf_counter()
+
+
+def start_speculative_llm(run_id: str, messages: list[BaseMessage]) -> None:
+    """Start the LLM call for a run whose payment is not redeemed yet.
+
+    Chunks are buffered until `take_speculative_llm` is called from
+    agent_node, which only runs after redemption succeeded.
+    """
+    buffer: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_speculate(get_model(), messages, buffer))
+    expiry = asyncio.get_running_loop().call_later(
+        SPECULATIVE_MAX_WAIT_SECONDS, _expire_speculative_llm, run_id, task
+    )
+    _speculative_runs[run_id] = (task, buffer, time.perf_counter(), expiry)
+    print("[Agent] Speculative LLM call started during redemption")
+
+
+def _pop_speculative_llm(run_id: str) -> tuple[asyncio.Task, asyncio.Queue, float] | None:
+    entry = _speculative_runs.pop(run_id, None)
+    if entry is None:
+        return None
+    task, buffer, started, expiry = entry
+    expiry.cancel()
+    return task, buffer, started
+
+
+def _expire_speculative_llm(run_id: str, task: asyncio.Task) -> None:
+    """Discard a speculative call whose run never reached agent_node."""
+    entry = _speculative_runs.get(run_id)
+    if entry is not None and entry[0] is task:
+        del _speculative_runs[run_id]
+        task.cancel()
+        print("[Agent] Speculative LLM call expired before the agent took it")
+
+
+def cancel_speculative_llm(run_id: str) -> None:
+    """Cancel a run's speculative LLM call, discarding its output."""
+    entry = _pop_speculative_llm(run_id)
+    if entry is not None:
+        entry[0].cancel()
+        print("[Agent] Speculative LLM call cancelled")
+
+
+def take_speculative_llm(run_id: str) -> tuple[Any, asyncio.Task, int] | None:
+    """Release a run's speculative LLM call.
+
+    Returns:
+        (model streaming the buffered and remaining chunks, the call's task,
+        latency saved in ms) or None if no call was started
+    """
+    entry = _pop_speculative_llm(run_id)
+    if entry is None:
+        return None
+    task, buffer, started = entry
+    from src.plebchat.replay import BufferedChatModel
+
+    # Time the LLM ran before it would otherwise have been started
+    finished = task.result() if task.done() and not task.exception() else time.perf_counter()
+    saved_ms = int((finished - started) * 1000)
+    return BufferedChatModel(buffer=buffer), task, saved_ms
+
+
 # =============================================================================
 # GRAPH NODES
 # =============================================================================
@@ -310,6 +681,9 @@ async def validate_payment_node(state: AgentState, config: RunnableConfig) -> di
     
     Uses the backend's /check endpoint to validate, then /receive to redeem.
     """
+    # Connect to the LLM endpoint while the payment round trips run
+    schedule_model_warmup()
+
     # Get thread_id and run_id for logging
     thread_id = get_thread_id(config)
     run_id = state.get("run_id") or str(uuid.uuid4())
@@ -373,7 +747,9 @@ async def validate_payment_node(state: AgentState, config: RunnableConfig) -> di
     print("[Payment] ====================================================")
 
     # Step 1: Validate token with backend (checks format, spend state, and amount)
-    is_valid, actual_amount, error = await validate_token_with_backend(token, required_amount)
+    is_valid, actual_amount, error = await validate_token_with_backend(
+        token, required_amount, thread_id, run_id
+    )
 
     if not is_valid:
         print(f"[Payment] Token validation failed: {error}")
@@ -393,9 +769,18 @@ async def validate_payment_node(state: AgentState, config: RunnableConfig) -> di
     # Step 2: IMMEDIATELY redeem the token BEFORE calling the LLM
     # This prevents users from getting free LLM calls
     print(f"[Payment] Token validated ({actual_amount} sats), redeeming NOW...")
-    redeemed = await redeem_token_to_wallet(token)
+    if speculative_llm_enabled():
+        # Output stays buffered until agent_node, i.e. until redemption succeeded
+        prompt, _ = build_prompt({**state, **current_summary(thread_id, state)})
+        start_speculative_llm(run_id, prompt)
+    try:
+        redeemed = await redeem_token_to_wallet(token, agent_id, thread_id, run_id)
+    except BaseException:
+        cancel_speculative_llm(run_id)
+        raise
     
     if not redeemed:
+        cancel_speculative_llm(run_id)
         print("[Payment] !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print("[Payment] CRITICAL: Token redemption FAILED - blocking LLM call")
         print("[Payment] Returning token for client-side refund")
@@ -449,15 +834,35 @@ async def agent_node(state: AgentState, config: RunnableConfig) -> dict:
             "error": error_msg,
         }
 
+    # Pick up a summary finished in the background since the last turn
+    summary = current_summary(thread_id, state)
+    state = {**state, **summary}
+
     try:
-        model = create_model()
+        speculative = take_speculative_llm(run_id)
+        if speculative is not None:
+            # Payment is redeemed: release the output buffered during redemption
+            model, speculative_task, saved_ms = speculative
+            print(f"[Agent] Releasing speculative LLM response ({saved_ms}ms saved)")
+        else:
+            model, speculative_task, saved_ms = get_model(), None, None
+            print("[Agent] Streaming LLM response...")
 
         # Build messages with system prompt
-        messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
-
-        print("[Agent] Invoking LLM...")
-        response = await model.ainvoke(messages)
-        print("[Agent] LLM response received")
+        messages, older = build_prompt(state)
+
+        try:
+            response, stats = await stream_completion(model, messages, config)
+            if speculative_task is not None:
+                # Surface errors of the speculative call
+                await speculative_task
+        finally:
+            if speculative_task is not None:
+                speculative_task.cancel()  # no-op once it finished
+        print(
+            f"[Agent] LLM response received (TTFT {stats['ttft_ms']}ms, "
+            f"{stats['tokens_per_sec']} tokens/s)"
+        )
 
         # Log the LLM response
         agent_logger.log_llm_response(
@@ -469,9 +874,18 @@ async def agent_node(state: AgentState, config: RunnableConfig) -> dict:
                 if hasattr(response, "response_metadata")
                 else None
             ),
+            speculative_saved_ms=saved_ms,
+            **stats,
         )
 
-        return {"messages": [response], "error": None}
+        forget_summary(thread_id, summary["summary_through"])
+        if summary_enabled() and thread_id != "unknown":
+            # Fold what this prompt left out into the summary, off the response path
+            schedule_summary(
+                thread_id, get_model(), summary["summary"], summary["summary_through"], older
+            )
+
+        return {"messages": [response], "error": None, **summary}
 
     except Exception as e:
         error_msg = str(e)
@@ -542,23 +956,42 @@ def route_after_validation(state: AgentState) -> Literal["agent", "end"]:
 # GRAPH CONSTRUCTION
 # =============================================================================
 
-# Build the graph
-builder = StateGraph(AgentState)
 
-# Add nodes
-builder.add_node("validate_payment", validate_payment_node)
-builder.add_node("agent", agent_node)
-builder.add_node("finalize", finalize_node)
+def build_graph():
+    """Build and compile the PlebChat graph."""
+    builder = StateGraph(AgentState)
+
+    # Add nodes
+    builder.add_node("validate_payment", validate_payment_node)
+    builder.add_node("agent", agent_node)
+    builder.add_node("finalize", finalize_node)
+
+    # Add edges
+    builder.add_edge("__start__", "validate_payment")
+    builder.add_conditional_edges(
+        "validate_payment",
+        route_after_validation,
+        {"agent": "agent", "end": END},
+    )
+    builder.add_edge("agent", "finalize")
+    builder.add_edge("finalize", END)
+
+    return builder.compile()
+
+
+_graph = None
+
+
+def get_graph():
+    """Get the compiled graph, compiling it on first use."""
+    global _graph
+    if _graph is None:
+        _graph = build_graph()
+    return _graph
 
-# Add edges
-builder.add_edge("__start__", "validate_payment")
-builder.add_conditional_edges(
-    "validate_payment",
-    route_after_validation,
-    {"agent": "agent", "end": END},
-)
-builder.add_edge("agent", "finalize")
-builder.add_edge("finalize", END)
 
-# Compile the graph
-graph = builder.compile()
+def __getattr__(name: str):
+    """Resolve `graph` lazily so langgraph.json's `graph.py:graph` still works."""
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
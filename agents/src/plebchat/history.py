@@ -0,0 +1,188 @@
+"""Token-budgeted conversation history for the LLM prompt.
+
+Sending the whole thread every turn makes prompt size, cost and prefill
+latency grow with the conversation. `select_history` keeps only the most
+recent whole turns (a turn starts at a HumanMessage) that fit in
+HISTORY_TOKEN_BUDGET tokens; the latest turn is always kept.
+
+Token counts are approximate (~4 characters per token, see
+`count_tokens_approximately`) and cached per message id, so each message is
+counted once however long the thread gets.
+
+With HISTORY_SUMMARY=1, the turns a prompt left out are folded into a
+rolling summary by a background task once the response is done, so the
+summary call never delays a response. The finished summary is sent with the
+system prompt from the next turn on and saved in `AgentState.summary`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+# Prompt tokens allowed for history (0 disables trimming)
+DEFAULT_HISTORY_TOKEN_BUDGET = 8000
+
+# Token counts kept in the cache
+MAX_CACHED_COUNTS = 10_000
+
+# Finished summaries kept for threads that haven't had another turn yet
+MAX_PENDING_SUMMARIES = 1_000
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and an AI assistant.
+Keep facts, names, numbers, decisions and open questions the assistant may need later; drop pleasantries.
+Reply with the updated summary only, in under 200 words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+# (message id, content length) -> token count
+_token_counts: OrderedDict[tuple[str, int], int] = OrderedDict()
+
+# Thread id -> (summary, id of the last message it covers), finished in the
+# background and not yet saved to the thread's state. Threads that never come
+# back are dropped oldest first; they redo the summary if they do return.
+_summaries: OrderedDict[str, tuple[str, str]] = OrderedDict()
+_summary_tasks: dict[str, asyncio.Task] = {}
+
+
+def history_token_budget() -> int:
+    """Prompt tokens allowed for history (HISTORY_TOKEN_BUDGET)."""
+    return int(os.getenv("HISTORY_TOKEN_BUDGET", DEFAULT_HISTORY_TOKEN_BUDGET))
+
+
+def summary_enabled() -> bool:
+    """Whether dropped turns are summarized (HISTORY_SUMMARY=1)."""
+    return os.getenv("HISTORY_SUMMARY", "0") == "1"
+
+
+def count_message_tokens(message: BaseMessage) -> int:
+    """Approximate token count of a message, cached by message id."""
+    if message.id is None:
+        return count_tokens_approximately([message])
+    # Content length guards against a message replaced under the same id
+    key = (message.id, len(str(message.content)))
+    count = _token_counts.get(key)
+    if count is None:
+        count = count_tokens_approximately([message])
+        _token_counts[key] = count
+        if len(_token_counts) > MAX_CACHED_COUNTS:
+            _token_counts.popitem(last=False)
+    else:
+        _token_counts.move_to_end(key)
+    return count
+
+
+def split_history(
+    messages: list[BaseMessage], budget: int
+) -> tuple[list[BaseMessage], list[BaseMessage]]:
+    """Split messages into (older, recent) at a turn boundary.
+
+    `recent` holds the latest whole turns whose tokens fit in `budget`, and
+    at least the latest turn. A budget of 0 keeps everything.
+    """
+    if budget <= 0:
+        return [], list(messages)
+    cut = len(messages)
+    used = 0
+    for i in range(len(messages) - 1, -1, -1):
+        used += count_message_tokens(messages[i])
+        if used > budget and cut < len(messages):
+            break
+        if isinstance(messages[i], HumanMessage):
+            # Whole turns only: the prompt never starts mid-turn
+            cut = i
+    else:
+        cut = 0
+    return list(messages[:cut]), list(messages[cut:])
+
+
+def select_history(messages: list[BaseMessage], budget: int | None = None) -> list[BaseMessage]:
+    """Most recent whole turns of `messages` within the token budget."""
+    return split_history(messages, history_token_budget() if budget is None else budget)[1]
+
+
+def unsummarized(older: list[BaseMessage], summary_through: str | None) -> list[BaseMessage]:
+    """Messages of `older` after the one with id `summary_through`.
+
+    `older` is a prefix of the history, so if `summary_through` isn't in it
+    the summary already covers all of `older` (the budget now keeps that
+    message in the prompt).
+    """
+    if summary_through is None:
+        return older
+    for i, message in enumerate(older):
+        if message.id == summary_through:
+            return older[i + 1:]
+    return []
+
+
+async def update_summary(model: Any, summary: str | None, messages: list[BaseMessage]) -> str:
+    """Fold `messages` into the rolling summary with one LLM call.
+
+    Runs without callbacks so LangGraph doesn't stream the summary to the client.
+    """
+    transcript = "\n".join(
+        f"{message.type}: {message.content if isinstance(message.content, str) else str(message.content)}"
+        for message in messages
+    )
+    prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", messages=transcript)
+    response = await model.ainvoke([HumanMessage(content=prompt)], config={"callbacks": []})
+    return response.content if isinstance(response.content, str) else str(response.content)
+
+
+def current_summary(thread_id: str, state: dict) -> dict:
+    """Summary fields for this turn: a finished background summary, else the state's."""
+    if thread_id in _summaries:
+        summary, summary_through = _summaries[thread_id]
+        return {"summary": summary, "summary_through": summary_through}
+    return {"summary": state.get("summary"), "summary_through": state.get("summary_through")}
+
+
+def forget_summary(thread_id: str, summary_through: str | None) -> None:
+    """Drop a background summary once it is saved to the thread's state.
+
+    A summary that finished after `current_summary` was read is kept.
+    """
+    if thread_id in _summaries and _summaries[thread_id][1] == summary_through:
+        del _summaries[thread_id]
+
+
+def schedule_summary(
+    thread_id: str,
+    model: Any,
+    summary: str | None,
+    summary_through: str | None,
+    older: list[BaseMessage],
+) -> None:
+    """Fold the messages a prompt left out into the summary, in the background.
+
+    `older` is the part of the history the prompt was built without. One
+    update runs per thread at a time; turns trimmed meanwhile are folded in
+    by a later one.
+    """
+    dropped = unsummarized(older, summary_through)
+    if not dropped or thread_id in _summary_tasks:
+        return
+
+    async def run():
+        try:
+            _summaries[thread_id] = (await update_summary(model, summary, dropped), dropped[-1].id)
+            _summaries.move_to_end(thread_id)
+            if len(_summaries) > MAX_PENDING_SUMMARIES:
+                _summaries.popitem(last=False)
+            print(f"[Agent] Summarized {len(dropped)} older messages")
+        except Exception as e:
+            print(f"[Agent] History summary failed: {e}")
+        finally:
+            _summary_tasks.pop(thread_id, None)
+
+    _summary_tasks[thread_id] = asyncio.get_running_loop().create_task(run())
@@ -142,9 +142,18 @@ class AgentLogger:
         content: str,
         tool_calls: list[dict] | None = None,
         finish_reason: str | None = None,
+        ttft_ms: int | None = None,
+        output_tokens: int | None = None,
+        tokens_per_sec: float | None = None,
+        speculative_saved_ms: int | None = None,
         **kwargs,  # Accept additional kwargs for flexibility
     ) -> None:
-        """Log an LLM response."""
+        """Log an LLM response.
+        
+        `ttft_ms` is the time from requesting the stream to its first token.
+        `speculative_saved_ms` is set when the call was started during
+        redemption: the time it ran before it would otherwise have started.
+        """
         event = {
             "event": "llm_response",
             "run_id": run_id,
@@ -152,6 +161,10 @@ class AgentLogger:
             "content_preview": _truncate(content, 500) if content else None,
             "tool_calls": [{"name": tc.get("name"), "args": tc.get("args")} for tc in (tool_calls or [])],
             "finish_reason": finish_reason,
+            "ttft_ms": ttft_ms,
+            "output_tokens": output_tokens,
+            "tokens_per_sec": tokens_per_sec,
+            "speculative_saved_ms": speculative_saved_ms,
         }
         
         self._write_event(thread_id, event)
@@ -217,6 +230,28 @@ class AgentLogger:
         self._write_event(thread_id, event)
         print(f"[Logger] Payment {event_type}: {amount_sats} sats")
     
+    def log_backend_call(
+        self,
+        thread_id: str,
+        run_id: str,
+        endpoint: str,
+        status_code: int | None = None,
+        duration_ms: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Log a call to the wallet backend and its latency."""
+        event = {
+            "event": "backend_call",
+            "run_id": run_id,
+            "endpoint": endpoint,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "error": error,
+        }
+        self._write_event(thread_id, event)
+        status = error or status_code
+        print(f"[Logger] Backend {endpoint} -> {status} ({duration_ms}ms)")
+    
     def log_tool_interrupt(
         self,
         thread_id: str,
@@ -0,0 +1,61 @@
+"""Chat model that replays buffered chunks.
+
+A speculative LLM call (see graph.py) runs without callbacks while the
+payment is being redeemed, pushing its chunks into a queue. Once the payment
+is confirmed, agent_node streams the queue through `BufferedChatModel`, so
+LangGraph's message streaming delivers the chunks like any other completion:
+those already buffered at once, the rest as they arrive.
+
+Imported only when speculation is used, keeping BaseChatModel out of startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, message_chunk_to_message
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class BufferedChatModel(BaseChatModel):
+    """Streams `AIMessageChunk`s from `buffer` until a None item."""
+
+    buffer: asyncio.Queue
+
+    @property
+    def _llm_type(self) -> str:
+        return "plebchat-buffered"
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        # Without an event loop to wait on, only a finished stream can be replayed
+        chunks = []
+        while True:
+            try:
+                chunk = self.buffer.get_nowait()
+            except asyncio.QueueEmpty:
+                raise RuntimeError("Buffered stream is still running; use ainvoke() or astream()") from None
+            if chunk is None:
+                return _result(chunks)
+            chunks.append(chunk)
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        chunks = []
+        while (chunk := await self.buffer.get()) is not None:
+            chunks.append(chunk)
+        return _result(chunks)
+
+    async def _astream(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        while (chunk := await self.buffer.get()) is not None:
+            yield ChatGenerationChunk(message=chunk)
+
+
+def _result(chunks: list[AIMessageChunk]) -> ChatResult:
+    """Merge chunks into one complete message."""
+    message = message_chunk_to_message(sum(chunks[1:], chunks[0])) if chunks else AIMessage(content="")
+    return ChatResult(generations=[ChatGeneration(message=message)])
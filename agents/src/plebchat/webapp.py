@@ -0,0 +1,23 @@
+"""HTTP app mounted into the LangGraph server (see `http.app` in langgraph.json).
+
+It adds no routes. Its lifespan opens the LLM connection when the server
+starts, and closes the shared LLM and wallet backend clients when it shuts
+down.
+"""
+
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+
+from src.plebchat.graph import close_models, close_wallet_client, schedule_model_warmup
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    schedule_model_warmup()
+    yield
+    await close_wallet_client()
+    await close_models()
+
+
+app = Starlette(lifespan=lifespan)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for admin authentication.
+
+Measures per-call cost of NIP-98 verification (full, memoized GET retry,
+POST with payload hash) and session token verification, then fires a burst
+of admin requests at the event loop and reports the worst loop stall, with
+verification inline on the loop vs. through NIP98Middleware.
+
+Usage:
+    python scripts/bench_nip98.py
+    python scripts/bench_nip98.py -n 2000 --burst 200 --body-bytes 4096
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from secp256k1 import PrivateKey  # noqa: E402
+
+from src.auth.admins import reload_admin_pubkeys  # noqa: E402
+from src.auth.middleware import NIP98Middleware  # noqa: E402
+from src.auth.nip98 import SeenEventCache, verify_nip98_event  # noqa: E402
+from src.auth.session import SessionManager  # noqa: E402
+
+URL = "http://testserver/api/admin/stats"
+
+
+def make_header(key: PrivateKey, url: str, method: str, body: bytes = b"", nonce: int = 0) -> str:
+    """Sign a NIP-98 event and return the Authorization header value.
+
+    The nonce tag keeps event ids unique when many events are signed per second.
+    """
+    tags = [["u", url], ["method", method], ["nonce", str(nonce)]]
+    if body:
+        tags.append(["payload", hashlib.sha256(body).hexdigest()])
+    event = {
+        "pubkey": key.pubkey.serialize()[1:].hex(),
+        "created_at": int(time.time()),
+        "kind": 27235,
+        "tags": tags,
+        "content": "",
+    }
+    serialized = json.dumps(
+        [0, event["pubkey"], event["created_at"], event["kind"], event["tags"], event["content"]],
+        separators=(",", ":"),
+    )
+    event["id"] = hashlib.sha256(serialized.encode()).hexdigest()
+    event["sig"] = key.schnorr_sign(bytes.fromhex(event["id"]), bip340tag=None, raw=True).hex()
+    return "Nostr " + base64.b64encode(json.dumps(event).encode()).decode()
+
+
+def time_per_call(fn, n: int) -> float:
+    """Average microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def measure_stall(burst, ticks_ms: float = 1.0) -> tuple[float, float]:
+    """Run `burst()` while a ticker measures event loop lag.
+
+    Returns:
+        Tuple of (burst duration ms, worst loop stall ms)
+    """
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(ticks_ms / 1000)
+            worst = max(worst, (time.perf_counter() - start) * 1000 - ticks_ms)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await burst()
+    elapsed = (time.perf_counter() - start) * 1000
+    done = True
+    await tick_task
+    return elapsed, worst
+
+
+async def run_bursts(key: PrivateKey, burst_size: int, body: bytes) -> dict:
+    """Compare loop stalls for inline vs. middleware verification."""
+    headers = [make_header(key, URL, "POST", body, nonce=i) for i in range(burst_size)]
+    pubkeys = frozenset({key.pubkey.serialize()[1:].hex()})
+
+    async def inline_request(header: str):
+        # What a route did before: hash the buffered body and verify on the loop
+        result = verify_nip98_event(header, URL, "POST", body=body, allowed_pubkeys=pubkeys)
+        assert result.valid, result.error
+
+    async def endpoint(scope, receive, send):
+        assert scope["state"]["nip98"].valid, scope["state"]["nip98"].error
+
+    middleware = NIP98Middleware(endpoint, path_prefix="/api/admin")
+
+    async def middleware_request(header: str):
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/api/admin/stats",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"authorization", header.encode())],
+        }
+        chunks = [body[i:i + 1024] for i in range(0, len(body), 1024)] or [b""]
+
+        async def receive():
+            chunk = chunks.pop(0)
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+        await middleware(scope, receive, None)
+
+    # The middleware uses the allow-list from the environment
+    os.environ["ADMIN_NPUBS"] = next(iter(pubkeys))
+    reload_admin_pubkeys()
+
+    results = {}
+    for name, request in (("inline", inline_request), ("middleware", middleware_request)):
+        elapsed, stall = await measure_stall(
+            lambda: asyncio.gather(*(request(h) for h in headers))
+        )
+        results[name] = {"burst_ms": elapsed, "max_loop_stall_ms": stall}
+        # Fresh events for the next run (POST events are single-use)
+        headers = [make_header(key, URL, "POST", body, nonce=burst_size + i) for i in range(burst_size)]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark admin authentication",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("-n", type=int, default=1000, help="Iterations per micro-benchmark")
+    parser.add_argument("--burst", type=int, default=100, help="Concurrent admin requests per burst")
+    parser.add_argument("--body-bytes", type=int, default=1024, help="POST body size")
+    args = parser.parse_args()
+
+    key = PrivateKey()
+    body = b"x" * args.body_bytes
+    get_header = make_header(key, URL, "GET")
+    post_header = make_header(key, URL, "POST", body)
+    cache = SeenEventCache()
+    verify_nip98_event(get_header, URL, "GET", seen_events=cache)
+
+    sessions = SessionManager(secret=b"bench")
+    token, _ = sessions.issue(key.pubkey.serialize()[1:].hex())
+
+    print(f"{'operation':<32} {'us/call':>10}")
+    print("-" * 44)
+    rows = [
+        ("NIP-98 GET (full verify)", lambda: verify_nip98_event(get_header, URL, "GET")),
+        ("NIP-98 GET (memoized retry)", lambda: verify_nip98_event(get_header, URL, "GET", seen_events=cache)),
+        (f"NIP-98 POST ({args.body_bytes} B body)", lambda: verify_nip98_event(post_header, URL, "POST", body=body)),
+        ("Session token", lambda: sessions.verify(token)),
+    ]
+    for name, fn in rows:
+        print(f"{name:<32} {time_per_call(fn, args.n):>10.1f}")
+
+    print()
+    print(f"Burst of {args.burst} admin POSTs ({args.body_bytes} B body):")
+    results = asyncio.run(run_bursts(key, args.burst, body))
+    for name, r in results.items():
+        print(f"  {name:<12} burst {r['burst_ms']:>8.1f} ms   worst loop stall {r['max_loop_stall_ms']:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Profile backend startup import time and enforce an import-time budget.
+
+Runs the shared profiler (scripts/profile_imports.py at the repo root) on
+src.main and fails if the cashu stack, secp256k1, bech32 or httpx is loaded at
+startup or the import takes over 1500 ms. Other arguments are passed through.
+
+Usage:
+    python scripts/profile_imports.py                  # report top 25 imports, check the budget
+    python scripts/profile_imports.py --budget-ms 0    # report only
+    python scripts/profile_imports.py --module src.routes.wallet
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+PROFILER = BACKEND_DIR.parent / "scripts" / "profile_imports.py"
+
+# Import-time budget in ms (override with --budget-ms)
+BUDGET_MS = 1500
+
+# Modules that must only be imported on first use, never at startup
+FORBIDDEN = ["cashu", "secp256k1", "bech32", "httpx"]
+
+if __name__ == "__main__":
+    sys.exit(subprocess.call([
+        sys.executable, str(PROFILER),
+        "--cwd", str(BACKEND_DIR),
+        "--module", "src.main",
+        "--forbid", ",".join(FORBIDDEN),
+        "--budget-ms", str(BUDGET_MS),
+        *sys.argv[1:],
+    ]))
@@ -2,16 +2,36 @@
 
 from .nip98 import (
     AuthResult,
+    SeenEventCache,
     verify_nip98_event,
     get_admin_pubkeys,
     npub_to_hex,
     hex_to_npub,
 )
+from .admins import (
+    get_admin_pubkey_set,
+    is_admin_pubkey,
+    normalize_pubkeys,
+    reload_admin_pubkeys,
+)
+from .session import (
+    AdminSession,
+    SessionManager,
+    get_session_manager,
+)
 
 __all__ = [
     "AuthResult",
+    "SeenEventCache",
     "verify_nip98_event",
     "get_admin_pubkeys",
     "npub_to_hex",
     "hex_to_npub",
+    "get_admin_pubkey_set",
+    "is_admin_pubkey",
+    "normalize_pubkeys",
+    "reload_admin_pubkeys",
+    "AdminSession",
+    "SessionManager",
+    "get_session_manager",
 ]
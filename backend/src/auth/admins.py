@@ -0,0 +1,151 @@
+"""Admin pubkey allow-list.
+
+The allow-list is parsed once into a frozen set of hex pubkeys and cached, so
+admin authorization is a single set membership check. Sources:
+- ADMIN_NPUBS: comma-separated npubs or hex pubkeys
+- ADMIN_NPUBS_FILE (optional): file with one npub or hex pubkey per line
+  (commas also accepted, `#` starts a comment)
+
+The cache is rebuilt by `reload_admin_pubkeys()`, which the app calls on
+SIGHUP and whenever ADMIN_NPUBS_FILE changes on disk.
+"""
+
+import asyncio
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from .nip98 import npub_to_hex
+
+# How often to check ADMIN_NPUBS_FILE for changes
+DEFAULT_ADMIN_FILE_POLL_SECONDS = 5.0
+
+_HEX_PUBKEY_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Cached allow-list (None until first use)
+_admin_pubkeys: Optional[frozenset[str]] = None
+
+
+def normalize_pubkeys(pubkeys: Iterable[str]) -> frozenset[str]:
+    """Normalize npub/hex pubkeys to a set of lowercase hex pubkeys.
+
+    Invalid entries are logged and skipped.
+
+    Args:
+        pubkeys: npub or hex pubkeys
+
+    Returns:
+        Frozen set of 32-byte hex pubkeys
+    """
+    normalized = set()
+    for pk in pubkeys:
+        pk = pk.strip()
+        if not pk:
+            continue
+        hex_pk = npub_to_hex(pk) if pk.startswith("npub") else pk.lower()
+        if hex_pk and _HEX_PUBKEY_RE.match(hex_pk):
+            normalized.add(hex_pk)
+        else:
+            logger.warning(f"[Admin] Ignoring invalid admin pubkey: {pk[:16]}...")
+    return frozenset(normalized)
+
+
+def get_admin_pubkeys_file() -> Optional[Path]:
+    """Get the path of the optional admin pubkeys file (ADMIN_NPUBS_FILE)."""
+    path = os.getenv("ADMIN_NPUBS_FILE", "").strip()
+    return Path(path) if path else None
+
+
+def _read_admin_pubkeys_file(path: Path) -> list[str]:
+    """Read pubkeys from the admin pubkeys file."""
+    try:
+        text = path.read_text()
+    except OSError as e:
+        logger.warning(f"[Admin] Could not read ADMIN_NPUBS_FILE {path}: {e}")
+        return []
+
+    entries = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        entries.extend(pk.strip() for pk in line.split(",") if pk.strip())
+    return entries
+
+
+def get_admin_pubkey_entries() -> list[str]:
+    """Get the raw admin pubkey entries from ADMIN_NPUBS and ADMIN_NPUBS_FILE.
+
+    Returns:
+        List of pubkeys (may be npub or hex format)
+    """
+    admin_npubs = os.getenv("ADMIN_NPUBS", "")
+    entries = [pk.strip() for pk in admin_npubs.split(",") if pk.strip()]
+
+    path = get_admin_pubkeys_file()
+    if path is not None:
+        entries.extend(_read_admin_pubkeys_file(path))
+    return entries
+
+
+def reload_admin_pubkeys() -> frozenset[str]:
+    """Re-read the admin allow-list and replace the cached set.
+
+    Returns:
+        The new set of admin hex pubkeys
+    """
+    global _admin_pubkeys
+
+    previous = _admin_pubkeys
+    _admin_pubkeys = normalize_pubkeys(get_admin_pubkey_entries())
+
+    if previous is not None and previous != _admin_pubkeys:
+        added = len(_admin_pubkeys - previous)
+        removed = len(previous - _admin_pubkeys)
+        logger.info(
+            f"[Admin] Reloaded admin pubkeys: {len(_admin_pubkeys)} total "
+            f"({added} added, {removed} removed)"
+        )
+    return _admin_pubkeys
+
+
+def get_admin_pubkey_set() -> frozenset[str]:
+    """Get the cached set of admin hex pubkeys, loading it on first use."""
+    if _admin_pubkeys is None:
+        return reload_admin_pubkeys()
+    return _admin_pubkeys
+
+
+def is_admin_pubkey(pubkey: Optional[str]) -> bool:
+    """Check whether a hex pubkey is in the admin allow-list."""
+    return bool(pubkey) and pubkey.lower() in get_admin_pubkey_set()
+
+
+async def watch_admin_pubkeys_file(interval: float = DEFAULT_ADMIN_FILE_POLL_SECONDS):
+    """Background task: reload the allow-list when ADMIN_NPUBS_FILE changes.
+
+    Polls the file's mtime and size rather than relying on platform-specific
+    file notification APIs.
+
+    Args:
+        interval: Seconds between checks
+    """
+    def file_signature() -> Optional[tuple]:
+        path = get_admin_pubkeys_file()
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+            return (str(path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (str(path), None, None)
+
+    last = file_signature()
+    while True:
+        await asyncio.sleep(interval)
+        current = file_signature()
+        if current != last:
+            last = current
+            logger.info("[Admin] ADMIN_NPUBS_FILE changed, reloading admin pubkeys")
+            reload_admin_pubkeys()
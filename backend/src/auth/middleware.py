@@ -0,0 +1,104 @@
+"""NIP-98 verification as ASGI middleware.
+
+Verifying a NIP-98 event is synchronous CPU work (base64 decode, JSON
+canonicalization, SHA-256, Schnorr verify). Done inside a route it runs on the
+event loop and stalls every other request, including wallet redemptions.
+
+`NIP98Middleware` verifies `Authorization: Nostr ...` headers on admin paths
+before routing:
+- the request body is hashed incrementally as it streams in, then replayed
+  to the route unchanged
+- verification runs in a small, bounded thread pool
+- the AuthResult is stored in the request state (`request.state.nip98`)
+
+Routes still decide what to do with the result (see `verify_admin_nip98`).
+"""
+
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .admins import get_admin_pubkey_set
+from .nip98 import seen_events, verify_nip98_event
+
+# Threads used for signature verification
+DEFAULT_VERIFY_WORKERS = 2
+
+# Methods whose body is covered by the NIP-98 payload tag
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class NIP98Middleware:
+    """Verify NIP-98 auth headers off the event loop for a path prefix."""
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api/admin", max_workers: int = 0):
+        """Initialize the middleware.
+
+        Args:
+            app: The ASGI app to wrap
+            path_prefix: Only requests under this path are verified
+            max_workers: Verification threads (default: NIP98_VERIFY_WORKERS or 2)
+        """
+        self.app = app
+        self.path_prefix = path_prefix
+        workers = max_workers or int(os.getenv("NIP98_VERIFY_WORKERS", str(DEFAULT_VERIFY_WORKERS)))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nip98")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = ""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        if not authorization.startswith("Nostr "):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        buffered: list[Message] = []
+        payload_hash = None
+
+        if method in BODY_METHODS:
+            # Hash the body chunk by chunk as it arrives
+            digest = hashlib.sha256()
+            body_length = 0
+            more_body = True
+            while more_body:
+                message = await receive()
+                buffered.append(message)
+                if message["type"] != "http.request":
+                    break
+                chunk = message.get("body", b"")
+                digest.update(chunk)
+                body_length += len(chunk)
+                more_body = message.get("more_body", False)
+            if body_length:
+                payload_hash = digest.hexdigest()
+
+        verify = partial(
+            verify_nip98_event,
+            auth_header=authorization,
+            url=str(Request(scope).url),
+            method=method,
+            allowed_pubkeys=get_admin_pubkey_set(),
+            seen_events=seen_events,
+            payload_hash=payload_hash,
+        )
+        result = await asyncio.get_running_loop().run_in_executor(self._executor, verify)
+        scope.setdefault("state", {})["nip98"] = result
+
+        async def replay_receive() -> Message:
+            if buffered:
+                return buffered.pop(0)
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
@@ -13,6 +13,7 @@ This module verifies:
 2. The event is recent (within expiry window)
 3. The URL and method match the request
 4. The pubkey is in the whitelist (if provided)
+5. The event has not been used before (if a SeenEventCache is provided)
 
 Reference: https://github.com/nostr-protocol/nips/blob/master/98.md
 """
@@ -20,12 +21,11 @@ Reference: https://github.com/nostr-protocol/nips/blob/master/98.md
 import base64
 import hashlib
 import json
-import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
-from secp256k1 import PublicKey
 from loguru import logger
 
 
@@ -35,6 +35,12 @@ NIP98_KIND = 27235
 # Default expiry time (seconds) - events older than this are rejected
 DEFAULT_EXPIRY_SECONDS = 60
 
+# Events dated this far in the future are still accepted (clock skew)
+FUTURE_TOLERANCE_SECONDS = 60
+
+# HTTP methods that may be retried with the same event
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 @dataclass
 class AuthResult:
@@ -46,6 +52,81 @@ class AuthResult:
     error: Optional[str] = None
 
 
+class SeenEventCache:
+    """Bounded store of recently verified event ids for replay protection.
+    
+    Entries are grouped into time buckets by the event's `created_at`. An event
+    can only pass the expiry check until `created_at + expiry_seconds`, so whole
+    buckets are dropped once every event in them has expired. Lookups are O(1)
+    and memory is bounded by `max_entries` (oldest buckets are dropped first).
+    
+    Each entry stores a fingerprint of the exact Authorization header that was
+    verified, so a retried idempotent request carrying the identical header can
+    skip Schnorr verification.
+    
+    Thread-safe, so verification can run in a worker thread.
+    """
+    
+    def __init__(
+        self,
+        expiry_seconds: int = DEFAULT_EXPIRY_SECONDS,
+        bucket_seconds: int = 10,
+        max_entries: int = 10_000,
+    ):
+        self._expiry_seconds = expiry_seconds
+        self._bucket_seconds = bucket_seconds
+        self._max_entries = max_entries
+        self._buckets: dict[int, dict[str, str]] = {}  # bucket -> {event_id: fingerprint}
+        self._bucket_of: dict[str, int] = {}  # event_id -> bucket
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+    
+    def _evict_expired(self, now: float):
+        """Drop buckets whose events can no longer pass the expiry check."""
+        cutoff = (now - self._expiry_seconds) // self._bucket_seconds
+        for bucket in [b for b in self._buckets if b < cutoff]:
+            for event_id in self._buckets.pop(bucket):
+                del self._bucket_of[event_id]
+    
+    def _evict_oldest(self):
+        """Drop the oldest bucket to stay within max_entries."""
+        bucket = min(self._buckets)
+        dropped = self._buckets.pop(bucket)
+        for event_id in dropped:
+            del self._bucket_of[event_id]
+        logger.warning(f"[NIP-98] Replay cache full, dropped {len(dropped)} unexpired event ids")
+    
+    def get(self, event_id: str) -> Optional[str]:
+        """Get the header fingerprint recorded for an event id, if seen."""
+        with self._lock:
+            self._evict_expired(time.time())
+            bucket = self._bucket_of.get(event_id)
+            return None if bucket is None else self._buckets[bucket][event_id]
+    
+    def add(self, event_id: str, fingerprint: str, created_at: int) -> bool:
+        """Record a verified event.
+        
+        Returns:
+            True if the event id was new, False if it had already been recorded
+        """
+        with self._lock:
+            self._evict_expired(time.time())
+            if event_id in self._bucket_of:
+                return False
+            while self._buckets and len(self._bucket_of) >= self._max_entries:
+                self._evict_oldest()
+            bucket = int(created_at) // self._bucket_seconds
+            self._buckets.setdefault(bucket, {})[event_id] = fingerprint
+            self._bucket_of[event_id] = bucket
+            return True
+
+
+# Replay cache shared by admin authentication (middleware and routes)
+seen_events = SeenEventCache()
+
+
 def npub_to_hex(npub: str) -> Optional[str]:
     """Convert npub to hex pubkey.
     
@@ -102,6 +183,9 @@ def verify_event_signature(event: dict) -> bool:
         True if signature is valid
     """
     try:
+        # Imported lazily: secp256k1 loads a native library we only need for admin auth
+        from secp256k1 import PublicKey
+
         # Reconstruct the event ID (hash of serialized event)
         serialized = json.dumps([
             0,  # reserved
@@ -156,8 +240,10 @@ def verify_nip98_event(
     url: str,
     method: str,
     body: Optional[bytes] = None,
-    allowed_pubkeys: Optional[list[str]] = None,
+    allowed_pubkeys: Optional[Iterable[str]] = None,
     expiry_seconds: int = DEFAULT_EXPIRY_SECONDS,
+    seen_events: Optional[SeenEventCache] = None,
+    payload_hash: Optional[str] = None,
 ) -> AuthResult:
     """Verify a NIP-98 authorization header.
     
@@ -166,11 +252,18 @@ def verify_nip98_event(
         url: The absolute URL of the request
         method: HTTP method (GET, POST, etc.)
         body: Request body bytes (for payload hash verification)
-        allowed_pubkeys: Optional list of allowed pubkeys (hex format)
+        allowed_pubkeys: Optional allowed pubkeys - a frozenset of hex pubkeys
+            (see get_admin_pubkey_set()) or a list of npub/hex pubkeys
         expiry_seconds: Maximum age of the event in seconds
+        seen_events: Optional replay cache. Events are single-use for
+            non-idempotent methods; a retried GET with the identical header
+            is accepted without re-verifying the signature.
+        payload_hash: SHA256 hex digest of a non-empty body, if already computed
+            (used instead of `body`, e.g. when hashing a streamed body)
         
     Returns:
-        AuthResult with validation status
+        AuthResult with validation status. If only the whitelist check fails,
+        `pubkey` is still set (authenticated but not authorized).
     """
     # Check header format
     if not auth_header.startswith("Nostr "):
@@ -193,8 +286,21 @@ def verify_nip98_event(
     if event.get("kind") != NIP98_KIND:
         return AuthResult(valid=False, error=f"Invalid event kind: {event.get('kind')}")
     
+    # Check the replay cache: a seen event may only be reused by an idempotent
+    # request with the identical header, whose signature we already verified
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    fingerprint = hashlib.sha256(auth_header.encode()).hexdigest()
+    event_id = event.get("id")
+    signature_verified = False
+    if seen_events is not None and isinstance(event_id, str):
+        seen_fingerprint = seen_events.get(event_id)
+        if seen_fingerprint is not None:
+            if not idempotent:
+                return AuthResult(valid=False, error="Event already used")
+            signature_verified = seen_fingerprint == fingerprint
+    
     # Verify event signature
-    if not verify_event_signature(event):
+    if not signature_verified and not verify_event_signature(event):
         return AuthResult(valid=False, error="Invalid event signature")
     
     # Verify event is not expired
@@ -204,7 +310,7 @@ def verify_nip98_event(
         return AuthResult(valid=False, error="Event expired")
     
     # Verify event is not from the future (with small tolerance)
-    if created_at > current_time + 60:  # 1 minute tolerance
+    if created_at > current_time + FUTURE_TOLERANCE_SECONDS:
         return AuthResult(valid=False, error="Event from the future")
     
     # Verify URL tag
@@ -225,10 +331,11 @@ def verify_nip98_event(
         return AuthResult(valid=False, error=f"Method mismatch: {event_method} != {method}")
     
     # Verify payload hash if body is present
-    if body:
-        expected_hash = hashlib.sha256(body).hexdigest()
+    if body and payload_hash is None:
+        payload_hash = hashlib.sha256(body).hexdigest()
+    if payload_hash:
         event_payload = get_tag_value(event, "payload")
-        if event_payload and event_payload != expected_hash:
+        if event_payload and event_payload != payload_hash:
             return AuthResult(valid=False, error="Payload hash mismatch")
     
     # Get pubkey
@@ -238,18 +345,19 @@ def verify_nip98_event(
     
     # Verify pubkey is in whitelist if provided
     if allowed_pubkeys:
-        # Normalize all pubkeys to hex
-        normalized_allowed = []
-        for pk in allowed_pubkeys:
-            if pk.startswith("npub"):
-                hex_pk = npub_to_hex(pk)
-                if hex_pk:
-                    normalized_allowed.append(hex_pk)
-            else:
-                normalized_allowed.append(pk)
+        # Precomputed sets are already normalized to hex; normalize anything else
+        if not isinstance(allowed_pubkeys, frozenset):
+            from .admins import normalize_pubkeys
+            allowed_pubkeys = normalize_pubkeys(allowed_pubkeys)
         
-        if pubkey not in normalized_allowed:
-            return AuthResult(valid=False, error="Pubkey not authorized")
+        if pubkey.lower() not in allowed_pubkeys:
+            return AuthResult(valid=False, pubkey=pubkey, error="Pubkey not authorized")
+    
+    # Remember the event; a concurrent duplicate of a non-idempotent request loses
+    if seen_events is not None:
+        is_new = seen_events.add(event_id, fingerprint, created_at)
+        if not is_new and not idempotent:
+            return AuthResult(valid=False, error="Event already used")
     
     # Convert pubkey to npub
     npub = hex_to_npub(pubkey)
@@ -265,12 +373,13 @@ def get_admin_pubkeys() -> list[str]:
     """Get list of admin pubkeys from environment.
     
     The ADMIN_NPUBS environment variable should contain a comma-separated
-    list of npub or hex pubkeys that are allowed admin access.
+    list of npub or hex pubkeys that are allowed admin access. Entries from
+    the optional ADMIN_NPUBS_FILE are included too.
+    
+    For authorization use get_admin_pubkey_set(), which is parsed once and cached.
     
     Returns:
         List of pubkeys (may be npub or hex format)
     """
-    admin_npubs = os.getenv("ADMIN_NPUBS", "")
-    if not admin_npubs:
-        return []
-    return [pk.strip() for pk in admin_npubs.split(",") if pk.strip()]
+    from .admins import get_admin_pubkey_entries
+    return get_admin_pubkey_entries()
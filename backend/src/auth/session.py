@@ -0,0 +1,141 @@
+"""Short-lived admin session tokens.
+
+A valid NIP-98 event can be exchanged for a session token so that polling
+clients (the admin dashboard) don't have to sign, and the backend doesn't have
+to Schnorr-verify, an event on every request. Verifying a token is a single
+HMAC-SHA256 check.
+
+Token format: `<base64url payload>.<base64url HMAC-SHA256(payload)>` where the
+payload is `<hex pubkey>:<expires_at>:<token id>`.
+
+Tokens are scoped to the admin pubkey and stop working when:
+- they expire (ADMIN_SESSION_TTL_SECONDS, default 15 minutes)
+- they are revoked (DELETE /api/admin/auth/session)
+- the pubkey is removed from the admin allow-list
+- the signing secret changes (ADMIN_SESSION_SECRET; random per process if unset)
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+# Default session lifetime
+DEFAULT_SESSION_TTL_SECONDS = 900  # 15 minutes
+
+
+@dataclass
+class AdminSession:
+    """A verified admin session."""
+
+    pubkey: str  # hex pubkey
+    token_id: str
+    expires_at: int
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionManager:
+    """Issues, verifies and revokes HMAC-signed admin session tokens."""
+
+    def __init__(self, secret: Optional[bytes] = None, ttl_seconds: Optional[int] = None):
+        """Initialize the session manager.
+
+        Args:
+            secret: HMAC key (default: ADMIN_SESSION_SECRET, or random per process)
+            ttl_seconds: Token lifetime (default: ADMIN_SESSION_TTL_SECONDS or 900)
+        """
+        if secret is None:
+            env_secret = os.getenv("ADMIN_SESSION_SECRET", "").strip()
+            if env_secret:
+                secret = env_secret.encode()
+            else:
+                secret = secrets.token_bytes(32)
+                logger.info("[Session] ADMIN_SESSION_SECRET not set - sessions won't survive a restart")
+        self._secret = secret
+        self._ttl_seconds = ttl_seconds or int(
+            os.getenv("ADMIN_SESSION_TTL_SECONDS", str(DEFAULT_SESSION_TTL_SECONDS))
+        )
+        # Revoked token ids -> expiry, kept only until the token would expire anyway
+        self._revoked: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl_seconds
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def issue(self, pubkey: str) -> tuple[str, AdminSession]:
+        """Issue a session token for an (already authenticated) admin pubkey.
+
+        Returns:
+            Tuple of (token, session)
+        """
+        session = AdminSession(
+            pubkey=pubkey,
+            token_id=secrets.token_hex(8),
+            expires_at=int(time.time()) + self._ttl_seconds,
+        )
+        payload = f"{session.pubkey}:{session.expires_at}:{session.token_id}".encode()
+        token = f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+        logger.info(f"[Session] Issued session {session.token_id} for {pubkey[:16]}...")
+        return token, session
+
+    def verify(self, token: str) -> Optional[AdminSession]:
+        """Verify a session token.
+
+        Returns:
+            AdminSession if the token is authentic, unexpired and not revoked
+        """
+        try:
+            payload_b64, sig_b64 = token.split(".", 1)
+            payload = _b64decode(payload_b64)
+            if not hmac.compare_digest(self._sign(payload), _b64decode(sig_b64)):
+                return None
+            pubkey, expires_at, token_id = payload.decode().split(":")
+            session = AdminSession(pubkey=pubkey, token_id=token_id, expires_at=int(expires_at))
+        except Exception:
+            return None
+
+        if session.expires_at < time.time():
+            return None
+        with self._lock:
+            if session.token_id in self._revoked:
+                return None
+        return session
+
+    def revoke(self, session: AdminSession):
+        """Revoke a session before it expires."""
+        now = time.time()
+        with self._lock:
+            # Forget revocations of tokens that have expired anyway
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp >= now}
+            self._revoked[session.token_id] = session.expires_at
+        logger.info(f"[Session] Revoked session {session.token_id} for {session.pubkey[:16]}...")
+
+
+# Process-wide session manager (created on first use)
+_session_manager: Optional[SessionManager] = None
+
+
+def get_session_manager() -> SessionManager:
+    """Get the process-wide session manager."""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager()
+    return _session_manager
@@ -1,6 +1,7 @@
 """PlebChat Backend - FastAPI application for ecash payment handling.
 
 This backend provides endpoints for:
+- Liveness (/health) and readiness (/ready) checks
 - Receiving and validating ecash tokens from the LangGraph agent
 - Storing redeemed tokens in a local wallet
 - Admin operations (stats, withdrawal, sweep) with NIP-98 authentication
@@ -9,6 +10,7 @@ This backend provides endpoints for:
 REQUIRED Environment Variables:
 - WALLET_MNEMONIC: BIP39 mnemonic for the Cashu wallet (12 or 24 words)
 - ADMIN_NPUBS: Comma-separated list of admin npubs or hex pubkeys
+  (and/or ADMIN_NPUBS_FILE: file with one npub or hex pubkey per line)
 
 OPTIONAL Environment Variables:
 - CASHU_MINT_URL: URL of the Cashu mint (default: https://mint.minibits.cash/Bitcoin)
@@ -21,19 +23,23 @@ OPTIONAL Environment Variables:
 - PORT: Port to bind to (default: 8000)
 """
 
+import asyncio
 import os
+import signal
 import sys
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from src.routes.wallet import router as wallet_router
 from src.routes.admin import router as admin_router
-from src.services.cashu import CashuService, CashuServiceError
-from src.auth.nip98 import get_admin_pubkeys
+from src.services.cashu import CashuService
+from src.auth.middleware import NIP98Middleware
+from src.auth.admins import get_admin_pubkey_set, reload_admin_pubkeys, watch_admin_pubkeys_file
 
 # Load environment variables
 load_dotenv()
@@ -60,10 +66,10 @@ def validate_configuration() -> list[str]:
             errors.append(f"WALLET_MNEMONIC should be 12 or 24 words, got {word_count}")
     
     # Check ADMIN_NPUBS
-    admin_npubs = get_admin_pubkeys()
-    if not admin_npubs:
+    admin_pubkeys = get_admin_pubkey_set()
+    if not admin_pubkeys:
         errors.append(
-            "ADMIN_NPUBS is required. Set it to a comma-separated list of admin npubs:\n"
+            "ADMIN_NPUBS (or ADMIN_NPUBS_FILE) is required. Set it to a comma-separated list of admin npubs:\n"
             "  ADMIN_NPUBS=npub1abc...,npub1xyz..."
         )
     
@@ -85,38 +91,58 @@ async def lifespan(app: FastAPI):
         sys.exit(1)
     
     # Log admin configuration
-    admin_npubs = get_admin_pubkeys()
-    logger.info(f"[Backend] Configured {len(admin_npubs)} admin pubkey(s)")
-    for npub in admin_npubs[:3]:  # Show first 3
-        if npub.startswith("npub"):
-            logger.info(f"[Backend]   - {npub[:24]}...")
-        else:
-            logger.info(f"[Backend]   - {npub[:16]}...")
-    if len(admin_npubs) > 3:
-        logger.info(f"[Backend]   ... and {len(admin_npubs) - 3} more")
-    
-    # Initialize the Cashu wallet service
+    admin_pubkeys = sorted(get_admin_pubkey_set())
+    logger.info(f"[Backend] Configured {len(admin_pubkeys)} admin pubkey(s)")
+    for pubkey in admin_pubkeys[:3]:  # Show first 3
+        logger.info(f"[Backend]   - {pubkey[:16]}...")
+    if len(admin_pubkeys) > 3:
+        logger.info(f"[Backend]   ... and {len(admin_pubkeys) - 3} more")
+    
+    # Reload the admin allow-list on SIGHUP (re-reading .env) and when
+    # ADMIN_NPUBS_FILE changes
+    def reload_admins():
+        load_dotenv(override=True)
+        reload_admin_pubkeys()
+    
     try:
-        cashu_service = CashuService(require_mnemonic=True)
-        await cashu_service.initialize()
-        app.state.cashu_service = cashu_service
-        logger.info("[Backend] Cashu wallet service initialized")
-        
-        # Start periodic payout task if configured
-        await cashu_service.start_payout_task()
-        
-    except CashuServiceError as e:
-        logger.error(f"[Backend] Failed to initialize Cashu service: {e}")
-        sys.exit(1)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_admins)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        logger.debug("[Backend] SIGHUP not supported, admin pubkeys reload on file change only")
+    admin_watch_task = asyncio.create_task(watch_admin_pubkeys_file())
+    
+    # Initialize the Cashu wallet service in the background so the app can
+    # answer /health immediately; wallet routes return 503 until /ready passes.
+    cashu_service = CashuService(require_mnemonic=True)
+    app.state.cashu_service = cashu_service
+    try:
+        await cashu_service.ledger.start()
+    except Exception as e:
+        # Entries stay queued in memory; the wallet keeps working without history
+        logger.error(f"[Backend] Could not open transaction ledger: {e}")
+    await cashu_service.rollups.start()
+    await cashu_service.fee_model.load()
+    await cashu_service.open_http_client()
+    cashu_service.start_initialization()
+    logger.info("[Backend] Cashu wallet service initializing in background")
     
     yield
     
     # Shutdown
     logger.info("[Backend] Shutting down...")
     
-    # Stop periodic payout task
+    admin_watch_task.cancel()
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass
+    
+    # Stop background initialization and periodic payout tasks
     if hasattr(app.state, 'cashu_service') and app.state.cashu_service:
+        await app.state.cashu_service.stop_initialization()
         await app.state.cashu_service.stop_payout_task()
+        await app.state.cashu_service.ledger.stop()
+        await app.state.cashu_service.rollups.stop()
+        await app.state.cashu_service.close_http_client()
 
 
 app = FastAPI(
@@ -126,6 +152,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Verify NIP-98 admin auth off the event loop (added first so it runs inside CORS)
+app.add_middleware(NIP98Middleware, path_prefix="/api/admin")
+
 # CORS configuration
 origins = [
     "http://localhost:5173",  # SvelteKit dev server
@@ -143,6 +172,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -158,10 +188,20 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
+    """Liveness check - answers as soon as the process is serving."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness check with per-step wallet initialization progress.
+    
+    Returns 200 once the wallet is initialized, 503 until then.
+    """
+    readiness = app.state.cashu_service.get_readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+
 def main():
     """Run the application with uvicorn."""
     import uvicorn
@@ -3,18 +3,30 @@
 These endpoints require NIP-98 authentication with a whitelisted admin npub.
 They provide:
 - Wallet statistics and balance
-- Token generation for withdrawals
+- Token generation for withdrawals (single or bulk)
 - Sweep all funds to a single token
-- Manual Lightning payout
+- Manual Lightning payout (with a dry-run fee estimate)
+- Transaction ledger (paginated history)
+- Revenue rollups per minute/hour/day, mint and agent
+- Live wallet event stream (server-sent events)
 """
 
-from typing import Optional, List
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Optional, List
 
-from fastapi import APIRouter, HTTPException, Request, Header
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request, Response, Header, Query
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel, Field, PositiveInt
 
-from src.services.cashu import CashuService
-from src.auth.nip98 import verify_nip98_event, get_admin_pubkeys, AuthResult
+from src.routes.deps import get_cashu_service, get_ready_cashu_service, not_modified
+from src.auth.nip98 import verify_nip98_event, hex_to_npub, AuthResult, seen_events
+from src.auth.session import get_session_manager
+from src.auth.admins import get_admin_pubkey_set, is_admin_pubkey
+from src.services.cashu import DEFAULT_SWEEP_MAX_PROOFS, MAX_BULK_TOKENS, TokenResult
+from src.services.ledger import DEFAULT_PAGE_SIZE, LEDGER_TYPES, MAX_PAGE_SIZE
+from src.services.rollups import DIMENSIONS, GRANULARITIES
 
 router = APIRouter()
 
@@ -33,10 +45,34 @@ class WithdrawResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BulkWithdrawRequest(BaseModel):
+    """Request body for bulk withdrawal."""
+    amounts: List[PositiveInt] = Field(
+        ..., min_length=1, max_length=MAX_BULK_TOKENS, description="Amount in sats of each token"
+    )
+    memo: Optional[str] = Field(None, description="Optional memo for every token")
+    stream: bool = Field(False, description="Stream tokens as NDJSON as they are minted")
+
+
+class WithdrawnToken(BaseModel):
+    """A single token from a bulk withdrawal."""
+    amount: int
+    token: str
+
+
+class BulkWithdrawResponse(BaseModel):
+    """Response for bulk withdrawal."""
+    success: bool
+    tokens: List[WithdrawnToken] = []
+    amount: int = 0
+    error: Optional[str] = None
+
+
 class SweepResponse(BaseModel):
     """Response for sweep operation."""
     success: bool
-    token: Optional[str] = None
+    token: Optional[str] = None  # Set when the sweep fits in a single token
+    tokens: List[WithdrawnToken] = []
     amount: int = 0
     error: Optional[str] = None
 
@@ -47,12 +83,49 @@ class PayoutRequest(BaseModel):
     ln_address: Optional[str] = Field(None, description="Lightning address (default: configured PAYOUT_LN_ADDRESS)")
 
 
+class PayoutPartResponse(BaseModel):
+    """One invoice of a split payout."""
+    amount: int  # Sats taken from the balance for this invoice
+    success: bool
+    amount_sent: int = 0
+    fee_paid: int = 0
+    quote_id: Optional[str] = None
+    error: Optional[str] = None
+
+
 class PayoutResponse(BaseModel):
     """Response for Lightning payout operation."""
-    success: bool
+    success: bool  # Every invoice was paid
     amount_sent: int = 0
     fee_paid: int = 0
     error: Optional[str] = None
+    partial: bool = False  # Some invoices of a split payout failed
+    parts: List[PayoutPartResponse] = []  # Set when split across invoices
+
+
+class PayoutEstimatePartResponse(BaseModel):
+    """One invoice of a split payout estimate."""
+    amount: int  # Sats taken from the balance for this invoice
+    invoice_amount: int
+    fee_reserve: int
+    quote_id: str
+    expires_at: float
+    step_latency_ms: Dict[str, int] = {}
+
+
+class PayoutEstimateResponse(BaseModel):
+    """Response for a payout dry run."""
+    success: bool
+    amount: int = 0  # Sats taken from the balance
+    invoice_amount: int = 0  # Sats the recipient receives
+    fee_reserve: int = 0  # Maximum routing fee reserved by the mint
+    total_needed: int = 0  # invoice_amount + fee_reserve
+    ln_address: Optional[str] = None
+    quote_id: Optional[str] = None  # Single-invoice payouts only
+    expires_at: Optional[float] = None  # Confirm with POST /payout before this
+    step_latency_ms: Dict[str, int] = {}  # LNURL and melt quote round trips
+    parts: List[PayoutEstimatePartResponse] = []  # Per-invoice quotes of a split payout
+    error: Optional[str] = None
 
 
 class AdminStatsResponse(BaseModel):
@@ -61,6 +134,8 @@ class AdminStatsResponse(BaseModel):
     unit: str
     mint_url: str
     trusted_mints: List[str] = []
+    mints: Dict[str, dict] = {}  # Per-mint health (status, latency_ms, keyset_ids, error)
+    fee_model: Dict[str, dict] = {}  # Learned fee reserve and its accuracy per mint -> destination
     keyset_count: int
     proof_count: int
     data_dir: str
@@ -71,6 +146,52 @@ class AdminStatsResponse(BaseModel):
     admin_pubkey: str  # The authenticated admin's pubkey
 
 
+class LedgerEntryResponse(BaseModel):
+    """A single ledger entry."""
+    id: int
+    ts: float
+    type: str
+    success: bool
+    amount: int = 0
+    fee: int = 0
+    mint: Optional[str] = None
+    latency_ms: Optional[int] = None
+    error: Optional[str] = None
+    details: dict = {}
+
+
+class LedgerResponse(BaseModel):
+    """A page of ledger entries, newest first."""
+    entries: List[LedgerEntryResponse]
+    next_before: Optional[int] = None  # Pass as `before` to get the next page
+
+
+class RollupRow(BaseModel):
+    """Aggregated redemptions for one time bucket (and mint/agent, if grouped)."""
+    start: int
+    mint: Optional[str] = None
+    agent_id: Optional[str] = None
+    count: int
+    failures: int
+    amount: int
+    latency_p50_ms: Optional[int] = None
+    latency_p99_ms: Optional[int] = None
+
+
+class RollupsResponse(BaseModel):
+    """Redemption rollups at one granularity."""
+    granularity: str
+    bucket_seconds: int
+    buckets: List[RollupRow]
+
+
+class SessionResponse(BaseModel):
+    """Response for session token creation."""
+    token: str
+    expires_at: int
+    pubkey: str
+
+
 class AuthInfoResponse(BaseModel):
     """Response for auth info endpoint."""
     authenticated: bool
@@ -79,17 +200,51 @@ class AuthInfoResponse(BaseModel):
     is_admin: bool = False
 
 
-def get_cashu_service(request: Request) -> CashuService:
-    """Get the Cashu service from app state."""
-    return request.app.state.cashu_service
+def _middleware_auth_result(request: Request) -> Optional[AuthResult]:
+    """Get the AuthResult NIP98Middleware stored for this request, if any."""
+    return getattr(request.state, "nip98", None)
 
 
 async def verify_admin_auth(
     request: Request,
     authorization: Optional[str] = Header(None),
+) -> AuthResult:
+    """Verify admin access via a session token or NIP-98.
+    
+    Accepts `Authorization: Bearer <session token>` (see POST /auth/session)
+    or `Authorization: Nostr <base64-event>`.
+    
+    Args:
+        request: FastAPI request object
+        authorization: Authorization header
+        
+    Returns:
+        AuthResult if valid
+        
+    Raises:
+        HTTPException if authentication fails
+    """
+    if authorization and authorization.startswith("Bearer "):
+        session = get_session_manager().verify(authorization[7:])
+        if session is None:
+            raise HTTPException(status_code=401, detail="Invalid or expired session token")
+        # Sessions end as soon as the pubkey is removed from the allow-list
+        if not is_admin_pubkey(session.pubkey):
+            raise HTTPException(status_code=401, detail="Pubkey not authorized")
+        return AuthResult(valid=True, pubkey=session.pubkey, npub=hex_to_npub(session.pubkey))
+    
+    return await verify_admin_nip98(request, authorization)
+
+
+async def verify_admin_nip98(
+    request: Request,
+    authorization: Optional[str] = Header(None),
 ) -> AuthResult:
     """Verify NIP-98 authentication for admin access.
     
+    Uses the result of NIP98Middleware when it ran for this request,
+    otherwise verifies the event inline.
+    
     Args:
         request: FastAPI request object
         authorization: Authorization header
@@ -103,31 +258,34 @@ async def verify_admin_auth(
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     
-    # Get admin pubkeys from environment
-    admin_pubkeys = get_admin_pubkeys()
+    # Cached set of admin hex pubkeys
+    admin_pubkeys = get_admin_pubkey_set()
     if not admin_pubkeys:
         raise HTTPException(
             status_code=503, 
             detail="No admin pubkeys configured. Set ADMIN_NPUBS environment variable."
         )
     
-    # Build the full URL
-    url = str(request.url)
-    method = request.method
-    
-    # Get body for POST requests
-    body = None
-    if method in ("POST", "PUT", "PATCH"):
-        body = await request.body()
-    
-    # Verify the NIP-98 event
-    result = verify_nip98_event(
-        auth_header=authorization,
-        url=url,
-        method=method,
-        body=body,
-        allowed_pubkeys=admin_pubkeys,
-    )
+    result = _middleware_auth_result(request)
+    if result is None:
+        # Build the full URL
+        url = str(request.url)
+        method = request.method
+        
+        # Get body for POST requests
+        body = None
+        if method in ("POST", "PUT", "PATCH"):
+            body = await request.body()
+        
+        # Verify the NIP-98 event
+        result = verify_nip98_event(
+            auth_header=authorization,
+            url=url,
+            method=method,
+            body=body,
+            allowed_pubkeys=admin_pubkeys,
+            seen_events=seen_events,
+        )
     
     if not result.valid:
         raise HTTPException(status_code=401, detail=result.error or "Authentication failed")
@@ -135,6 +293,38 @@ async def verify_admin_auth(
     return result
 
 
+@router.post("/auth/session", response_model=SessionResponse)
+async def create_session(
+    request: Request,
+    authorization: Optional[str] = Header(None),
+):
+    """Exchange a NIP-98 event for a short-lived session token.
+    
+    Requires NIP-98 authentication with an admin pubkey (a session token
+    cannot be used to create another one). Send the returned token as
+    `Authorization: Bearer <token>` on subsequent admin requests.
+    """
+    auth = await verify_admin_nip98(request, authorization)
+    token, session = get_session_manager().issue(auth.pubkey)
+    
+    return SessionResponse(token=token, expires_at=session.expires_at, pubkey=auth.pubkey)
+
+
+@router.delete("/auth/session")
+async def revoke_session(authorization: Optional[str] = Header(None)):
+    """Revoke the session token sent in the Authorization header."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing session token")
+    
+    session_manager = get_session_manager()
+    session = session_manager.verify(authorization[7:])
+    if session is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session token")
+    session_manager.revoke(session)
+    
+    return {"revoked": True}
+
+
 @router.get("/auth/info", response_model=AuthInfoResponse)
 async def get_auth_info(
     request: Request,
@@ -148,58 +338,65 @@ async def get_auth_info(
     if not authorization:
         return AuthInfoResponse(authenticated=False)
     
-    admin_pubkeys = get_admin_pubkeys()
-    url = str(request.url)
-    method = request.method
+    if authorization.startswith("Bearer "):
+        session = get_session_manager().verify(authorization[7:])
+        if session is None:
+            return AuthInfoResponse(authenticated=False)
+        return AuthInfoResponse(
+            authenticated=True,
+            pubkey=session.pubkey,
+            npub=hex_to_npub(session.pubkey),
+            is_admin=is_admin_pubkey(session.pubkey),
+        )
     
-    result = verify_nip98_event(
-        auth_header=authorization,
-        url=url,
-        method=method,
-        body=None,
-        allowed_pubkeys=None,  # Allow any pubkey
-    )
+    result = _middleware_auth_result(request)
+    if result is None:
+        result = verify_nip98_event(
+            auth_header=authorization,
+            url=str(request.url),
+            method=request.method,
+            body=None,
+            allowed_pubkeys=None,  # Allow any pubkey
+            seen_events=seen_events,
+        )
     
-    if not result.valid:
+    # A non-admin pubkey is still authenticated (pubkey set, whitelist check failed)
+    if not result.valid and not result.pubkey:
         return AuthInfoResponse(authenticated=False)
     
-    # Check if admin
-    is_admin = False
-    if admin_pubkeys and result.pubkey:
-        from src.auth.nip98 import npub_to_hex
-        normalized_admins = []
-        for pk in admin_pubkeys:
-            if pk.startswith("npub"):
-                hex_pk = npub_to_hex(pk)
-                if hex_pk:
-                    normalized_admins.append(hex_pk)
-            else:
-                normalized_admins.append(pk)
-        is_admin = result.pubkey in normalized_admins
-    
     return AuthInfoResponse(
         authenticated=True,
         pubkey=result.pubkey,
-        npub=result.npub,
-        is_admin=is_admin,
+        npub=result.npub or hex_to_npub(result.pubkey),
+        is_admin=is_admin_pubkey(result.pubkey),
     )
 
 
 @router.get("/stats", response_model=AdminStatsResponse)
 async def get_admin_stats(
     request: Request,
+    response: Response,
     authorization: Optional[str] = Header(None),
 ):
     """Get detailed wallet statistics.
     
     Requires NIP-98 authentication with an admin pubkey.
+    Supports If-None-Match: returns 304 while the wallet state hasn't changed.
     """
     auth = await verify_admin_auth(request, authorization)
     cashu_service = get_cashu_service(request)
     
-    stats = cashu_service.get_stats()
+    # The response includes the caller's pubkey, so scope the ETag to it
+    snapshot = cashu_service.get_stats_snapshot()
+    etag = snapshot.etag(scope=(auth.pubkey or "")[:16])
+    
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    
+    response.headers["ETag"] = etag
     return AdminStatsResponse(
-        **stats,
+        **snapshot.stats,
         admin_pubkey=auth.pubkey or "",
     )
 
@@ -216,7 +413,7 @@ async def withdraw_funds(
     Generates an ecash token for the specified amount.
     """
     await verify_admin_auth(request, authorization)
-    cashu_service = get_cashu_service(request)
+    cashu_service = get_ready_cashu_service(request)
     
     result = await cashu_service.generate_token(
         amount=body.amount,
@@ -236,32 +433,114 @@ async def withdraw_funds(
         )
 
 
+@router.post("/withdraw/bulk", response_model=BulkWithdrawResponse)
+async def withdraw_bulk(
+    request: Request,
+    body: BulkWithdrawRequest,
+    authorization: Optional[str] = Header(None),
+):
+    """Withdraw funds as many ecash tokens at once.
+    
+    Requires NIP-98 authentication with an admin pubkey.
+    Mints one token per amount using a single swap per batch (hundreds of
+    tokens per batch). If a batch fails, tokens from earlier batches are still
+    returned along with the error.
+    
+    With `stream: true` the response is NDJSON: one `{"amount", "token"}` line
+    per token as each batch completes, then a final
+    `{"done": true, "success", "amount", "error"}` line.
+    """
+    await verify_admin_auth(request, authorization)
+    cashu_service = get_ready_cashu_service(request)
+    results = cashu_service.generate_tokens(
+        body.amounts,
+        memo=body.memo or "PlebChat admin withdrawal",
+    )
+    
+    if body.stream:
+        return _stream_tokens(request, results)
+    
+    tokens, error = await _collect_tokens(results)
+    return BulkWithdrawResponse(
+        success=error is None,
+        tokens=tokens,
+        amount=sum(t.amount for t in tokens),
+        error=error,
+    )
+
+
 @router.post("/sweep", response_model=SweepResponse)
 async def sweep_all_funds(
     request: Request,
     authorization: Optional[str] = Header(None),
+    max_proofs: int = Query(DEFAULT_SWEEP_MAX_PROOFS, ge=1, le=1000, description="Maximum proofs per token"),
+    stream: bool = Query(False, description="Stream tokens as NDJSON as they are created"),
 ):
-    """Sweep all funds into a single ecash token.
+    """Sweep all funds into ecash tokens.
     
     Requires NIP-98 authentication with an admin pubkey.
-    Generates an ecash token containing all available funds.
+    Small wallets are swept into a single token. Large ones are consolidated
+    through swaps into tokens of at most `max_proofs` proofs each.
+    
+    With `stream=true` the response is NDJSON, as for /withdraw/bulk.
     """
     await verify_admin_auth(request, authorization)
-    cashu_service = get_cashu_service(request)
+    cashu_service = get_ready_cashu_service(request)
+    results = cashu_service.sweep_all(memo="PlebChat wallet sweep", max_proofs=max_proofs)
     
-    result = await cashu_service.sweep_all(memo="PlebChat wallet sweep")
+    if stream:
+        return _stream_tokens(request, results)
     
-    if result.success:
-        return SweepResponse(
-            success=True,
-            token=result.mint,  # Token is stored in mint field
-            amount=result.amount,
-        )
-    else:
-        return SweepResponse(
-            success=False,
-            error=result.error,
-        )
+    tokens, error = await _collect_tokens(results)
+    return SweepResponse(
+        success=error is None,
+        token=tokens[0].token if len(tokens) == 1 else None,
+        tokens=tokens,
+        amount=sum(t.amount for t in tokens),
+        error=error,
+    )
+
+
+async def _collect_tokens(results: AsyncIterator[TokenResult]) -> tuple[List[WithdrawnToken], Optional[str]]:
+    """Collect tokens from a token generator until it ends or fails.
+    
+    Returns:
+        Tuple of (tokens, error message if generation stopped early)
+    """
+    tokens = []
+    async for result in results:
+        if not result.success:
+            return tokens, result.error
+        tokens.append(WithdrawnToken(amount=result.amount, token=result.mint))
+    return tokens, None
+
+
+def _stream_tokens(request: Request, results: AsyncIterator[TokenResult]) -> StreamingResponse:
+    """Stream tokens as NDJSON: one line per token, then a summary line.
+    
+    Stops creating tokens once the client disconnects. Tokens of the batch
+    in flight are already in the ledger (`issued_tokens`) and can be
+    recovered from /ledger.
+    """
+    async def ndjson_stream():
+        total = 0
+        error = None
+        try:
+            async for result in results:
+                if not result.success:
+                    error = result.error
+                    break
+                if await request.is_disconnected():
+                    logger.warning(f"[Admin] Client disconnected mid-stream after {total} sats of tokens")
+                    return
+                total += result.amount
+                yield json.dumps({"amount": result.amount, "token": result.mint}) + "\n"
+        finally:
+            # Don't start another batch for a stream that ended early
+            await results.aclose()
+        yield json.dumps({"done": True, "success": error is None, "amount": total, "error": error}) + "\n"
+    
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
 
 
 @router.post("/payout", response_model=PayoutResponse)
@@ -278,9 +557,10 @@ async def payout_to_lightning(
     
     If no amount is specified, sends the full balance.
     If no ln_address is specified, uses the configured PAYOUT_LN_ADDRESS.
+    Amounts above the address's maxSendable are paid as several invoices.
     """
     await verify_admin_auth(request, authorization)
-    cashu_service = get_cashu_service(request)
+    cashu_service = get_ready_cashu_service(request)
     
     result = await cashu_service.payout_to_lightning(
         amount=body.amount,
@@ -292,4 +572,212 @@ async def payout_to_lightning(
         amount_sent=result.amount_sent,
         fee_paid=result.fee_paid,
         error=result.error,
+        partial=result.partial,
+        parts=[PayoutPartResponse(**vars(part)) for part in result.parts],
+    )
+
+
+@router.post("/payout/estimate", response_model=PayoutEstimateResponse)
+async def estimate_payout(
+    request: Request,
+    body: PayoutRequest,
+    authorization: Optional[str] = Header(None),
+):
+    """Estimate a Lightning payout without paying anything.
+    
+    Requires NIP-98 authentication with an admin pubkey.
+    Resolves the Lightning address, fetches an invoice and a melt quote and
+    returns the mint's fee reserve. A POST /payout with the same amount and
+    address before `expires_at` reuses this invoice and quote.
+    """
+    await verify_admin_auth(request, authorization)
+    cashu_service = get_ready_cashu_service(request)
+    
+    quotes, error = await cashu_service.estimate_payout(
+        amount=body.amount,
+        ln_address=body.ln_address,
+    )
+    if not quotes:
+        return PayoutEstimateResponse(success=False, error=error)
+    
+    if len(quotes) == 1:
+        quote = quotes[0]
+        return PayoutEstimateResponse(
+            success=True,
+            amount=quote.amount,
+            invoice_amount=quote.invoice_amount,
+            fee_reserve=quote.fee_reserve,
+            total_needed=quote.total_needed,
+            ln_address=quote.ln_address,
+            quote_id=quote.quote_id,
+            expires_at=quote.expires_at,
+            step_latency_ms=quote.step_latency_ms,
+        )
+    
+    # Split payout: totals over all invoices, fees per invoice
+    return PayoutEstimateResponse(
+        success=True,
+        amount=sum(quote.amount for quote in quotes),
+        invoice_amount=sum(quote.invoice_amount for quote in quotes),
+        fee_reserve=sum(quote.fee_reserve for quote in quotes),
+        total_needed=sum(quote.total_needed for quote in quotes),
+        ln_address=quotes[0].ln_address,
+        expires_at=min(quote.expires_at for quote in quotes),
+        parts=[
+            PayoutEstimatePartResponse(
+                amount=quote.amount,
+                invoice_amount=quote.invoice_amount,
+                fee_reserve=quote.fee_reserve,
+                quote_id=quote.quote_id,
+                expires_at=quote.expires_at,
+                step_latency_ms=quote.step_latency_ms,
+            )
+            for quote in quotes
+        ],
+    )
+
+
+@router.get("/ledger", response_model=LedgerResponse)
+async def get_ledger(
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    before: Optional[int] = Query(None, description="Cursor from the previous page's next_before"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    type: Optional[str] = Query(None, description="Only entries of this type"),
+    since: Optional[float] = Query(None, description="Only entries at or after this Unix timestamp"),
+    until: Optional[float] = Query(None, description="Only entries before this Unix timestamp"),
+):
+    """List recorded redemptions, withdrawals, sweeps and payouts.
+    
+    Requires NIP-98 or session token authentication with an admin pubkey.
+    Keyset-paginated: follow `next_before` until it is null. Entries are
+    written in batches, so the newest may appear a second or so late.
+    """
+    await verify_admin_auth(request, authorization)
+    if type is not None and type not in LEDGER_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown entry type: {type} (expected one of {', '.join(LEDGER_TYPES)})",
+        )
+    
+    entries, next_before = await get_cashu_service(request).ledger.query(
+        before=before,
+        limit=limit,
+        entry_type=type,
+        since=since,
+        until=until,
+    )
+    return LedgerResponse(
+        entries=[LedgerEntryResponse(**vars(entry)) for entry in entries],
+        next_before=next_before,
+    )
+
+
+@router.get("/rollups", response_model=RollupsResponse)
+async def get_rollups(
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    granularity: str = Query("hour", description="minute, hour or day"),
+    since: Optional[float] = Query(None, description="Only buckets starting at or after this Unix timestamp"),
+    until: Optional[float] = Query(None, description="Only buckets starting before this Unix timestamp"),
+    group_by: str = Query("mint,agent_id", description="Comma-separated dimensions to keep (empty for totals)"),
+    mint: Optional[str] = Query(None, description="Only this mint"),
+    agent_id: Optional[str] = Query(None, description="Only this agent id"),
+):
+    """Get redemption counts, sats, failures and p50/p99 latency per time bucket.
+    
+    Requires NIP-98 or session token authentication with an admin pubkey.
+    Served from in-memory rollups; minute buckets are kept for a day, hour
+    buckets for 30 days and day buckets for a year.
+    """
+    await verify_admin_auth(request, authorization)
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown granularity: {granularity} (expected one of {', '.join(GRANULARITIES)})",
+        )
+    dimensions = [d.strip() for d in group_by.split(",") if d.strip()]
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown dimension: {', '.join(unknown)} (expected {', '.join(DIMENSIONS)})",
+        )
+    
+    rows = get_cashu_service(request).rollups.query(
+        granularity,
+        since=since,
+        until=until,
+        group_by=dimensions,
+        mint=mint,
+        agent_id=agent_id,
+    )
+    return RollupsResponse(
+        granularity=granularity,
+        bucket_seconds=GRANULARITIES[granularity],
+        buckets=[RollupRow(**row) for row in rows],
+    )
+
+
+# Seconds between SSE keep-alive comments on an idle stream
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _format_sse(event) -> str:
+    """Format a WalletEvent as a server-sent event."""
+    return f"id: {event.event_id}\nevent: {event.type}\ndata: {json.dumps(event.to_dict())}\n\n"
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Stream wallet events as server-sent events.
+    
+    Requires NIP-98 or session token authentication with an admin pubkey.
+    Pushes token_redeemed, token_withdrawn, payout_started, payout_finished,
+    counter_recovery and balance_changed events. A client reconnecting with
+    `Last-Event-ID` first receives the events it missed; if they are no longer
+    buffered it gets a `resync` event and should refetch stats.
+    """
+    await verify_admin_auth(request, authorization)
+    events = get_cashu_service(request).events
+    
+    async def event_stream():
+        # Subscribe inside the generator: its finally only runs once it has started
+        queue = events.subscribe()
+        try:
+            # Subscribed before reading the backlog so nothing falls in between
+            backlog = events.events_since(last_event_id)
+            last_sent = 0
+            if backlog is None:
+                yield f"event: resync\ndata: {json.dumps({'last_id': events.last_id})}\n\n"
+            else:
+                for event in backlog:
+                    last_sent = event.id
+                    yield _format_sse(event)
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENT_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    # Dropped for falling behind; the client reconnects with Last-Event-ID
+                    return
+                if event.id > last_sent:
+                    last_sent = event.id
+                    yield _format_sse(event)
+        finally:
+            events.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -0,0 +1,47 @@
+"""Shared dependencies for API routes."""
+
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+
+from src.services.cashu import CashuService
+
+# Seconds clients should wait before retrying while the wallet initializes
+WALLET_RETRY_AFTER_SECONDS = 5
+
+
+def get_cashu_service(request: Request) -> CashuService:
+    """Get the Cashu service from app state."""
+    return request.app.state.cashu_service
+
+
+def get_ready_cashu_service(request: Request) -> CashuService:
+    """Get the Cashu service, failing fast while it is still initializing.
+    
+    Raises:
+        HTTPException: 503 with Retry-After until the wallet is ready
+    """
+    cashu_service = get_cashu_service(request)
+    if not cashu_service.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Wallet is initializing, please retry shortly",
+            headers={"Retry-After": str(WALLET_RETRY_AFTER_SECONDS)},
+        )
+    return cashu_service
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Build a 304 response if the client's If-None-Match matches `etag`.
+    
+    Returns:
+        304 Response to return as-is, or None if the client needs the full body
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
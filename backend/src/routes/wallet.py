@@ -7,10 +7,10 @@ These endpoints are called by the LangGraph agent to:
 
 from typing import Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from pydantic import BaseModel, Field
 
-from src.services.cashu import CashuService, TokenResult
+from src.routes.deps import get_cashu_service, get_ready_cashu_service, not_modified
 
 router = APIRouter()
 
@@ -18,6 +18,7 @@ router = APIRouter()
 class ReceiveTokenRequest(BaseModel):
     """Request body for receiving an ecash token."""
     token: str = Field(..., description="The cashu ecash token to receive")
+    agent_id: Optional[str] = Field(None, description="Agent the payment is for (AGENT_PRICING key), for revenue rollups")
 
 
 class ReceiveTokenResponse(BaseModel):
@@ -47,11 +48,6 @@ class BalanceResponse(BaseModel):
     unit: str = "sat"
 
 
-def get_cashu_service(request: Request) -> CashuService:
-    """Get the Cashu service from app state."""
-    return request.app.state.cashu_service
-
-
 @router.post("/receive", response_model=ReceiveTokenResponse)
 async def receive_token(request: Request, body: ReceiveTokenRequest):
     """Receive and redeem an ecash token.
@@ -63,10 +59,10 @@ async def receive_token(request: Request, body: ReceiveTokenRequest):
     Returns:
         Token result with amount received
     """
-    cashu_service = get_cashu_service(request)
+    cashu_service = get_ready_cashu_service(request)
     
     print(f"[Wallet] Receiving token: {body.token[:20]}...")
-    result = await cashu_service.receive_token(body.token)
+    result = await cashu_service.receive_token(body.token, agent_id=body.agent_id)
     
     if result.success:
         print(f"[Wallet] Token received successfully: {result.amount} sats")
@@ -92,7 +88,7 @@ async def check_token(request: Request, body: CheckTokenRequest):
     Returns:
         Token validity, spend state, and amount in sats
     """
-    cashu_service = get_cashu_service(request)
+    cashu_service = get_ready_cashu_service(request)
     
     # Validate format and get amount
     is_valid, error = cashu_service.validate_token_format(body.token)
@@ -145,16 +141,23 @@ class StatsResponse(BaseModel):
 
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(request: Request):
+async def get_stats(request: Request, response: Response):
     """Get wallet statistics.
     
     This endpoint is useful for debugging and verifying
-    the wallet state.
+    the wallet state. Supports If-None-Match: returns 304 while
+    the wallet state hasn't changed.
     
     Returns:
         Wallet statistics
     """
     cashu_service = get_cashu_service(request)
-    stats = cashu_service.get_stats()
+    snapshot = cashu_service.get_stats_snapshot()
+    etag = snapshot.etag()
+    
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
     
-    return StatsResponse(**stats)
+    response.headers["ETag"] = etag
+    return StatsResponse(**snapshot.stats)
@@ -15,25 +15,52 @@ An application-level asyncio.Lock provides defense-in-depth for serializing
 redemption operations, with automatic recovery for "outputs already signed" errors.
 
 Multi-mint support: Accepts tokens from any mint in TRUSTED_MINTS list.
+
+The cashu (nutshell) stack is imported lazily inside the methods that use it
+so that importing this module (and therefore the FastAPI app) stays cheap.
 """
 
 import asyncio
 import os
-from dataclasses import dataclass
+import secrets
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from cashu.core.helpers import sum_proofs
-from cashu.core.settings import settings as cashu_settings
-from cashu.wallet.helpers import deserialize_token_from_string
-from cashu.wallet.wallet import Wallet
 from loguru import logger
 
+if TYPE_CHECKING:
+    from cashu.wallet.wallet import Wallet
+
+from .mint_snapshot import (
+    DEFAULT_SNAPSHOT_MAX_AGE_SECONDS,
+    MintSnapshot,
+    load_mint_snapshot,
+    save_mint_snapshot,
+)
+from .events import EventBus
+from .fee_model import FeeModel
+from .ledger import Ledger, LedgerEntry
+from .rollups import Rollups
+from .payout_quotes import DEFAULT_QUOTE_TTL_SECONDS, PayoutQuote, PayoutQuoteCache
+from .swap import (
+    DEFAULT_MAX_SWAP_INPUTS,
+    amount_covering_fees,
+    output_amounts,
+    plan_batches,
+    swap_proofs,
+)
+from .mint_status import DEFAULT_MINT_PROBE_TIMEOUT_SECONDS, MintStatus, probe_mints
 from .lnurl import (
-    get_lnurl_pay_data,
+    create_http_client,
     get_lnurl_invoice,
-    estimate_lightning_fee,
+    validate_lightning_address,
+    plan_payout_parts,
     LNURLError,
+    LNURLPayCache,
+    LNURLPayData,
 )
 
 
@@ -47,14 +74,46 @@ class TokenResult:
     mint: Optional[str] = None
 
 
+@dataclass
+class PayoutPart:
+    """One invoice of a payout split across several invoices."""
+
+    amount: int  # sats taken from the balance for this part
+    success: bool = False
+    amount_sent: int = 0
+    fee_paid: int = 0
+    quote_id: Optional[str] = None
+    error: Optional[str] = None
+
+
 @dataclass
 class PayoutResult:
     """Result of a Lightning payout operation."""
 
-    success: bool
+    success: bool  # every invoice was paid
     amount_sent: int = 0
     fee_paid: int = 0
     error: Optional[str] = None
+    # Some invoices of a split payout were paid and others failed
+    partial: bool = False
+    # Time spent on each payout step (LNURL requests, melt quote, melt)
+    step_latency_ms: dict[str, int] = field(default_factory=dict)
+    # Per-invoice results when the payout was split (empty otherwise)
+    parts: list[PayoutPart] = field(default_factory=list)
+
+
+@dataclass
+class StatsSnapshot:
+    """Wallet statistics, recomputed only when wallet state changes."""
+
+    version: int
+    stats: dict
+    boot_id: str = ""  # distinguishes versions across restarts
+
+    def etag(self, scope: str = "") -> str:
+        """Strong ETag for this snapshot, optionally scoped (e.g. per admin)."""
+        tag = f"{self.boot_id}-{self.version}"
+        return f'"{tag}-{scope}"' if scope else f'"{tag}"'
 
 
 class CashuServiceError(Exception):
@@ -67,6 +126,17 @@ DEFAULT_MINT_URL = "https://testnut.cashu.space"
 DEFAULT_PAYOUT_THRESHOLD_SATS = 1000
 DEFAULT_PAYOUT_INTERVAL_SECONDS = 300  # 5 minutes
 
+# Background initialization: steps reported by /ready and retry backoff bounds
+INIT_STEPS = ("open_database", "migrate_database", "init_private_key", "load_mint", "load_proofs")
+INIT_RETRY_INITIAL_SECONDS = 5
+INIT_RETRY_MAX_SECONDS = 60
+
+# Maximum tokens per bulk withdrawal
+MAX_BULK_TOKENS = 1000
+
+# Maximum proofs per token produced by a sweep
+DEFAULT_SWEEP_MAX_PROOFS = 64
+
 
 class CashuService:
     """Cashu service for receiving and managing ecash tokens.
@@ -83,6 +153,8 @@ class CashuService:
     - PAYOUT_LN_ADDRESS: Lightning address for automatic payouts
     - PAYOUT_THRESHOLD_SATS: Minimum balance to trigger payout (default: 1000)
     - PAYOUT_INTERVAL_SECONDS: Payout check interval (default: 300 = 5 min)
+    - MINT_SNAPSHOT_MAX_AGE_SECONDS: Max age of the mint metadata snapshot (default: 7 days)
+    - MINT_PROBE_TIMEOUT_SECONDS: Per-mint timeout for startup probes (default: 10)
     """
 
     def __init__(self, data_dir: Optional[str] = None, require_mnemonic: bool = True):
@@ -93,7 +165,7 @@ class CashuService:
             require_mnemonic: If True, raises error if WALLET_MNEMONIC is not set
         """
         self._initialized = False
-        self._wallet: Optional[Wallet] = None
+        self._wallet: Optional["Wallet"] = None
         self._mnemonic = os.getenv("WALLET_MNEMONIC", "").strip()
         self._require_mnemonic = require_mnemonic
         
@@ -109,13 +181,49 @@ class CashuService:
         # Always trust the primary mint
         self._trusted_mints.add(self._mint_url)
         
+        # Per-mint health, probed concurrently at startup (reported by /ready and stats)
+        self._mint_probe_timeout = float(
+            os.getenv("MINT_PROBE_TIMEOUT_SECONDS", str(DEFAULT_MINT_PROBE_TIMEOUT_SECONDS))
+        )
+        self._mint_status: dict[str, MintStatus] = {
+            url: MintStatus(mint_url=url) for url in self._trusted_mints
+        }
+        
         # Payout configuration
         self._payout_ln_address = os.getenv("PAYOUT_LN_ADDRESS", "").strip()
         self._payout_threshold = int(os.getenv("PAYOUT_THRESHOLD_SATS", str(DEFAULT_PAYOUT_THRESHOLD_SATS)))
         self._payout_interval = int(os.getenv("PAYOUT_INTERVAL_SECONDS", str(DEFAULT_PAYOUT_INTERVAL_SECONDS)))
         
-        # Background task handle
+        # Background task handles
         self._payout_task: Optional[asyncio.Task] = None
+        self._init_task: Optional[asyncio.Task] = None
+        self._revalidate_task: Optional[asyncio.Task] = None
+        
+        # Initialization progress (reported by /ready)
+        self._init_steps: dict[str, dict] = {step: {"status": "pending"} for step in INIT_STEPS}
+        self._init_attempts = 0
+        self._init_error: Optional[str] = None
+        
+        # Where mint metadata came from on this boot (reported by /ready)
+        self._snapshot_max_age = int(
+            os.getenv("MINT_SNAPSHOT_MAX_AGE_SECONDS", str(DEFAULT_SNAPSHOT_MAX_AGE_SECONDS))
+        )
+        self._mint_metadata: dict = {
+            "source": None,  # "snapshot" or "network"
+            "snapshot_age_seconds": None,
+            "revalidated": False,
+            "error": None,
+        }
+        
+        # Live wallet events for the admin panel (see services/events.py)
+        self._events = EventBus()
+        
+        # Stats served to pollers; rebuilt by _mark_state_changed() only
+        self._stats_boot_id = secrets.token_hex(4)
+        self._stats_version = 0
+        self._stats_snapshot: Optional[StatsSnapshot] = None
+        # FeeModel.version the snapshot's fee_model was built from
+        self._stats_fee_model_version = 0
         
         # Application-level mutex for serializing redemption operations.
         # The cashu library handles SQLite locking internally, but this provides
@@ -127,8 +235,26 @@ class CashuService:
             self._data_dir = Path(__file__).parent.parent.parent / "data"
         else:
             self._data_dir = Path(data_dir)
+        self._mint_snapshot_path = self._data_dir / "mint_snapshot.json"
+        
+        # Transaction history (see services/ledger.py); started by the app lifespan
+        self._ledger = Ledger(self._data_dir / "ledger.sqlite3")
+        # Per minute/hour/day redemption rollups by mint and agent (see services/rollups.py)
+        self._rollups = Rollups(self._data_dir / "rollups.json")
+        
+        # Invoices and melt quotes from payout estimates, reused by payouts
+        self._payout_quotes = PayoutQuoteCache()
+        # Routing fee reserves learned from past payouts (see services/fee_model.py)
+        self._fee_model = FeeModel(self._data_dir / "fee_model.json")
+        
+        # Pooled keep-alive client for LNURL requests; opened by the app lifespan
+        self._http_client = None
+        # LNURL payRequest data per Lightning address (see services/lnurl.py)
+        self._lnurl_cache = LNURLPayCache()
         
         # Configure cashu settings
+        from cashu.core.settings import settings as cashu_settings
+
         cashu_settings.cashu_dir = str(self._data_dir)
         cashu_settings.tor = False
         cashu_settings.debug = False
@@ -173,8 +299,133 @@ class CashuService:
         """Get the configured payout Lightning address."""
         return self._payout_ln_address if self._payout_ln_address else None
     
+    @property
+    def ledger(self) -> Ledger:
+        """Append-only transaction ledger."""
+        return self._ledger
+    
+    @property
+    def rollups(self) -> Rollups:
+        """Redemption rollups by time bucket, mint and agent id."""
+        return self._rollups
+    
+    @property
+    def fee_model(self) -> FeeModel:
+        """Lightning fee reserve estimates learned from past payouts."""
+        return self._fee_model
+    
+    async def open_http_client(self):
+        """Create the shared LNURL HTTP client (idempotent)."""
+        if self._http_client is None:
+            self._http_client = create_http_client()
+    
+    async def close_http_client(self):
+        """Close the shared LNURL HTTP client and its pooled connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
+    @property
+    def events(self) -> EventBus:
+        """Wallet event bus (redemptions, payouts, balance changes)."""
+        return self._events
+    
+    @property
+    def ready(self) -> bool:
+        """Check if the wallet has finished initializing and can serve requests."""
+        return self._initialized
+    
+    def get_readiness(self) -> dict:
+        """Get initialization progress for the /ready endpoint."""
+        return {
+            "ready": self._initialized,
+            "attempts": self._init_attempts,
+            "error": self._init_error,
+            "steps": {step: dict(info) for step, info in self._init_steps.items()},
+            "mint_metadata": dict(self._mint_metadata),
+            "mints": self.get_mint_status(),
+        }
+    
+    def get_mint_status(self) -> dict[str, dict]:
+        """Get the health of every trusted mint."""
+        return {url: status.to_dict() for url, status in self._mint_status.items()}
+    
+    @asynccontextmanager
+    async def _init_step(self, step: str):
+        """Track the status and duration of one initialization step."""
+        self._init_steps[step] = {"status": "running"}
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._init_steps[step] = {
+                "status": "failed",
+                "duration_ms": int((time.monotonic() - started) * 1000),
+                "error": str(e),
+            }
+            raise
+        self._init_steps[step] = {
+            "status": "done",
+            "duration_ms": int((time.monotonic() - started) * 1000),
+        }
+    
+    def start_initialization(self):
+        """Initialize the wallet in a background task, retrying with backoff.
+        
+        The app keeps serving (/health, /ready) while this runs; wallet routes
+        answer 503 until `ready` is True. The payout task is started once
+        initialization succeeds.
+        """
+        if self._init_task is not None:
+            logger.warning("[Cashu] Initialization already started")
+            return
+        
+        self._init_task = asyncio.create_task(self._initialize_with_retry())
+    
+    async def stop_initialization(self):
+        """Cancel background initialization and mint revalidation if still running."""
+        for task in (self._init_task, self._revalidate_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._init_task = None
+        self._revalidate_task = None
+    
+    async def _initialize_with_retry(self):
+        """Background task: run initialize() until it succeeds."""
+        delay = INIT_RETRY_INITIAL_SECONDS
+        
+        while True:
+            self._init_attempts += 1
+            try:
+                await self.initialize()
+                self._init_error = None
+                break
+            except asyncio.CancelledError:
+                raise
+            except CashuServiceError as e:
+                # Configuration errors won't fix themselves - don't retry
+                self._init_error = str(e)
+                logger.error(f"[Cashu] Initialization failed: {e}")
+                return
+            except Exception as e:
+                self._init_error = str(e)
+                logger.error(
+                    f"[Cashu] Initialization attempt {self._init_attempts} failed: {e} "
+                    f"- retrying in {delay}s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, INIT_RETRY_MAX_SECONDS)
+        
+        await self.start_payout_task()
+    
     async def initialize(self):
         """Initialize the Cashu wallet with database persistence."""
+        from cashu.wallet.wallet import Wallet
+
         if self._require_mnemonic and not self._mnemonic:
             raise CashuServiceError(
                 "WALLET_MNEMONIC environment variable is required. "
@@ -185,39 +436,51 @@ class CashuService:
         self._data_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize wallet with database
-        self._wallet = await Wallet.with_db(
-            url=self._mint_url,
-            db=str(self._data_dir),
-            name="plebchat_wallet",
-        )
+        async with self._init_step("open_database"):
+            self._wallet = await Wallet.with_db(
+                url=self._mint_url,
+                db=str(self._data_dir),
+                name="plebchat_wallet",
+            )
         
         # Run database migrations
-        await self._wallet._migrate_database()
+        async with self._init_step("migrate_database"):
+            await self._wallet._migrate_database()
         
         # Initialize private key with mnemonic if provided
-        if self._mnemonic:
-            await self._wallet._init_private_key(from_mnemonic=self._mnemonic)
-            logger.info("[Cashu] Wallet initialized with provided mnemonic")
-            # Security reminder for operators
-            logger.warning(
-                "[Cashu] IMPORTANT: Ensure WALLET_MNEMONIC is backed up securely! "
-                "Losing the mnemonic means losing access to all funds."
-            )
-        else:
-            await self._wallet._init_private_key()
-            logger.warning("[Cashu] No mnemonic provided - wallet generated new one")
-            logger.warning(
-                "[Cashu] WARNING: Auto-generated mnemonic is NOT persisted! "
-                "Funds will be LOST on restart. Set WALLET_MNEMONIC env var."
-            )
+        async with self._init_step("init_private_key"):
+            if self._mnemonic:
+                await self._wallet._init_private_key(from_mnemonic=self._mnemonic)
+                logger.info("[Cashu] Wallet initialized with provided mnemonic")
+                # Security reminder for operators
+                logger.warning(
+                    "[Cashu] IMPORTANT: Ensure WALLET_MNEMONIC is backed up securely! "
+                    "Losing the mnemonic means losing access to all funds."
+                )
+            else:
+                await self._wallet._init_private_key()
+                logger.warning("[Cashu] No mnemonic provided - wallet generated new one")
+                logger.warning(
+                    "[Cashu] WARNING: Auto-generated mnemonic is NOT persisted! "
+                    "Funds will be LOST on restart. Set WALLET_MNEMONIC env var."
+                )
         
-        # Load mint keysets
-        await self._wallet.load_mint()
+        # Load the primary mint and probe the other trusted mints concurrently,
+        # so this step takes as long as the slowest mint rather than the sum
+        async with self._init_step("load_mint"):
+            other_mints = sorted(self._trusted_mints - {self._mint_url})
+            _, probed = await asyncio.gather(
+                self._load_primary_mint(),
+                probe_mints(other_mints, self._mint_probe_timeout),
+            )
+            self._mint_status.update(probed)
         
         # Load existing proofs from database
-        await self._wallet.load_proofs(reload=True)
+        async with self._init_step("load_proofs"):
+            await self._wallet.load_proofs(reload=True)
         
         self._initialized = True
+        self._mark_state_changed("initialized")
         logger.info(f"[Cashu] Wallet initialized with mint: {self._mint_url}")
         logger.info(f"[Cashu] Trusted mints: {', '.join(self._trusted_mints)}")
         logger.info(f"[Cashu] Data directory: {self._data_dir}")
@@ -232,6 +495,153 @@ class CashuService:
         else:
             logger.info("[Cashu] Automatic payout disabled (set PAYOUT_LN_ADDRESS to enable)")
     
+    async def _load_primary_mint(self):
+        """Load the primary mint's keysets and info.
+        
+        Uses the on-disk snapshot if we have a valid one, otherwise the mint
+        (and writes a snapshot for the next boot). A mint that doesn't answer
+        within the probe timeout is marked degraded and retried in the background.
+        """
+        status = self._mint_status[self._mint_url]
+        start = time.monotonic()
+        
+        if await self._load_mint_from_snapshot():
+            status.status = "ok"
+            self._revalidate_task = asyncio.create_task(self._revalidate_mint_metadata())
+        else:
+            try:
+                # load_mint() logs and swallows its own network errors
+                await asyncio.wait_for(self._wallet.load_mint(), self._mint_probe_timeout)
+            except asyncio.TimeoutError:
+                status.error = f"Timed out after {self._mint_probe_timeout:.0f}s"
+            
+            saved = self._save_mint_snapshot()
+            self._mint_metadata.update(source="network", revalidated=saved)
+            if saved:
+                status.status = "ok"
+                status.error = None
+            else:
+                status.status = "degraded"
+                status.error = status.error or "Could not load mint keysets"
+                logger.warning(f"[Cashu] Primary mint {self._mint_url} degraded: {status.error}")
+                self._revalidate_task = asyncio.create_task(self._revalidate_mint_metadata())
+        
+        status.latency_ms = int((time.monotonic() - start) * 1000)
+        status.checked_at = time.time()
+        status.name = getattr(getattr(self._wallet, "mint_info", None), "name", None)
+        status.keyset_ids = [k.id for k in self._wallet.keysets.values() if k.active]
+    
+    async def _load_mint_from_snapshot(self) -> bool:
+        """Activate the mint's keyset from the on-disk snapshot without network access.
+        
+        The keys themselves are read from the wallet database by Wallet.with_db();
+        the snapshot only tells us which keyset to activate and is rejected if any
+        of its keysets are missing from the database.
+        
+        Returns:
+            True if the wallet was loaded from the snapshot
+        """
+        snapshot = load_mint_snapshot(self._mint_snapshot_path, self._mint_url, self._snapshot_max_age)
+        if snapshot is None or not snapshot.active_keyset_id:
+            return False
+        
+        missing = snapshot.keyset_ids - set(self._wallet.keysets)
+        if missing or snapshot.active_keyset_id not in self._wallet.keysets:
+            logger.info(f"[Cashu] Mint snapshot does not match wallet database (missing {missing}), loading from mint")
+            return False
+        
+        try:
+            await self._wallet.activate_keyset(snapshot.active_keyset_id)
+            if getattr(self._wallet, "mint_info", None) is None and snapshot.info:
+                from cashu.wallet.mint_info import MintInfo
+                self._wallet.mint_info = MintInfo.model_validate(snapshot.info)
+        except Exception as e:
+            logger.warning(f"[Cashu] Could not load mint from snapshot: {e}")
+            return False
+        
+        self._mint_metadata.update(
+            source="snapshot",
+            snapshot_age_seconds=int(snapshot.age_seconds),
+            revalidated=False,
+        )
+        logger.info(
+            f"[Cashu] Loaded mint metadata from snapshot ({int(snapshot.age_seconds)}s old), "
+            f"active keyset {snapshot.active_keyset_id}"
+        )
+        return True
+    
+    def _save_mint_snapshot(self) -> bool:
+        """Write the wallet's current mint metadata to the on-disk snapshot.
+        
+        Returns:
+            True if a snapshot was written
+        """
+        keyset_id = getattr(self._wallet, "keyset_id", None)
+        if not keyset_id:
+            # load_mint() swallows network errors - don't persist a broken state
+            logger.warning("[Cashu] No active keyset after loading mint, not writing snapshot")
+            return False
+        
+        mint_info = getattr(self._wallet, "mint_info", None)
+        snapshot = MintSnapshot(
+            mint_url=self._mint_url,
+            active_keyset_id=keyset_id,
+            keysets=[
+                {
+                    "id": k.id,
+                    "unit": k.unit.name,
+                    "active": k.active,
+                    "input_fee_ppk": k.input_fee_ppk,
+                }
+                for k in self._wallet.keysets.values()
+            ],
+            info=mint_info.model_dump(mode="json") if mint_info is not None else None,
+            fetched_at=time.time(),
+        )
+        try:
+            save_mint_snapshot(self._mint_snapshot_path, snapshot)
+        except Exception as e:
+            logger.warning(f"[Cashu] Could not write mint snapshot: {e}")
+            return False
+        return True
+    
+    async def _revalidate_mint_metadata(self):
+        """Background task: refresh mint metadata after a snapshot or degraded start.
+        
+        Retries with backoff until the mint answers, then rewrites the snapshot.
+        Holds the redemption lock so keysets never change mid-redemption.
+        """
+        delay = INIT_RETRY_INITIAL_SECONDS
+        
+        while True:
+            try:
+                previous_keyset = getattr(self._wallet, "keyset_id", None)
+                async with self._redemption_lock:
+                    await self._wallet.load_mint_keysets()
+                    await self._wallet.activate_keyset()
+                    await self._wallet.load_mint_info(reload=True)
+                if not self._save_mint_snapshot():
+                    raise CashuServiceError("Mint returned no active keyset")
+                self._mint_metadata.update(revalidated=True, error=None)
+                status = self._mint_status[self._mint_url]
+                status.status, status.error, status.checked_at = "ok", None, time.time()
+                status.keyset_ids = [k.id for k in self._wallet.keysets.values() if k.active]
+                self._mark_state_changed("mint revalidated")
+                if self._wallet.keyset_id != previous_keyset:
+                    logger.info(f"[Cashu] Active keyset changed: {previous_keyset} -> {self._wallet.keyset_id}")
+                logger.info("[Cashu] Mint metadata revalidated against mint")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._mint_metadata["error"] = str(e)
+                status = self._mint_status[self._mint_url]
+                status.status, status.error, status.checked_at = "degraded", str(e), time.time()
+                self._mark_state_changed("mint degraded")
+                logger.warning(f"[Cashu] Mint revalidation failed: {e} - retrying in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, INIT_RETRY_MAX_SECONDS)
+    
     async def start_payout_task(self):
         """Start the periodic payout background task."""
         if not self._payout_ln_address:
@@ -260,6 +670,17 @@ class CashuService:
         """Background task for periodic Lightning payouts."""
         logger.info(f"[Cashu] Starting payout loop (every {self._payout_interval}s, threshold {self._payout_threshold} sats)")
         
+        # Validate the payout address and warm its LNURL cache before the first payout
+        if await validate_lightning_address(
+            self._payout_ln_address, client=self._http_client, cache=self._lnurl_cache
+        ):
+            logger.info(f"[Cashu] Payout address {self._payout_ln_address} is reachable")
+        else:
+            logger.warning(
+                f"[Cashu] Payout address {self._payout_ln_address} could not be validated; "
+                "payouts will fail until it resolves"
+            )
+        
         while True:
             try:
                 await asyncio.sleep(self._payout_interval)
@@ -271,6 +692,11 @@ class CashuService:
                     result = await self.payout_to_lightning(current_balance)
                     if result.success:
                         logger.info(f"[Cashu] Payout successful: {result.amount_sent} sats sent, {result.fee_paid} sats fee")
+                    elif result.partial:
+                        logger.warning(
+                            f"[Cashu] Payout partially paid: {result.amount_sent} sats sent, "
+                            f"{result.fee_paid} sats fee; {result.error}"
+                        )
                     else:
                         logger.error(f"[Cashu] Payout failed: {result.error}")
                 else:
@@ -310,6 +736,8 @@ class CashuService:
         if not token.startswith("cashuA") and not token.startswith("cashuB"):
             return False, "Invalid token format (must start with cashuA or cashuB)"
         
+        from cashu.wallet.helpers import deserialize_token_from_string
+
         try:
             parsed = deserialize_token_from_string(token)
             if not parsed.proofs:
@@ -347,6 +775,9 @@ class CashuService:
         if not token:
             return 0, "Empty token"
         
+        from cashu.core.helpers import sum_proofs
+        from cashu.wallet.helpers import deserialize_token_from_string
+
         try:
             parsed = deserialize_token_from_string(token)
             if not parsed.proofs:
@@ -355,7 +786,16 @@ class CashuService:
         except Exception as e:
             return 0, f"Failed to parse token: {str(e)}"
 
-    async def receive_token(self, token: str) -> TokenResult:
+    def get_token_mint(self, token: str) -> Optional[str]:
+        """Get the mint URL of a token without redeeming it (None if unparseable)."""
+        from cashu.wallet.helpers import deserialize_token_from_string
+
+        try:
+            return deserialize_token_from_string(token).mint or self._mint_url
+        except Exception:
+            return None
+
+    async def receive_token(self, token: str, agent_id: Optional[str] = None) -> TokenResult:
         """Receive and redeem an ecash token.
         
         Uses the wallet's built-in redeem() method which handles all
@@ -367,6 +807,7 @@ class CashuService:
         
         Args:
             token: The cashu token string (cashuA... or cashuB...)
+            agent_id: Agent the payment was for (used for revenue rollups)
             
         Returns:
             TokenResult with success status and amount
@@ -379,9 +820,32 @@ class CashuService:
         if not is_valid:
             return TokenResult(success=False, error=error)
         
+        # Attribute failed redemptions to the token's mint too
+        token_mint = self.get_token_mint(token)
+        
         # Serialize redemption operations for defense-in-depth
+        started = time.monotonic()
         async with self._redemption_lock:
-            return await self._redeem_token_internal(token)
+            result = await self._redeem_token_internal(token)
+        mint = result.mint or token_mint
+        entry = self._record(
+            "redeem",
+            started,
+            result.success,
+            amount=result.amount,
+            mint=mint,
+            error=result.error,
+            details={"agent_id": agent_id} if agent_id else {},
+        )
+        self._rollups.record(
+            mint=mint,
+            agent_id=agent_id,
+            amount=result.amount,
+            latency_ms=entry.latency_ms,
+            success=result.success,
+            ts=entry.ts,
+        )
+        return result
     
     async def _redeem_token_internal(self, token: str, is_retry: bool = False) -> TokenResult:
         """Internal token redemption logic with retry support.
@@ -393,6 +857,9 @@ class CashuService:
         Returns:
             TokenResult with success status and amount
         """
+        from cashu.core.helpers import sum_proofs
+        from cashu.wallet.helpers import deserialize_token_from_string
+
         try:
             # Parse the token using the library's helper
             parsed_token = deserialize_token_from_string(token)
@@ -417,6 +884,8 @@ class CashuService:
             # Reload proofs to update balance
             await self._wallet.load_proofs(reload=True)
             
+            self._events.publish("token_redeemed", amount=redeemed_amount, mint=token_mint or self._mint_url)
+            self._mark_state_changed("redeem")
             logger.info(f"[Cashu] Successfully redeemed {redeemed_amount} sats")
             logger.info(f"[Cashu] New wallet balance: {self.balance} sats")
             
@@ -486,11 +955,14 @@ class CashuService:
                 batch=25,  # Check 25 positions per batch
             )
             
+            self._events.publish("counter_recovery", success=True, keyset_id=active_keyset)
+            self._mark_state_changed("counter recovery")
             logger.info("[Cashu] Counter recovery completed successfully")
             return True
             
         except Exception as e:
             logger.error(f"[Cashu] Counter recovery failed: {e}")
+            self._events.publish("counter_recovery", success=False, error=str(e))
             return False
 
     async def generate_token(self, amount: int, memo: Optional[str] = None) -> TokenResult:
@@ -512,6 +984,9 @@ class CashuService:
         if amount > self.balance:
             return TokenResult(success=False, error=f"Insufficient balance: {self.balance} sats")
         
+        from cashu.core.helpers import sum_proofs
+
+        started = time.monotonic()
         try:
             # Reload proofs to ensure we have the latest
             await self._wallet.load_proofs(reload=True)
@@ -536,8 +1011,11 @@ class CashuService:
             
             # Mark proofs as reserved
             await self._wallet.set_reserved_for_send(send_proofs, reserved=True)
+            self._events.publish("token_withdrawn", amount=sum_proofs(send_proofs))
+            self._mark_state_changed("withdraw")
             
             logger.info(f"[Cashu] Generated token for {sum_proofs(send_proofs)} sats")
+            self._record("withdraw", started, True, amount=sum_proofs(send_proofs))
             
             return TokenResult(
                 success=True,
@@ -547,13 +1025,133 @@ class CashuService:
             
         except Exception as e:
             logger.error(f"[Cashu] Token generation failed: {e}")
+            self._record("withdraw", started, False, amount=amount, error=str(e))
             return TokenResult(success=False, error=str(e))
     
+    async def generate_tokens(
+        self, amounts: list[int], memo: Optional[str] = None
+    ) -> AsyncIterator[TokenResult]:
+        """Generate one ecash token per amount with as few mint swaps as possible.
+        
+        Amounts are grouped into batches that fit in one swap request (see
+        services/swap.py). Each batch is a single mint round trip whose
+        outputs cover all of its tokens plus change. Tokens are yielded as
+        each batch completes, so very large batches can be streamed.
+        
+        Args:
+            amounts: Token amounts in sats
+            memo: Optional memo for every token
+            
+        Yields:
+            TokenResult per token, with the token string in the 'mint' field.
+            If a batch fails, a final TokenResult with success=False is
+            yielded and generation stops; tokens yielded before stay valid.
+            Each batch's tokens are in its ledger entry before they are yielded.
+        """
+        if not self._initialized or not self._wallet:
+            yield TokenResult(success=False, error="Service not initialized")
+            return
+        
+        if not amounts:
+            yield TokenResult(success=False, error="No amounts given")
+            return
+        
+        if len(amounts) > MAX_BULK_TOKENS:
+            yield TokenResult(success=False, error=f"Too many tokens (max {MAX_BULK_TOKENS})")
+            return
+        
+        if any(amount <= 0 for amount in amounts):
+            yield TokenResult(success=False, error="Amounts must be positive")
+            return
+        
+        if sum(amounts) > self.balance:
+            yield TokenResult(success=False, error=f"Insufficient balance: {self.balance} sats")
+            return
+        
+        for batch in plan_batches(amounts):
+            try:
+                # Shielded: a cancelled request (client gone) must not abandon
+                # a batch between the swap and its ledger entry
+                tokens = await asyncio.shield(self._withdraw_batch(batch, memo))
+            except Exception as e:
+                yield TokenResult(success=False, error=str(e))
+                return
+            
+            for amount, token_str in zip(batch, tokens):
+                yield TokenResult(success=True, amount=amount, mint=token_str)
+    
+    async def _withdraw_batch(self, batch: list[int], memo: Optional[str]) -> list[str]:
+        """Mint one batch of tokens and record them in the ledger.
+        
+        The ledger entry keeps the serialized tokens (`issued_tokens`), so
+        tokens a client never received can be recovered from /ledger.
+        
+        Returns:
+            Serialized tokens, in the order of `batch`
+        """
+        started = time.monotonic()
+        try:
+            async with self._redemption_lock:
+                tokens = await self._swap_for_tokens(batch, memo)
+        except Exception as e:
+            logger.error(f"[Cashu] Bulk token generation failed: {e}")
+            self._record("withdraw", started, False, amount=sum(batch), error=str(e), details={"tokens": len(batch)})
+            raise
+        
+        self._events.publish("token_withdrawn", amount=sum(batch), tokens=len(batch))
+        self._mark_state_changed("withdraw")
+        self._record(
+            "withdraw",
+            started,
+            True,
+            amount=sum(batch),
+            details={"tokens": len(batch), "issued_tokens": tokens},
+        )
+        logger.info(f"[Cashu] Generated {len(batch)} tokens for {sum(batch)} sats in one swap")
+        return tokens
+    
+    async def _swap_for_tokens(self, batch: list[int], memo: Optional[str]) -> list[str]:
+        """Swap once for one set of proofs per amount, reserve and serialize them.
+        
+        Args:
+            batch: Token amounts (must fit in one swap, see plan_batches())
+            memo: Optional memo for every token
+            
+        Returns:
+            Serialized tokens, in the order of `batch`
+        """
+        from cashu.core.helpers import sum_proofs
+
+        await self._wallet.load_proofs(reload=True)
+        available = self._wallet.active_proofs(self._wallet.proofs)
+        total = sum(batch)
+        
+        inputs = self._wallet.coinselect(available, total, include_fees=True)
+        change = sum_proofs(inputs) - total - self._wallet.get_fees_for_proofs(inputs)
+        if not inputs or change < 0:
+            raise CashuServiceError(f"Insufficient balance for {total} sats plus swap fees")
+        
+        groups = await swap_proofs(
+            self._wallet,
+            inputs,
+            [output_amounts(change)] + [output_amounts(amount) for amount in batch],
+        )
+        token_proofs = groups[1:]
+        await self._wallet.set_reserved_for_send(
+            [proof for proofs in token_proofs for proof in proofs], reserved=True
+        )
+        return [
+            await self._wallet.serialize_proofs(proofs, include_dleq=True, legacy=False, memo=memo)
+            for proofs in token_proofs
+        ]
+    
     async def check_token_spent(self, token: str) -> bool:
         """Check if a token has already been spent."""
         if not self._initialized or not self._wallet:
             return True
         
+        from cashu.wallet.helpers import deserialize_token_from_string
+
         try:
             parsed = deserialize_token_from_string(token)
             proof_states = await self._wallet.check_proof_state(parsed.proofs)
@@ -562,39 +1160,290 @@ class CashuService:
             logger.error(f"[Cashu] Error checking token state: {e}")
             return True
     
-    def get_stats(self) -> dict:
-        """Get wallet statistics."""
-        if not self._wallet:
-            return {
-                "balance": 0,
-                "unit": "sat",
-                "mint_url": self._mint_url,
-                "keyset_count": 0,
-                "proof_count": 0,
-                "data_dir": str(self._data_dir),
-                "initialized": False,
-            }
-        
-        return {
-            "balance": self.balance,
-            "unit": str(self._wallet.unit.name) if hasattr(self._wallet.unit, 'name') else "sat",
+    def _compute_stats(self) -> dict:
+        """Compute wallet statistics from the current wallet state."""
+        stats = {
+            "balance": 0,
+            "unit": "sat",
             "mint_url": self._mint_url,
-            "keyset_count": len(self._wallet.keysets),
-            "proof_count": len(self._wallet.proofs),
+            "keyset_count": 0,
+            "proof_count": 0,
             "data_dir": str(self._data_dir),
-            "initialized": self._initialized,
+            "initialized": False,
+            "trusted_mints": sorted(self._trusted_mints),
+            "mints": self.get_mint_status(),
+            "fee_model": self._fee_model.summary(),
         }
+        if not self._wallet:
+            return stats
+        
+        stats.update(
+            balance=self.balance,
+            unit=str(self._wallet.unit.name) if hasattr(self._wallet.unit, 'name') else "sat",
+            keyset_count=len(self._wallet.keysets),
+            proof_count=len(self._wallet.proofs),
+            initialized=self._initialized,
+        )
+        return stats
+    
+    def _mark_state_changed(self, reason: str):
+        """Rebuild the stats snapshot after wallet state changed.
+        
+        Called after initialization, redemptions, withdrawals, melts, fee
+        samples and mint status changes, so stats polls never recompute anything.
+        """
+        previous = self._stats_snapshot
+        self._stats_version += 1
+        self._stats_fee_model_version = self._fee_model.version
+        self._stats_snapshot = StatsSnapshot(
+            version=self._stats_version,
+            stats=self._compute_stats(),
+            boot_id=self._stats_boot_id,
+        )
+        balance = self._stats_snapshot.stats["balance"]
+        if previous is not None and previous.stats["balance"] != balance:
+            self._events.publish(
+                "balance_changed",
+                balance=balance,
+                previous=previous.stats["balance"],
+                reason=reason,
+            )
+        logger.debug(f"[Cashu] Stats snapshot v{self._stats_version} ({reason})")
+    
+    def _record(self, entry_type: str, started: float, success: bool, **fields) -> LedgerEntry:
+        """Queue a ledger entry for an operation that started at `started` (monotonic)."""
+        fields.setdefault("mint", self._mint_url)
+        entry = LedgerEntry(
+            type=entry_type,
+            success=success,
+            latency_ms=int((time.monotonic() - started) * 1000),
+            **fields,
+        )
+        self._ledger.record(entry)
+        return entry
+    
+    def get_stats_snapshot(self) -> StatsSnapshot:
+        """Get the current stats snapshot (see StatsSnapshot.etag())."""
+        if self._stats_snapshot is None:
+            self._mark_state_changed("first use")
+        return self._stats_snapshot
+    
+    def get_stats(self) -> dict:
+        """Get wallet statistics."""
+        return dict(self.get_stats_snapshot().stats)
 
-    async def sweep_all(self, memo: Optional[str] = None) -> TokenResult:
-        """Sweep all funds into a single token."""
+    async def sweep_all(
+        self, memo: Optional[str] = None, max_proofs: int = DEFAULT_SWEEP_MAX_PROOFS
+    ) -> AsyncIterator[TokenResult]:
+        """Sweep all funds into tokens of at most `max_proofs` proofs each.
+        
+        A wallet with few proofs is swept into a single token without a swap.
+        Otherwise proofs are consolidated, smallest first and up to a swap
+        request's worth of inputs at a time, into as few denominations as
+        possible, so a wallet with thousands of small proofs yields a handful
+        of compact tokens instead of one huge one. Tokens are yielded as each
+        chunk completes.
+        
+        Args:
+            memo: Optional memo for every token
+            max_proofs: Maximum proofs per token
+            
+        Yields:
+            TokenResult per token, with the token string in the 'mint' field.
+            If a chunk fails, a final TokenResult with success=False is
+            yielded and the sweep stops; tokens yielded before stay valid.
+            Each chunk's tokens are in its ledger entry before they are yielded.
+        """
         if not self._initialized or not self._wallet:
-            return TokenResult(success=False, error="Service not initialized")
+            yield TokenResult(success=False, error="Service not initialized")
+            return
+        
+        if self.balance <= 0:
+            yield TokenResult(success=False, error="No funds to sweep")
+            return
+        
+        if max_proofs <= 0:
+            yield TokenResult(success=False, error="max_proofs must be positive")
+            return
+        
+        memo = memo or "PlebChat wallet sweep"
+        while True:
+            try:
+                # Shielded: a cancelled request (client gone) must not abandon
+                # a chunk between the swap and its ledger entry
+                tokens = await asyncio.shield(self._sweep_batch(memo, max_proofs))
+            except Exception as e:
+                yield TokenResult(success=False, error=str(e))
+                return
+            if tokens is None:
+                return
+            
+            for token_amount, token_str in tokens:
+                yield TokenResult(success=True, amount=token_amount, mint=token_str)
+    
+    async def _sweep_batch(self, memo: str, max_proofs: int) -> Optional[list[tuple[int, str]]]:
+        """Sweep one chunk of the wallet and record its tokens in the ledger.
+        
+        The ledger entry keeps the serialized tokens (`issued_tokens`), so
+        tokens a client never received can be recovered from /ledger.
+        
+        Returns:
+            [(amount, token)] for the chunk, or None if nothing is left to sweep
+        """
+        started = time.monotonic()
+        try:
+            async with self._redemption_lock:
+                chunk = await self._sweep_chunk(memo, max_proofs)
+        except Exception as e:
+            logger.error(f"[Cashu] Sweep failed: {e}")
+            self._mark_state_changed("sweep failed")
+            self._record("sweep", started, False, amount=0, error=str(e))
+            raise
+        if chunk is None:
+            return None
+        
+        tokens, fee, inputs = chunk
+        amount = sum(token_amount for token_amount, _ in tokens)
+        self._events.publish("token_withdrawn", amount=amount, tokens=len(tokens))
+        self._mark_state_changed("sweep")
+        self._record(
+            "sweep",
+            started,
+            True,
+            amount=amount,
+            fee=fee,
+            details={
+                "tokens": len(tokens),
+                "inputs": inputs,
+                "issued_tokens": [token_str for _, token_str in tokens],
+            },
+        )
+        logger.info(f"[Cashu] Swept {inputs} proofs into {len(tokens)} tokens ({amount} sats, {fee} sats fee)")
+        return tokens
+    
+    async def _sweep_chunk(self, memo: str, max_proofs: int) -> Optional[tuple[list[tuple[int, str]], int, int]]:
+        """Sweep one chunk of the wallet into reserved, serialized tokens.
+        
+        Returns:
+            Tuple of ([(amount, token)], swap fee paid, proofs consumed), or
+            None if nothing is left to sweep
+        """
+        from cashu.core.helpers import sum_proofs
+
+        await self._wallet.load_proofs(reload=True)
+        available = sorted(self._wallet.active_proofs(self._wallet.proofs), key=lambda p: p.amount)
+        if not available:
+            return None
         
+        fee = 0
+        if len(available) <= max_proofs:
+            # Small enough to send as is
+            proofs = available
+        else:
+            # Consolidate the smallest proofs into as few denominations as possible
+            inputs = available[:DEFAULT_MAX_SWAP_INPUTS]
+            fee = self._wallet.get_fees_for_proofs(inputs)
+            value = sum_proofs(inputs) - fee
+            if value <= 0:
+                raise CashuServiceError(f"{len(inputs)} proofs are worth less than the {fee} sat swap fee")
+            (proofs,) = await swap_proofs(self._wallet, inputs, [output_amounts(value)])
+            available = inputs
+        
+        await self._wallet.set_reserved_for_send(proofs, reserved=True)
+        tokens = []
+        for i in range(0, len(proofs), max_proofs):
+            chunk = proofs[i:i + max_proofs]
+            token_str = await self._wallet.serialize_proofs(chunk, include_dleq=True, legacy=False, memo=memo)
+            tokens.append((sum_proofs(chunk), token_str))
+        return tokens, fee, len(available)
+    
+    def _resolve_payout(
+        self, amount: Optional[int], ln_address: Optional[str]
+    ) -> tuple[Optional[str], int, int, Optional[str]]:
+        """Apply payout defaults and checks shared by payouts and estimates.
+        
+        Returns:
+            Tuple of (Lightning address, amount from balance, amount to
+            request in the invoice, error message if the payout can't proceed)
+        """
+        # Use configured address if not provided
+        target_address = ln_address or self._payout_ln_address
+        if not target_address:
+            return None, 0, 0, "No Lightning address configured"
+        
+        # Use full balance if amount not specified
         current_balance = self.balance
-        if current_balance <= 0:
-            return TokenResult(success=False, error="No funds to sweep")
+        payout_amount = amount if amount is not None else current_balance
+        
+        if payout_amount <= 0:
+            return target_address, 0, 0, "No funds to payout"
         
-        return await self.generate_token(current_balance, memo=memo or "PlebChat wallet sweep")
+        if payout_amount > current_balance:
+            return target_address, payout_amount, 0, f"Insufficient balance: {current_balance} sats"
+        
+        # Estimate fee and ensure we can afford it
+        estimated_fee = self._fee_model.estimate(payout_amount, self._mint_url, target_address)
+        if payout_amount <= estimated_fee:
+            return (
+                target_address, payout_amount, 0,
+                f"Amount too small to cover estimated fee ({estimated_fee} sats)",
+            )
+        
+        # Amount to request from LNURL (after fee estimation)
+        return target_address, payout_amount, payout_amount - estimated_fee, None
+    
+    async def estimate_payout(
+        self,
+        amount: Optional[int] = None,
+        ln_address: Optional[str] = None,
+    ) -> tuple[list[PayoutQuote], Optional[str]]:
+        """Dry-run a Lightning payout: get the invoice(s) and melt quote(s), pay nothing.
+        
+        Amounts above the address's maxSendable are planned into parts exactly
+        as payout_to_lightning() would split them, and every part is quoted.
+        
+        A single quote is cached until it expires; a payout_to_lightning()
+        call for the same address and amount before then reuses it and skips
+        the LNURL and melt quote round trips. Split payouts quote their parts
+        afresh, so part quotes are not cached.
+        
+        Args:
+            amount: Amount in sats to send (default: full balance)
+            ln_address: Lightning address to pay (default: configured PAYOUT_LN_ADDRESS)
+            
+        Returns:
+            Tuple of (one PayoutQuote per invoice, error message if quoting failed)
+        """
+        if not self._initialized or not self._wallet:
+            return [], "Service not initialized"
+        
+        target_address, payout_amount, net_amount, error = self._resolve_payout(amount, ln_address)
+        if error:
+            return [], error
+        
+        try:
+            pay_data = await self._lnurl_cache.get(target_address, client=self._http_client)
+            parts = (
+                self._plan_payout_parts(target_address, payout_amount, pay_data)
+                if net_amount * 1000 > pay_data["max_sendable"]
+                else []
+            )
+        except LNURLError as e:
+            return [], f"LNURL error: {e}"
+        if len(parts) > 1:
+            quoted = await asyncio.gather(
+                *[self._quote_payout(target_address, total, net) for total, net in parts]
+            )
+            errors = [error for quote, error in quoted if quote is None]
+            if errors:
+                return [], f"{len(errors)} of {len(parts)} invoices could not be quoted: {errors[0]}"
+            return [quote for quote, _ in quoted], None
+        
+        quote, error = await self._quote_payout(target_address, payout_amount, net_amount)
+        if quote is None:
+            return [], error
+        self._payout_quotes.put(quote)
+        return [quote], None
     
     async def payout_to_lightning(
         self, 
@@ -604,7 +1453,8 @@ class CashuService:
         """Send funds to a Lightning address via the mint.
         
         Uses the mint's melt capability to pay a Lightning invoice
-        obtained from the Lightning address (LNURL-pay).
+        obtained from the Lightning address (LNURL-pay). Reuses the quote
+        from a recent estimate_payout() for the same address and amount.
         
         Args:
             amount: Amount in sats to send (default: full balance)
@@ -616,31 +1466,125 @@ class CashuService:
         if not self._initialized or not self._wallet:
             return PayoutResult(success=False, error="Service not initialized")
         
-        # Use configured address if not provided
-        target_address = ln_address or self._payout_ln_address
-        if not target_address:
-            return PayoutResult(success=False, error="No Lightning address configured")
+        target_address, payout_amount, net_amount, error = self._resolve_payout(amount, ln_address)
+        if error:
+            return PayoutResult(success=False, error=error)
         
-        # Use full balance if amount not specified
-        current_balance = self.balance
-        payout_amount = amount if amount is not None else current_balance
+        self._events.publish("payout_started", amount=payout_amount, address=target_address)
+        started = time.monotonic()
+        async with self._redemption_lock:
+            result = await self._payout_internal(target_address, payout_amount, net_amount)
+        await self._fee_model.flush()
+        if self._fee_model.version != self._stats_fee_model_version:
+            # Payouts that failed before melting still add fee samples
+            self._mark_state_changed("fee samples")
+        self._record(
+            "payout",
+            started,
+            result.success,
+            amount=result.amount_sent if result.success or result.partial else payout_amount,
+            fee=result.fee_paid,
+            error=result.error,
+            details={
+                "address": target_address,
+                "step_latency_ms": result.step_latency_ms,
+                "parts": len(result.parts) or 1,
+                "partial": result.partial,
+            },
+        )
+        self._events.publish(
+            "payout_finished",
+            success=result.success,
+            partial=result.partial,
+            amount_sent=result.amount_sent,
+            fee_paid=result.fee_paid,
+            error=result.error,
+        )
+        return result
+    
+    def _plan_payout_parts(
+        self, ln_address: str, total_amount: int, pay_data: LNURLPayData
+    ) -> list[tuple[int, int]]:
+        """plan_payout_parts() with fees from the learned fee model."""
+        return plan_payout_parts(
+            total_amount,
+            pay_data,
+            fee_estimate=lambda amount: self._fee_model.estimate(amount, self._mint_url, ln_address),
+        )
+    
+    async def _quote_payout(
+        self,
+        ln_address: str,
+        total_amount: int,
+        net_amount: int,
+    ) -> tuple[Optional[PayoutQuote], Optional[str]]:
+        """Get an invoice from the Lightning address and a melt quote for it.
         
-        if payout_amount <= 0:
-            return PayoutResult(success=False, error="No funds to payout")
+        Args:
+            ln_address: Lightning address to pay
+            total_amount: Total amount of proofs to use
+            net_amount: Amount to request in invoice (after fee reserve)
+            
+        Returns:
+            Tuple of (PayoutQuote, error message if any step failed)
+        """
+        step_latency_ms: dict[str, int] = {}
         
-        if payout_amount > current_balance:
-            return PayoutResult(success=False, error=f"Insufficient balance: {current_balance} sats")
+        # 1. Get LNURL-pay data from Lightning address
+        logger.info(f"[Cashu] Getting LNURL-pay data from {ln_address}")
+        started = time.monotonic()
+        try:
+            pay_data = await self._lnurl_cache.get(ln_address, client=self._http_client)
+        except LNURLError as e:
+            return None, f"LNURL error: {e}"
+        finally:
+            step_latency_ms["lnurl_pay_request"] = int((time.monotonic() - started) * 1000)
         
-        # Estimate fee and ensure we can afford it
-        estimated_fee = estimate_lightning_fee(payout_amount)
-        if payout_amount <= estimated_fee:
-            return PayoutResult(success=False, error=f"Amount too small to cover estimated fee ({estimated_fee} sats)")
+        # 2. Validate amount is within LNURL limits
+        net_amount_msat = net_amount * 1000
+        if net_amount_msat < pay_data["min_sendable"]:
+            return None, f"Amount {net_amount} sats below minimum {pay_data['min_sendable'] // 1000} sats"
+        if net_amount_msat > pay_data["max_sendable"]:
+            return None, f"Amount {net_amount} sats above maximum {pay_data['max_sendable'] // 1000} sats"
         
-        # Amount to request from LNURL (after fee estimation)
-        net_amount = payout_amount - estimated_fee
+        # 3. Request Lightning invoice from LNURL callback
+        logger.info(f"[Cashu] Requesting invoice for {net_amount} sats")
+        started = time.monotonic()
+        try:
+            bolt11_invoice = await get_lnurl_invoice(
+                pay_data["callback_url"], net_amount_msat, client=self._http_client
+            )
+        except LNURLError as e:
+            # The callback may have moved; fetch fresh payRequest data next time
+            self._lnurl_cache.invalidate(ln_address)
+            return None, f"Failed to get invoice: {e}"
+        finally:
+            step_latency_ms["lnurl_invoice"] = int((time.monotonic() - started) * 1000)
         
-        async with self._redemption_lock:
-            return await self._payout_internal(target_address, payout_amount, net_amount)
+        # 4. Get melt quote from mint
+        logger.info("[Cashu] Getting melt quote from mint")
+        started = time.monotonic()
+        try:
+            melt_quote = await self._wallet.melt_quote(bolt11_invoice)
+        except Exception as e:
+            return None, f"Failed to get melt quote: {e}"
+        finally:
+            step_latency_ms["melt_quote"] = int((time.monotonic() - started) * 1000)
+        
+        logger.info(
+            "[Cashu] Payout quote ready: "
+            + ", ".join(f"{step} {ms}ms" for step, ms in step_latency_ms.items())
+        )
+        return PayoutQuote(
+            ln_address=ln_address,
+            amount=total_amount,
+            invoice_amount=melt_quote.amount,
+            invoice=bolt11_invoice,
+            quote_id=melt_quote.quote,
+            fee_reserve=melt_quote.fee_reserve,
+            expires_at=melt_quote.expiry or time.time() + DEFAULT_QUOTE_TTL_SECONDS,
+            step_latency_ms=step_latency_ms,
+        ), None
     
     async def _payout_internal(
         self, 
@@ -658,45 +1602,41 @@ class CashuService:
         Returns:
             PayoutResult with success status and amounts
         """
+        from cashu.core.helpers import sum_proofs
+
         try:
-            # 1. Get LNURL-pay data from Lightning address
-            logger.info(f"[Cashu] Getting LNURL-pay data from {ln_address}")
-            try:
-                pay_data = await get_lnurl_pay_data(ln_address)
-            except LNURLError as e:
-                return PayoutResult(success=False, error=f"LNURL error: {e}")
-            
-            # 2. Validate amount is within LNURL limits
-            net_amount_msat = net_amount * 1000
-            if net_amount_msat < pay_data["min_sendable"]:
-                return PayoutResult(
-                    success=False, 
-                    error=f"Amount {net_amount} sats below minimum {pay_data['min_sendable'] // 1000} sats"
-                )
-            if net_amount_msat > pay_data["max_sendable"]:
-                return PayoutResult(
-                    success=False, 
-                    error=f"Amount {net_amount} sats above maximum {pay_data['max_sendable'] // 1000} sats"
-                )
-            
-            # 3. Request Lightning invoice from LNURL callback
-            logger.info(f"[Cashu] Requesting invoice for {net_amount} sats")
-            try:
-                bolt11_invoice = await get_lnurl_invoice(pay_data["callback_url"], net_amount_msat)
-            except LNURLError as e:
-                return PayoutResult(success=False, error=f"Failed to get invoice: {e}")
-            
-            # 4. Get melt quote from mint
-            logger.info("[Cashu] Getting melt quote from mint")
-            melt_quote = await self._wallet.melt_quote(bolt11_invoice)
+            # 1-4. Invoice and melt quote, from a recent estimate if there is one
+            quote = self._payout_quotes.take(ln_address, total_amount)
+            if quote is not None:
+                logger.info(f"[Cashu] Using cached payout quote {quote.quote_id}")
+                step_latency_ms = {}
+            else:
+                # Payouts above the address's maxSendable are split into several invoices
+                try:
+                    pay_data = await self._lnurl_cache.get(ln_address, client=self._http_client)
+                    parts = (
+                        self._plan_payout_parts(ln_address, total_amount, pay_data)
+                        if net_amount * 1000 > pay_data["max_sendable"]
+                        else []
+                    )
+                except LNURLError as e:
+                    return PayoutResult(success=False, error=f"LNURL error: {e}")
+                if len(parts) > 1:
+                    return await self._split_payout(ln_address, parts)
+                
+                quote, error = await self._quote_payout(ln_address, total_amount, net_amount)
+                if error:
+                    return PayoutResult(success=False, error=error)
+                step_latency_ms = dict(quote.step_latency_ms)
             
             # 5. Select proofs to pay (including fee reserve)
             # Total needed = invoice amount + fee reserve
-            total_needed = melt_quote.amount + melt_quote.fee_reserve
+            total_needed = quote.total_needed
             
             await self._wallet.load_proofs(reload=True)
             
             if total_needed > self.balance:
+                self._record_fee(ln_address, quote)
                 return PayoutResult(
                     success=False, 
                     error=f"Insufficient balance for payment + fees: need {total_needed}, have {self.balance}"
@@ -713,28 +1653,166 @@ class CashuService:
             
             # 6. Execute melt (pay the Lightning invoice)
             logger.info(f"[Cashu] Melting {sum_proofs(send_proofs)} sats to pay invoice")
+            started = time.monotonic()
             melt_response = await self._wallet.melt(
                 proofs=send_proofs,
-                invoice=bolt11_invoice,
-                fee_reserve_sat=melt_quote.fee_reserve,
-                quote_id=melt_quote.quote,
+                invoice=quote.invoice,
+                fee_reserve_sat=quote.fee_reserve,
+                quote_id=quote.quote_id,
             )
+            step_latency_ms["melt"] = int((time.monotonic() - started) * 1000)
+            # Routing fee actually paid: the reserve minus the change returned
+            actual_fee = self._record_fee(ln_address, quote, melt_response)
             
             # 7. Reload proofs to update balance
             await self._wallet.load_proofs(reload=True)
+            self._mark_state_changed("melt")
             
-            # Calculate actual fee paid
-            actual_fee = sum_proofs(send_proofs) - net_amount
-            
-            logger.info(f"[Cashu] Payout complete: {net_amount} sats sent, {actual_fee} sats fee")
+            logger.info(f"[Cashu] Payout complete: {quote.invoice_amount} sats sent, {actual_fee} sats fee")
             logger.info(f"[Cashu] New wallet balance: {self.balance} sats")
             
             return PayoutResult(
                 success=True,
-                amount_sent=net_amount,
+                amount_sent=quote.invoice_amount,
                 fee_paid=actual_fee,
+                step_latency_ms=step_latency_ms,
             )
             
         except Exception as e:
             logger.error(f"[Cashu] Payout failed: {e}")
-            return PayoutResult(success=False, error=str(e))
\ No newline at end of file
+            # Proofs may have been reserved for the failed melt
+            self._mark_state_changed("melt failed")
+            return PayoutResult(success=False, error=str(e))
+    
+    async def _split_payout(self, ln_address: str, parts: list[tuple[int, int]]) -> PayoutResult:
+        """Pay out in several invoices at once.
+        
+        Quotes every part concurrently, swaps once for a disjoint set of
+        proofs per part, then melts all parts concurrently. Parts that fail
+        keep their proofs in the wallet; the result reports what was paid.
+        
+        Args:
+            ln_address: Lightning address to pay
+            parts: (total, invoice amount) per part, from plan_payout_parts()
+            
+        Returns:
+            PayoutResult with aggregate amounts and per-part results
+        """
+        from cashu.core.helpers import sum_proofs
+
+        logger.info(f"[Cashu] Splitting payout of {sum(t for t, _ in parts)} sats into {len(parts)} invoices")
+        results = [PayoutPart(amount=total) for total, _ in parts]
+        step_latency_ms: dict[str, int] = {}
+        
+        # 1. Invoices and melt quotes for all parts
+        started = time.monotonic()
+        quoted = await asyncio.gather(
+            *[self._quote_payout(ln_address, total, net) for total, net in parts]
+        )
+        step_latency_ms["quotes"] = int((time.monotonic() - started) * 1000)
+        quotes: list[tuple[PayoutPart, PayoutQuote]] = []
+        for part, (quote, error) in zip(results, quoted):
+            if quote is None:
+                part.error = error
+            else:
+                part.quote_id = quote.quote_id
+                quotes.append((part, quote))
+        if not quotes:
+            return PayoutResult(
+                success=False,
+                error=f"No invoice could be quoted: {results[0].error}",
+                step_latency_ms=step_latency_ms,
+                parts=results,
+            )
+        
+        # 2. One swap for exact proofs per part, including their melt input fees
+        started = time.monotonic()
+        await self._wallet.load_proofs(reload=True)
+        available = self._wallet.active_proofs(self._wallet.proofs)
+        amounts = [amount_covering_fees(self._wallet, quote.total_needed) for _, quote in quotes]
+        inputs = self._wallet.coinselect(available, sum(amounts), include_fees=True)
+        change = sum_proofs(inputs) - sum(amounts) - self._wallet.get_fees_for_proofs(inputs)
+        if not inputs or change < 0:
+            for _, quote in quotes:
+                self._record_fee(ln_address, quote)
+            return PayoutResult(
+                success=False,
+                error=f"Insufficient balance for payment + fees: need {sum(amounts)}, have {self.balance}",
+                step_latency_ms=step_latency_ms,
+                parts=results,
+            )
+        groups = await swap_proofs(
+            self._wallet,
+            inputs,
+            [output_amounts(change)] + [output_amounts(amount) for amount in amounts],
+        )
+        step_latency_ms["swap"] = int((time.monotonic() - started) * 1000)
+        
+        # 3. Melt all parts concurrently
+        started = time.monotonic()
+        melted = await asyncio.gather(
+            *[
+                self._wallet.melt(
+                    proofs=proofs,
+                    invoice=quote.invoice,
+                    fee_reserve_sat=quote.fee_reserve,
+                    quote_id=quote.quote_id,
+                )
+                for (_, quote), proofs in zip(quotes, groups[1:])
+            ],
+            return_exceptions=True,
+        )
+        step_latency_ms["melts"] = int((time.monotonic() - started) * 1000)
+        for (part, quote), outcome in zip(quotes, melted):
+            if isinstance(outcome, BaseException):
+                # The wallet releases the proofs of a failed melt
+                part.error = str(outcome) or type(outcome).__name__
+                self._record_fee(ln_address, quote)
+            else:
+                part.success = True
+                part.amount_sent = quote.invoice_amount
+                part.fee_paid = self._record_fee(ln_address, quote, outcome)
+        
+        # 4. Reconcile: reload so paid parts leave the balance and failed parts stay
+        await self._wallet.load_proofs(reload=True)
+        self._mark_state_changed("melt")
+        
+        paid = [part for part in results if part.success]
+        failed = [part for part in results if not part.success]
+        amount_sent = sum(part.amount_sent for part in paid)
+        fee_paid = sum(part.fee_paid for part in paid)
+        logger.info(
+            f"[Cashu] Split payout: {len(paid)}/{len(results)} invoices paid, "
+            f"{amount_sent} sats sent, {fee_paid} sats fee"
+        )
+        logger.info(f"[Cashu] New wallet balance: {self.balance} sats")
+        
+        return PayoutResult(
+            success=not failed,
+            amount_sent=amount_sent,
+            fee_paid=fee_paid,
+            error=f"{len(failed)} of {len(results)} invoices failed: {failed[0].error}" if failed else None,
+            partial=bool(paid) and bool(failed),
+            step_latency_ms=step_latency_ms,
+            parts=results,
+        )
+    
+    def _record_fee(self, ln_address: str, quote: PayoutQuote, melt_response=None) -> Optional[int]:
+        """Feed a consumed melt quote (and the melt's returned change) to the fee model.
+        
+        Returns:
+            Routing fee paid (fee reserve minus change), or None without a melt
+        """
+        fee_paid = None
+        if melt_response is not None:
+            change = sum(promise.amount for promise in (melt_response.change or []))
+            fee_paid = max(quote.fee_reserve - change, 0)
+        self._fee_model.record(
+            mint=self._mint_url,
+            ln_address=ln_address,
+            amount=quote.invoice_amount,
+            fee_reserve=quote.fee_reserve,
+            predicted_fee=quote.amount - quote.invoice_amount,
+            fee_paid=fee_paid,
+        )
+        return fee_paid
@@ -0,0 +1,133 @@
+"""In-memory wallet event bus.
+
+`CashuService` publishes an event for everything an operator wants to see
+live (token redeemed, withdrawal, payout started/finished, counter recovery,
+balance change). Events get increasing integer ids and are kept in a ring
+buffer, so a client that reconnects with the last id it saw gets what it
+missed. Subscribers receive new events through bounded queues; a subscriber
+that falls too far behind is dropped and has to reconnect.
+"""
+
+import asyncio
+import secrets
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from loguru import logger
+
+# Events kept for reconnecting clients
+DEFAULT_EVENT_BUFFER_SIZE = 500
+
+# Events queued per subscriber before it is dropped
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 100
+
+
+@dataclass
+class WalletEvent:
+    """A single wallet event."""
+
+    id: int
+    type: str
+    data: dict = field(default_factory=dict)
+    timestamp: float = 0.0
+    boot_id: str = ""
+
+    @property
+    def event_id(self) -> str:
+        """Id sent to clients (SSE `id:`); unique across restarts."""
+        return f"{self.boot_id}-{self.id}"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class EventBus:
+    """Ring-buffered publish/subscribe for wallet events."""
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
+        queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+    ):
+        self._buffer: deque[WalletEvent] = deque(maxlen=buffer_size)
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._last_id = 0
+        self._boot_id = secrets.token_hex(4)
+
+    @property
+    def last_id(self) -> int:
+        """Id of the most recent event (0 if none)."""
+        return self._last_id
+
+    def publish(self, event_type: str, **data) -> WalletEvent:
+        """Record an event and deliver it to all subscribers.
+
+        Args:
+            event_type: Event type, e.g. "token_redeemed"
+            **data: Event payload (must be JSON-serializable)
+
+        Returns:
+            The published event
+        """
+        self._last_id += 1
+        event = WalletEvent(
+            id=self._last_id,
+            type=event_type,
+            data=data,
+            timestamp=time.time(),
+            boot_id=self._boot_id,
+        )
+        self._buffer.append(event)
+
+        for queue in list(self._subscribers):
+            if queue.qsize() >= self._queue_size:
+                # Too slow - drop it; the client reconnects with Last-Event-ID
+                self._subscribers.discard(queue)
+                queue.put_nowait(None)
+                logger.warning("[Events] Dropped slow subscriber")
+            else:
+                queue.put_nowait(event)
+        return event
+
+    def subscribe(self) -> asyncio.Queue:
+        """Subscribe to new events.
+
+        The queue yields WalletEvent objects, or None if the subscriber was
+        dropped for falling behind.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size + 1)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering events to a queue."""
+        self._subscribers.discard(queue)
+
+    def events_since(self, last_event_id: Optional[str]) -> Optional[list[WalletEvent]]:
+        """Get buffered events after a client's last seen event id.
+
+        Args:
+            last_event_id: WalletEvent.event_id the client saw last, or None
+                for a new client
+
+        Returns:
+            Events newer than last_event_id, or None if the client can't be
+            caught up (events already evicted, or id from before a restart)
+            and should resync
+        """
+        if not last_event_id:
+            return []
+
+        boot_id, _, seq = last_event_id.rpartition("-")
+        if boot_id != self._boot_id or not seq.isdigit() or int(seq) > self._last_id:
+            return None
+
+        last_id = int(seq)
+        if last_id == self._last_id:
+            return []
+        if not self._buffer or self._buffer[0].id > last_id + 1:
+            return None
+        return [event for event in self._buffer if event.id > last_id]
@@ -0,0 +1,215 @@
+"""Lightning fee estimates learned from past melt quotes.
+
+A payout requests an invoice for its amount minus an estimated routing fee;
+the mint then quotes a `fee_reserve` that must also be covered by the
+proofs. Guessing too high leaves sats behind on every payout, guessing too
+low makes the payout fail after a wasted melt quote.
+
+`FeeModel` keeps the most recent quotes per (mint, destination host) and
+estimates the reserve for a new amount as
+
+    max(min_fee, ceil(amount * fee_ppm / 1e6))
+
+where `min_fee` is the smallest reserve seen (the mint's floor) and `fee_ppm`
+is a high quantile of the reserve rate over quotes above that floor. With
+too few samples for a destination it falls back to all destinations of the
+mint, then to the static `estimate_lightning_fee()` default.
+
+Samples are persisted to `data/fee_model.json` after each payout.
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from .lnurl import estimate_lightning_fee
+
+# Fee model file format version
+FEE_MODEL_VERSION = 1
+
+# Quotes kept per mint and destination
+MAX_SAMPLES_PER_KEY = 100
+
+# Samples needed before a learned estimate replaces the fallback
+MIN_SAMPLES = 5
+
+# Quantile of the reserve rate used for estimates (high, to rarely under-reserve)
+FEE_QUANTILE = 0.9
+
+# Upper bound on a learned reserve rate (50%)
+MAX_FEE_PPM = 500_000
+
+ANY_DESTINATION = "*"
+
+
+@dataclass
+class FeeSample:
+    """A melt quote consumed by a payout."""
+
+    amount: int  # invoice amount in sats
+    fee_reserve: int  # sats reserved by the mint
+    predicted_fee: int  # sats the estimate had set aside
+    fee_paid: Optional[int] = None  # routing fee actually paid, None if not melted
+    ts: float = 0.0
+
+
+def destination_of(ln_address: str) -> str:
+    """Destination key for a Lightning address: its host."""
+    return ln_address.rsplit("@", 1)[-1].lower()
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class FeeModel:
+    """Per-mint, per-destination fee reserve estimates from recent quotes."""
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._samples: dict[tuple[str, str], deque[FeeSample]] = {}
+        # (mint, destination or ANY_DESTINATION) -> (min_fee, fee_ppm, largest amount), or
+        # None with too few samples; cleared for a key when it gets a new sample
+        self._fits: dict[tuple[str, str], Optional[tuple[int, float, int]]] = {}
+        self._dirty = False
+        # Bumped whenever samples change, so cached summaries can tell they are stale
+        self.version = 0
+
+    def _window(self, mint: str, destination: str) -> list[FeeSample]:
+        if destination != ANY_DESTINATION:
+            return list(self._samples.get((mint, destination), ()))
+        return [s for (m, _), samples in self._samples.items() if m == mint for s in samples]
+
+    def _fit(self, samples: list[FeeSample]) -> tuple[int, float]:
+        """(min_fee, fee_ppm) for a set of samples."""
+        min_fee = min(s.fee_reserve for s in samples)
+        rates = [s.fee_reserve * 1_000_000 / s.amount for s in samples if s.fee_reserve > min_fee and s.amount > 0]
+        return min_fee, min(_quantile(rates, FEE_QUANTILE), MAX_FEE_PPM) if rates else 0.0
+
+    def _fitted(self, mint: str, destination: str) -> Optional[tuple[int, float, int]]:
+        """Cached (min_fee, fee_ppm, largest amount) for a key, None if not learned yet."""
+        key = (mint, destination)
+        if key not in self._fits:
+            samples = self._window(mint, destination)
+            self._fits[key] = (
+                (*self._fit(samples), max(s.amount for s in samples))
+                if len(samples) >= MIN_SAMPLES else None
+            )
+        return self._fits[key]
+
+    def estimate(self, amount: int, mint: str, ln_address: str) -> int:
+        """Estimated fee reserve in sats for paying `amount` sats to `ln_address`."""
+        for destination in (destination_of(ln_address), ANY_DESTINATION):
+            fitted = self._fitted(mint, destination)
+            if fitted is not None:
+                min_fee, fee_ppm, largest_amount = fitted
+                if fee_ppm == 0 and amount > largest_amount:
+                    # Only the floor is known, and only up to the amounts seen.
+                    # Never estimate below it, so the estimate grows with the amount.
+                    return max(min_fee, estimate_lightning_fee(amount))
+                return max(min_fee, math.ceil(amount * fee_ppm / 1_000_000))
+        return estimate_lightning_fee(amount)
+
+    def record(
+        self,
+        mint: str,
+        ln_address: str,
+        amount: int,
+        fee_reserve: int,
+        predicted_fee: int,
+        fee_paid: Optional[int] = None,
+    ):
+        """Add a melt quote consumed by a payout (persisted on the next flush())."""
+        key = (mint, destination_of(ln_address))
+        samples = self._samples.setdefault(key, deque(maxlen=MAX_SAMPLES_PER_KEY))
+        samples.append(FeeSample(amount, fee_reserve, predicted_fee, fee_paid, time.time()))
+        self._fits.pop(key, None)
+        self._fits.pop((mint, ANY_DESTINATION), None)
+        self._dirty = True
+        self.version += 1
+
+    def summary(self) -> dict[str, dict]:
+        """Current estimate and its accuracy per mint and destination."""
+        summary = {}
+        for (mint, destination), samples in sorted(self._samples.items()):
+            samples = list(samples)
+            errors = [s.predicted_fee - s.fee_reserve for s in samples]
+            paid = [s for s in samples if s.fee_paid is not None]
+            entry = {
+                "mint": mint,
+                "destination": destination,
+                "samples": len(samples),
+                "learned": len(samples) >= MIN_SAMPLES,
+                # Estimate minus mint reserve: > 0 over-reserved, < 0 under-reserved
+                "mean_error_sats": round(sum(errors) / len(errors), 1),
+                "mean_abs_error_sats": round(sum(abs(e) for e in errors) / len(errors), 1),
+                "under_reserved": sum(1 for e in errors if e < 0),
+                # Share of the reserve actually spent on routing
+                "reserve_used": (
+                    round(sum(s.fee_paid for s in paid) / max(sum(s.fee_reserve for s in paid), 1), 3)
+                    if paid else None
+                ),
+            }
+            if entry["learned"]:
+                min_fee, fee_ppm = self._fit(samples)
+                entry.update(min_fee=min_fee, fee_ppm=round(fee_ppm))
+            summary[f"{mint} -> {destination}"] = entry
+        return summary
+
+    def _to_dict(self) -> dict:
+        return {
+            "version": FEE_MODEL_VERSION,
+            "samples": [
+                {"mint": mint, "destination": destination, **asdict(sample)}
+                for (mint, destination), samples in self._samples.items()
+                for sample in samples
+            ],
+        }
+
+    def _write(self, data: dict):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp_path, self._path)
+
+    async def flush(self):
+        """Write samples to disk if they changed since the last flush."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, self._to_dict())
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"[Fees] Failed to write {self._path}: {e}")
+
+    async def load(self):
+        """Load persisted samples, if any."""
+        await asyncio.to_thread(self._load)
+
+    def _load(self):
+        try:
+            data = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"[Fees] Could not read {self._path}: {e}")
+            return
+        if data.get("version") != FEE_MODEL_VERSION:
+            logger.info(f"[Fees] Ignoring fee model with unsupported version: {data.get('version')}")
+            return
+        for row in data.get("samples", []):
+            key = (row.pop("mint"), row.pop("destination"))
+            self._samples.setdefault(key, deque(maxlen=MAX_SAMPLES_PER_KEY)).append(FeeSample(**row))
+        self._fits.clear()
+        self.version += 1
+        logger.info(f"[Fees] Loaded {len(data.get('samples', []))} fee samples from {self._path}")
@@ -0,0 +1,247 @@
+"""Append-only transaction ledger.
+
+Every redemption, withdrawal, sweep and payout is recorded with amount, mint,
+fee, latency and outcome in `data/ledger.sqlite3` (separate from the nutshell
+wallet database).
+
+Writes never block the request path: `record()` only enqueues the entry and a
+background task inserts queued entries in batches. Reads use keyset
+pagination on the primary key (`WHERE id < :before ORDER BY id DESC`), so a
+page costs the same at row 10 and at row 10 million.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+# Entry types
+LEDGER_TYPES = ("redeem", "withdraw", "sweep", "payout")
+
+# Batch writer tuning
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Entries waiting to be written; more are dropped (e.g. if the writer never started)
+MAX_QUEUED_ENTRIES = 10_000
+
+# Page size bounds for queries
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    amount INTEGER NOT NULL DEFAULT 0,
+    fee INTEGER NOT NULL DEFAULT 0,
+    mint TEXT,
+    latency_ms INTEGER,
+    error TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_ts ON ledger (ts, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_type ON ledger (type, id);
+"""
+
+_COLUMNS = ("ts", "type", "success", "amount", "fee", "mint", "latency_ms", "error", "details")
+
+
+@dataclass
+class LedgerEntry:
+    """A single ledger row."""
+
+    type: str  # one of LEDGER_TYPES
+    success: bool
+    amount: int = 0
+    fee: int = 0
+    mint: Optional[str] = None
+    latency_ms: Optional[int] = None
+    error: Optional[str] = None
+    details: dict = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+    id: Optional[int] = None  # assigned on insert
+
+    def to_row(self) -> tuple:
+        return (
+            self.ts, self.type, int(self.success), self.amount, self.fee,
+            self.mint, self.latency_ms, self.error,
+            json.dumps(self.details) if self.details else None,
+        )
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "LedgerEntry":
+        return cls(
+            id=row["id"],
+            ts=row["ts"],
+            type=row["type"],
+            success=bool(row["success"]),
+            amount=row["amount"],
+            fee=row["fee"],
+            mint=row["mint"],
+            latency_ms=row["latency_ms"],
+            error=row["error"],
+            details=json.loads(row["details"]) if row["details"] else {},
+        )
+
+
+class Ledger:
+    """SQLite ledger with a batched background writer."""
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ):
+        self._path = Path(path)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[LedgerEntry] = asyncio.Queue(maxsize=MAX_QUEUED_ENTRIES)
+        # Batch taken off the queue by the writer but not handed to SQLite yet
+        self._pending: list[LedgerEntry] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # One thread owns the connection, so reads and writes are serialized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _open(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+
+    async def start(self):
+        """Open the database and start the batch writer."""
+        if self._writer_task is not None:
+            return
+        await self._run(self._open)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        logger.info(f"[Ledger] Recording transactions to {self._path}")
+
+    async def stop(self):
+        """Flush pending entries and close the database."""
+        if self._writer_task is None:
+            return
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        pending, self._pending = self._pending, []
+        await self._flush(pending + self._drain(), final=True)
+        await self._run(self._conn.close)
+        self._conn = None
+
+    def record(self, entry: LedgerEntry):
+        """Queue an entry for writing. Never blocks."""
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            logger.warning(f"[Ledger] Queue full ({MAX_QUEUED_ENTRIES} entries), dropping entry: {entry}")
+
+    def _drain(self) -> list[LedgerEntry]:
+        batch = []
+        while not self._queue.empty() and len(batch) < self._batch_size:
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _insert(self, batch: list[LedgerEntry]):
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO ledger ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [entry.to_row() for entry in batch],
+            )
+
+    async def _flush(self, batch: list[LedgerEntry], final: bool = False):
+        while batch:
+            try:
+                await self._run(self._insert, batch)
+            except Exception as e:
+                # Keep the entries in the log rather than losing them silently
+                logger.error(f"[Ledger] Failed to write {len(batch)} entries: {e}")
+                for entry in batch:
+                    logger.error(f"[Ledger] Unwritten entry: {entry}")
+            batch = self._drain() if final else []
+
+    async def _writer_loop(self):
+        while True:
+            # Wait for the first entry, then give others a moment to join the batch
+            self._pending = [await self._queue.get()]
+            await asyncio.sleep(self._flush_interval)
+            self._pending += self._drain()
+            batch, self._pending = self._pending, []
+            await self._flush(batch)
+
+    def _select(
+        self,
+        before: Optional[int],
+        limit: int,
+        entry_type: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+    ) -> list[LedgerEntry]:
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        if entry_type is not None:
+            clauses.append("type = ?")
+            params.append(entry_type)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT * FROM ledger {where} ORDER BY id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [LedgerEntry.from_row(row) for row in rows]
+
+    async def query(
+        self,
+        before: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        entry_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> tuple[list[LedgerEntry], Optional[int]]:
+        """Get a page of entries, newest first.
+
+        Args:
+            before: Cursor - only entries with id < before (from the previous page)
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            entry_type: Only entries of this type
+            since: Only entries at or after this Unix timestamp
+            until: Only entries before this Unix timestamp
+
+        Returns:
+            Tuple of (entries, cursor for the next page or None if this is the last)
+        """
+        if self._conn is None:
+            return [], None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        # Fetch one extra row to know whether there is a next page
+        entries = await self._run(self._select, before, limit + 1, entry_type, since, until)
+        if len(entries) > limit:
+            entries = entries[:limit]
+            return entries, entries[-1].id
+        return entries, None
@@ -6,17 +6,29 @@ to Lightning addresses (user@domain.com format).
 Reference: https://github.com/lnurl/luds
 """
 
+import asyncio
 import math
-from typing import TypedDict
+import re
+import time
+from typing import Callable, Optional, TypedDict
 
-import httpx
 from loguru import logger
 
-try:
-    from bech32 import bech32_decode, convertbits
-except ModuleNotFoundError:
-    bech32_decode = None  # type: ignore
-    convertbits = None  # type: ignore
+# Connection pool for the shared LNURL client (see create_http_client)
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_LNURL_TIMEOUT_SECONDS = 10.0
+
+# payRequest metadata cache (see LNURLPayCache). Used when the response has no
+# Cache-Control max-age; a max-age is capped at MAX_PAY_DATA_TTL_SECONDS.
+DEFAULT_PAY_DATA_TTL_SECONDS = 600
+MAX_PAY_DATA_TTL_SECONDS = 24 * 60 * 60
+
+# Most invoices a single payout is split into (see plan_payout_parts)
+MAX_PAYOUT_PARTS = 16
+
+_MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
 
 
 class LNURLPayData(TypedDict):
@@ -31,6 +43,52 @@ class LNURLError(Exception):
     pass
 
 
+def create_http_client(timeout: float = DEFAULT_LNURL_TIMEOUT_SECONDS):
+    """Create a long-lived, pooled HTTP client for LNURL requests.
+    
+    Connections are kept alive between payouts, so repeated payouts to the
+    same Lightning address host skip the TCP and TLS handshakes. HTTP/2 is
+    used when the `h2` package is installed (`httpx[http2]`); requests to
+    one host then share a single multiplexed connection.
+    
+    The caller owns the client and must close it with `await client.aclose()`.
+    
+    Args:
+        timeout: Default request timeout in seconds
+        
+    Returns:
+        httpx.AsyncClient
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ModuleNotFoundError:
+        http2 = False
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+async def _get(client, url: str, timeout: float):
+    """GET `url` with the shared client, or a one-off client if none is given."""
+    import httpx
+
+    if client is not None:
+        return await client.get(url, follow_redirects=True, timeout=timeout)
+    async with httpx.AsyncClient() as own_client:
+        return await own_client.get(url, follow_redirects=True, timeout=timeout)
+
+
 async def decode_lnurl(lnurl: str) -> str:
     """Decode LNURL to get the actual URL.
     
@@ -60,7 +118,9 @@ async def decode_lnurl(lnurl: str) -> str:
     
     # Handle bech32 encoded LNURL
     if lnurl.lower().startswith("lnurl"):
-        if bech32_decode is None or convertbits is None:
+        try:
+            from bech32 import bech32_decode, convertbits
+        except ModuleNotFoundError:
             raise LNURLError(
                 "bech32 library is required for LNURL bech32 decoding"
             )
@@ -85,12 +145,17 @@ async def decode_lnurl(lnurl: str) -> str:
     return lnurl
 
 
-async def get_lnurl_pay_data(lnurl: str, timeout: float = 10.0) -> LNURLPayData:
+async def get_lnurl_pay_data(
+    lnurl: str,
+    timeout: float = DEFAULT_LNURL_TIMEOUT_SECONDS,
+    client=None,
+) -> LNURLPayData:
     """Fetch LNURL payRequest data.
     
     Args:
         lnurl: LNURL string in any supported format
         timeout: HTTP request timeout in seconds
+        client: Optional shared httpx.AsyncClient (see create_http_client)
         
     Returns:
         LNURLPayData with callback URL and sendable amounts
@@ -98,14 +163,30 @@ async def get_lnurl_pay_data(lnurl: str, timeout: float = 10.0) -> LNURLPayData:
     Raises:
         LNURLError: If the LNURL data is invalid
     """
+    pay_data, _ = await _fetch_lnurl_pay_data(lnurl, timeout, client)
+    return pay_data
+
+
+async def _fetch_lnurl_pay_data(
+    lnurl: str,
+    timeout: float,
+    client,
+) -> tuple[LNURLPayData, Optional[int]]:
+    """Fetch LNURL payRequest data and how long the server allows caching it.
+    
+    Returns:
+        Tuple of (LNURLPayData, cache lifetime in seconds from Cache-Control
+        or None if the response doesn't say)
+    """
+    import httpx
+
     url = await decode_lnurl(lnurl)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, follow_redirects=True, timeout=timeout)
-            response.raise_for_status()
-        except httpx.HTTPError as e:
-            raise LNURLError(f"HTTP error fetching LNURL data: {e}") from e
+    try:
+        response = await _get(client, url, timeout)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise LNURLError(f"HTTP error fetching LNURL data: {e}") from e
     
     lnurl_data = response.json()
     
@@ -118,17 +199,33 @@ async def get_lnurl_pay_data(lnurl: str, timeout: float = 10.0) -> LNURLPayData:
     if not isinstance(lnurl_data.get("callback"), str):
         raise LNURLError("Invalid LNURL payRequest: missing callback URL")
     
-    return LNURLPayData(
+    pay_data = LNURLPayData(
         callback_url=lnurl_data["callback"],
         min_sendable=lnurl_data.get("minSendable", 1000),  # Default 1 sat
         max_sendable=lnurl_data.get("maxSendable", 1_000_000_000_000),  # Default 1M sats
     )
+    return pay_data, _cache_lifetime(response.headers.get("cache-control", ""))
+
+
+def _cache_lifetime(cache_control: str) -> Optional[int]:
+    """Seconds a response may be cached per its Cache-Control header.
+    
+    Returns 0 for no-store/no-cache, the max-age if present, otherwise None.
+    """
+    directives = cache_control.lower()
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    match = _MAX_AGE_PATTERN.search(directives)
+    if match:
+        return int(match.group(1))
+    return None
 
 
 async def get_lnurl_invoice(
     callback_url: str, 
     amount_msat: int,
-    timeout: float = 10.0
+    timeout: float = DEFAULT_LNURL_TIMEOUT_SECONDS,
+    client=None,
 ) -> str:
     """Request a Lightning invoice from LNURL callback.
     
@@ -136,6 +233,7 @@ async def get_lnurl_invoice(
         callback_url: The LNURL callback URL
         amount_msat: Amount in millisatoshi
         timeout: HTTP request timeout in seconds
+        client: Optional shared httpx.AsyncClient (see create_http_client)
         
     Returns:
         BOLT11 invoice string
@@ -143,16 +241,17 @@ async def get_lnurl_invoice(
     Raises:
         LNURLError: If the response is invalid
     """
+    import httpx
+
     # Add amount parameter (some callbacks use ? some use &)
     separator = "&" if "?" in callback_url else "?"
     request_url = f"{callback_url}{separator}amount={amount_msat}"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(request_url, follow_redirects=True, timeout=timeout)
-            response.raise_for_status()
-        except httpx.HTTPError as e:
-            raise LNURLError(f"HTTP error requesting invoice: {e}") from e
+    try:
+        response = await _get(client, request_url, timeout)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise LNURLError(f"HTTP error requesting invoice: {e}") from e
     
     invoice_data = response.json()
     
@@ -165,11 +264,91 @@ async def get_lnurl_invoice(
     return invoice_data["pr"]
 
 
-async def validate_lightning_address(address: str) -> bool:
+class LNURLPayCache:
+    """TTL cache of LNURL payRequest data, keyed by LNURL / Lightning address.
+    
+    A payRequest's callback URL and sendable range rarely change, so payouts
+    reuse them instead of fetching `/.well-known/lnurlp/<user>` every time.
+    Entries live for the response's Cache-Control max-age (capped at
+    MAX_PAY_DATA_TTL_SECONDS), or DEFAULT_PAY_DATA_TTL_SECONDS without one;
+    `no-store`/`no-cache` responses are not cached. Concurrent lookups of the
+    same address share one request. Callers should `invalidate()` an address
+    when its callback fails, so the next lookup fetches fresh data.
+    """
+
+    def __init__(self, default_ttl: float = DEFAULT_PAY_DATA_TTL_SECONDS):
+        self._default_ttl = default_ttl
+        self._entries: dict[str, tuple[LNURLPayData, float]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get(
+        self,
+        lnurl: str,
+        timeout: float = DEFAULT_LNURL_TIMEOUT_SECONDS,
+        client=None,
+    ) -> LNURLPayData:
+        """Get payRequest data from the cache, fetching it if missing or stale.
+        
+        Args:
+            lnurl: LNURL string in any supported format
+            timeout: HTTP request timeout in seconds
+            client: Optional shared httpx.AsyncClient
+            
+        Returns:
+            LNURLPayData with callback URL and sendable amounts
+            
+        Raises:
+            LNURLError: If the LNURL data is invalid
+        """
+        key = lnurl.strip()
+        cached = self._entries.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        fetch = self._inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch(key, timeout, client))
+            self._inflight[key] = fetch
+            fetch.add_done_callback(lambda done: self._forget(key, done))
+        # A cancelled caller must not cancel the lookup other callers wait on
+        return await asyncio.shield(fetch)
+
+    async def _fetch(self, key: str, timeout: float, client) -> LNURLPayData:
+        pay_data, lifetime = await _fetch_lnurl_pay_data(key, timeout, client)
+        ttl = self._default_ttl if lifetime is None else min(lifetime, MAX_PAY_DATA_TTL_SECONDS)
+        if ttl > 0:
+            self._entries[key] = (pay_data, time.monotonic() + ttl)
+        else:
+            self._entries.pop(key, None)
+        logger.debug(f"[LNURL] Fetched payRequest for {key} (cached for {ttl:.0f}s)")
+        return pay_data
+
+    def _forget(self, key: str, fetch: asyncio.Future):
+        self._inflight.pop(key, None)
+        # Mark a failure as retrieved even if every waiter was cancelled
+        if not fetch.cancelled():
+            fetch.exception()
+
+    def invalidate(self, lnurl: str):
+        """Drop cached data for an address (e.g. after its callback failed)."""
+        if self._entries.pop(lnurl.strip(), None) is not None:
+            logger.debug(f"[LNURL] Invalidated cached payRequest for {lnurl}")
+
+    def clear(self):
+        self._entries.clear()
+
+
+async def validate_lightning_address(
+    address: str,
+    client=None,
+    cache: Optional[LNURLPayCache] = None,
+) -> bool:
     """Validate that a Lightning address is reachable and valid.
     
     Args:
         address: Lightning address (user@domain.com format)
+        client: Optional shared httpx.AsyncClient
+        cache: Optional payRequest cache; a successful check warms it
         
     Returns:
         True if valid and reachable
@@ -178,7 +357,10 @@ async def validate_lightning_address(address: str) -> bool:
         if "@" not in address or len(address.split("@")) != 2:
             return False
         
-        pay_data = await get_lnurl_pay_data(address, timeout=5.0)
+        if cache is not None:
+            pay_data = await cache.get(address, timeout=5.0, client=client)
+        else:
+            pay_data = await get_lnurl_pay_data(address, timeout=5.0, client=client)
         return pay_data["min_sendable"] > 0
     except Exception as e:
         logger.debug(f"[LNURL] Address validation failed for {address}: {e}")
@@ -197,3 +379,81 @@ def estimate_lightning_fee(amount_sats: int, fee_ppm: int = 10000) -> int:
     """
     fee = math.ceil(amount_sats * fee_ppm / 1_000_000)
     return max(fee, 2)
+
+
+def plan_payout_parts(
+    amount_sats: int,
+    pay_data: LNURLPayData,
+    max_parts: int = MAX_PAYOUT_PARTS,
+    fee_estimate: Optional[Callable[[int], int]] = None,
+) -> list[tuple[int, int]]:
+    """Split a payout into invoices that each fit the address's sendable range.
+    
+    Each part takes `total` sats from the balance and requests an invoice for
+    `total` minus its estimated routing fee. Parts are as equal as possible.
+    If more than `max_parts` would be needed, only `max_parts` full-size parts
+    are planned and the rest stays in the wallet for the next payout.
+    
+    Args:
+        amount_sats: Total sats to pay out
+        pay_data: LNURL payRequest data of the recipient
+        max_parts: Maximum number of parts
+        fee_estimate: Routing fee estimate for an amount (default: estimate_lightning_fee)
+        
+    Returns:
+        List of (total, invoice amount) per part, in sats
+        
+    Raises:
+        LNURLError: If the parts would fall below the minimum sendable
+    """
+    fee_estimate = fee_estimate or estimate_lightning_fee
+    max_net = pay_data["max_sendable"] // 1000
+    min_net = math.ceil(pay_data["min_sendable"] / 1000)
+    if max_net < 1:
+        raise LNURLError("Lightning address accepts no payments of at least 1 sat")
+    
+    def fits(total: int) -> bool:
+        return total - fee_estimate(total) <= max_net
+    
+    # Largest part whose invoice (after the estimated fee) still fits: double
+    # an upper bound, then bisect between a part that fits and one that doesn't.
+    # A part of max_net always fits, whatever the fee estimate.
+    low = max_net + fee_estimate(max_net)
+    if not fits(low):
+        low = max_net
+    high = low * 2
+    while fits(high):
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle
+    part_max = low
+    
+    while True:
+        parts_needed = math.ceil(amount_sats / part_max)
+        planned = amount_sats
+        if parts_needed > max_parts:
+            parts_needed = max_parts
+            planned = part_max * max_parts
+        
+        base, extra = divmod(planned, parts_needed)
+        totals = [base + 1] * extra + [base] * (parts_needed - extra)
+        parts = [(total, total - fee_estimate(total)) for total in totals]
+        
+        # A fee estimate that jumps by more than a sat per sat can push a
+        # smaller part over the limit; plan with smaller parts until all fit
+        too_large = [total for total, invoice in parts if invoice > max_net]
+        if not too_large:
+            break
+        part_max = min(too_large) - 1
+        if part_max < 1:
+            raise LNURLError("No payout part fits the maximum sendable")
+    
+    if parts[-1][1] < min_net:
+        raise LNURLError(
+            f"Payout parts of {parts[-1][1]} sats would be below the minimum of {min_net} sats"
+        )
+    return parts
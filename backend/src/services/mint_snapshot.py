@@ -0,0 +1,128 @@
+"""On-disk snapshot of mint metadata for network-free warm starts.
+
+`Wallet.load_mint()` fetches mint info, keysets and keys over the network on
+every boot. The keys themselves are already persisted in the nutshell wallet
+database, so this module only stores what is needed to pick them back up
+offline: the mint info, the keyset list (id, unit, active, fee) and the
+active keyset id.
+
+The snapshot lives in `data/mint_snapshot.json` (one entry per mint URL) and
+carries validation metadata:
+- `version`: snapshot format version (mismatch = ignore)
+- `fetched_at`: when the metadata was last confirmed by the mint
+- `checksum`: SHA256 over the mint entry (corruption = ignore)
+
+Callers still revalidate against the mint in the background after a warm start.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+# Snapshot format version - bump when the layout changes
+SNAPSHOT_VERSION = 1
+
+# Snapshots older than this are ignored and the mint is loaded over the network
+DEFAULT_SNAPSHOT_MAX_AGE_SECONDS = 7 * 24 * 3600  # 7 days
+
+
+@dataclass
+class MintSnapshot:
+    """Cached metadata for a single mint."""
+
+    mint_url: str
+    active_keyset_id: Optional[str]
+    keysets: list[dict] = field(default_factory=list)  # id, unit, active, input_fee_ppk
+    info: Optional[dict] = None
+    fetched_at: float = 0.0
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the metadata was last confirmed by the mint."""
+        return max(time.time() - self.fetched_at, 0.0)
+
+    @property
+    def keyset_ids(self) -> set[str]:
+        """IDs of all keysets in the snapshot."""
+        return {k["id"] for k in self.keysets}
+
+    def checksum(self) -> str:
+        """SHA256 over the canonical JSON of this snapshot."""
+        canonical = json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _read_snapshot_file(path: Path) -> dict:
+    """Read the snapshot file, returning an empty layout if missing or invalid."""
+    try:
+        data = json.loads(path.read_text())
+        if data.get("version") == SNAPSHOT_VERSION and isinstance(data.get("mints"), dict):
+            return data
+        logger.info(f"[Snapshot] Ignoring snapshot with unsupported version: {data.get('version')}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"[Snapshot] Could not read {path}: {e}")
+    return {"version": SNAPSHOT_VERSION, "mints": {}}
+
+
+def load_mint_snapshot(
+    path: Path,
+    mint_url: str,
+    max_age_seconds: int = DEFAULT_SNAPSHOT_MAX_AGE_SECONDS,
+) -> Optional[MintSnapshot]:
+    """Load and validate the snapshot for a mint.
+
+    Args:
+        path: Path to the snapshot file
+        mint_url: Mint URL to load the snapshot for
+        max_age_seconds: Maximum snapshot age to accept
+
+    Returns:
+        MintSnapshot if a valid, fresh snapshot exists, otherwise None
+    """
+    entry = _read_snapshot_file(path)["mints"].get(mint_url)
+    if not entry:
+        return None
+
+    try:
+        snapshot = MintSnapshot(**entry["snapshot"])
+    except Exception as e:
+        logger.warning(f"[Snapshot] Malformed snapshot for {mint_url}: {e}")
+        return None
+
+    if snapshot.checksum() != entry.get("checksum"):
+        logger.warning(f"[Snapshot] Checksum mismatch for {mint_url}, ignoring snapshot")
+        return None
+
+    if snapshot.age_seconds > max_age_seconds:
+        logger.info(
+            f"[Snapshot] Snapshot for {mint_url} is {int(snapshot.age_seconds)}s old "
+            f"(max {max_age_seconds}s), ignoring"
+        )
+        return None
+
+    return snapshot
+
+
+def save_mint_snapshot(path: Path, snapshot: MintSnapshot) -> None:
+    """Store the snapshot for a mint, replacing any previous entry.
+
+    The file is written atomically so a crash never leaves a partial snapshot.
+    """
+    data = _read_snapshot_file(path)
+    data["mints"][snapshot.mint_url] = {
+        "snapshot": asdict(snapshot),
+        "checksum": snapshot.checksum(),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
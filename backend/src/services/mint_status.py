@@ -0,0 +1,122 @@
+"""Concurrent health probes for trusted mints.
+
+At startup every trusted mint is probed in parallel (connectivity, mint info,
+keysets) with a per-mint timeout, so total probe time is that of the slowest
+mint rather than the sum. An unreachable mint is marked `degraded` instead of
+failing startup.
+
+Reference: https://github.com/cashubtc/nuts (NUT-01/02 keysets, NUT-06 info)
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from loguru import logger
+
+# Per-mint probe timeout
+DEFAULT_MINT_PROBE_TIMEOUT_SECONDS = 10.0
+
+
+@dataclass
+class MintStatus:
+    """Health of a single trusted mint."""
+
+    mint_url: str
+    status: str = "pending"  # "pending", "ok" or "degraded"
+    latency_ms: Optional[int] = None
+    name: Optional[str] = None
+    keyset_ids: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+async def _fetch_mint_metadata(client, mint_url: str) -> tuple[dict, dict]:
+    """Fetch /v1/info and /v1/keysets from a mint concurrently."""
+    base = mint_url.rstrip("/")
+    info_response, keysets_response = await asyncio.gather(
+        client.get(f"{base}/v1/info"),
+        client.get(f"{base}/v1/keysets"),
+    )
+    info_response.raise_for_status()
+    keysets_response.raise_for_status()
+    return info_response.json(), keysets_response.json()
+
+
+async def probe_mint(
+    mint_url: str,
+    timeout: float = DEFAULT_MINT_PROBE_TIMEOUT_SECONDS,
+    client=None,
+) -> MintStatus:
+    """Probe a mint's connectivity, info and keysets.
+
+    Never raises - failures are reported as a `degraded` status.
+
+    Args:
+        mint_url: Mint URL to probe
+        timeout: Overall timeout for the probe in seconds
+        client: Optional shared httpx.AsyncClient
+
+    Returns:
+        MintStatus for the mint
+    """
+    import httpx
+
+    start = time.monotonic()
+    status = MintStatus(mint_url=mint_url)
+
+    try:
+        if client is None:
+            async with httpx.AsyncClient(timeout=timeout) as own_client:
+                info, keysets = await asyncio.wait_for(
+                    _fetch_mint_metadata(own_client, mint_url), timeout
+                )
+        else:
+            info, keysets = await asyncio.wait_for(
+                _fetch_mint_metadata(client, mint_url), timeout
+            )
+
+        status.status = "ok"
+        status.name = info.get("name")
+        status.keyset_ids = [
+            k["id"] for k in keysets.get("keysets", []) if k.get("active", True)
+        ]
+    except asyncio.TimeoutError:
+        status.status = "degraded"
+        status.error = f"Timed out after {timeout:.0f}s"
+    except Exception as e:
+        status.status = "degraded"
+        status.error = str(e) or type(e).__name__
+
+    status.latency_ms = int((time.monotonic() - start) * 1000)
+    status.checked_at = time.time()
+
+    if status.status == "ok":
+        logger.info(f"[Mints] {mint_url} ok in {status.latency_ms}ms ({len(status.keyset_ids)} active keysets)")
+    else:
+        logger.warning(f"[Mints] {mint_url} degraded after {status.latency_ms}ms: {status.error}")
+    return status
+
+
+async def probe_mints(
+    mint_urls: list[str],
+    timeout: float = DEFAULT_MINT_PROBE_TIMEOUT_SECONDS,
+) -> dict[str, MintStatus]:
+    """Probe several mints concurrently.
+
+    Args:
+        mint_urls: Mint URLs to probe
+        timeout: Per-mint timeout in seconds
+
+    Returns:
+        Dict of mint URL -> MintStatus
+    """
+    if not mint_urls:
+        return {}
+
+    results = await asyncio.gather(*(probe_mint(url, timeout) for url in mint_urls))
+    return {status.mint_url: status for status in results}
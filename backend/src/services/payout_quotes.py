@@ -0,0 +1,80 @@
+"""Cached payout quotes.
+
+A Lightning payout needs three external round trips before any ecash moves:
+LNURL payRequest, LNURL invoice, and the mint's melt quote. A payout estimate
+(dry run) performs exactly these and keeps the result here until the melt
+quote expires. A real payout for the same address and amount within that
+window takes the quote out of the cache and goes straight to the melt.
+
+Quotes are single-use: taking one removes it, whether or not the payout
+that uses it succeeds.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+# Quote lifetime when the mint doesn't report an expiry
+DEFAULT_QUOTE_TTL_SECONDS = 60
+
+# Quotes this close to expiry are not reused
+QUOTE_EXPIRY_MARGIN_SECONDS = 10
+
+# Quotes kept at most (one per address and amount)
+MAX_CACHED_QUOTES = 32
+
+
+@dataclass
+class PayoutQuote:
+    """Invoice and melt quote for a payout of `amount` sats to `ln_address`."""
+
+    ln_address: str
+    amount: int  # sats taken from the balance
+    invoice_amount: int  # sats requested in the invoice
+    invoice: str  # BOLT11
+    quote_id: str
+    fee_reserve: int  # sats the mint reserves for routing
+    expires_at: float
+    # Time spent on each quoting step ("lnurl_pay_request", "lnurl_invoice", "melt_quote")
+    step_latency_ms: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_needed(self) -> int:
+        """Sats the melt locks up: invoice amount plus fee reserve."""
+        return self.invoice_amount + self.fee_reserve
+
+    @property
+    def usable(self) -> bool:
+        """Whether the quote is far enough from expiry to be used."""
+        return self.expires_at - QUOTE_EXPIRY_MARGIN_SECONDS > time.time()
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class PayoutQuoteCache:
+    """Single-use payout quotes keyed by (Lightning address, amount)."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_QUOTES):
+        self._quotes: dict[tuple[str, int], PayoutQuote] = {}
+        self._max_entries = max_entries
+
+    def put(self, quote: PayoutQuote):
+        """Cache a quote, replacing any previous one for the same address and amount."""
+        self._quotes = {key: q for key, q in self._quotes.items() if q.usable}
+        self._quotes.pop((quote.ln_address, quote.amount), None)
+        while len(self._quotes) >= self._max_entries:
+            # Drop the quote that expires first
+            oldest = min(self._quotes, key=lambda key: self._quotes[key].expires_at)
+            del self._quotes[oldest]
+        self._quotes[(quote.ln_address, quote.amount)] = quote
+
+    def take(self, ln_address: str, amount: int) -> Optional[PayoutQuote]:
+        """Remove and return the quote for this address and amount, if still usable."""
+        quote = self._quotes.pop((ln_address, amount), None)
+        if quote is not None and quote.usable:
+            return quote
+        return None
+
+    def clear(self):
+        self._quotes.clear()
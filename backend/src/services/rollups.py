@@ -0,0 +1,287 @@
+"""Pre-aggregated redemption rollups.
+
+Answers questions like "sats earned per hour per mint" or "per agent tier"
+without scanning the ledger. Every redemption updates one bucket per
+granularity (minute, hour, day), dimensioned by mint and agent id:
+- count, failures and sats redeemed
+- a fixed-bound latency histogram, from which p50/p99 are read
+
+Buckets live in memory and are flushed to `data/rollups.json` periodically
+and on shutdown. Old buckets are pruned per granularity (a day of minutes,
+30 days of hours, a year of days), so a query touches at most a few thousand
+buckets regardless of traffic.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from loguru import logger
+
+# Rollup file format version - bump when the layout or histogram bounds change
+ROLLUPS_VERSION = 1
+
+# Bucket size per granularity
+GRANULARITIES = {"minute": 60, "hour": 3600, "day": 86400}
+
+# Buckets kept per granularity
+DEFAULT_RETENTION = {"minute": 24 * 60, "hour": 30 * 24, "day": 365}
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 60
+
+# Upper bounds (ms) of the latency histogram bins; one extra bin for slower
+LATENCY_BOUNDS_MS = (
+    5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500, 750,
+    1000, 1500, 2000, 3000, 5000, 7500, 10000, 20000, 30000, 60000,
+)
+
+# Agent ids come from clients; cap how many distinct ones get their own rollups
+MAX_AGENT_IDS = 50
+_AGENT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+UNKNOWN = "unknown"
+OTHER = "other"
+
+DIMENSIONS = ("mint", "agent_id")
+
+
+@dataclass
+class RollupBucket:
+    """Aggregated redemptions for one time bucket, mint and agent id."""
+
+    count: int = 0
+    failures: int = 0
+    amount: int = 0
+    latency_hist: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BOUNDS_MS) + 1))
+
+    def add(self, amount: int, latency_ms: int, success: bool):
+        self.count += 1
+        if success:
+            self.amount += amount
+        else:
+            self.failures += 1
+        self.latency_hist[bisect_left(LATENCY_BOUNDS_MS, latency_ms)] += 1
+
+    def merge(self, other: "RollupBucket"):
+        self.count += other.count
+        self.failures += other.failures
+        self.amount += other.amount
+        self.latency_hist = [a + b for a, b in zip(self.latency_hist, other.latency_hist)]
+
+    def latency_quantile(self, q: float) -> Optional[int]:
+        """Upper bound (ms) of the histogram bin holding quantile q, or None if empty.
+
+        Latencies above the last bound are reported as that bound.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.latency_hist):
+            seen += n
+            if seen >= rank and n:
+                return LATENCY_BOUNDS_MS[min(i, len(LATENCY_BOUNDS_MS) - 1)]
+        return LATENCY_BOUNDS_MS[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "amount": self.amount,
+            "latency_p50_ms": self.latency_quantile(0.5),
+            "latency_p99_ms": self.latency_quantile(0.99),
+        }
+
+
+class Rollups:
+    """In-memory minute/hour/day rollups with periodic flush to disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        retention: Optional[dict[str, int]] = None,
+    ):
+        self._path = Path(path)
+        self._flush_interval = flush_interval
+        self._retention = retention or DEFAULT_RETENTION
+        # granularity -> bucket start -> (mint, agent_id) -> bucket
+        self._buckets: dict[str, dict[int, dict[tuple[str, str], RollupBucket]]] = {
+            g: {} for g in GRANULARITIES
+        }
+        self._agent_ids: set[str] = set()
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _normalize_agent_id(self, agent_id: Optional[str]) -> str:
+        if not agent_id:
+            return UNKNOWN
+        if agent_id in self._agent_ids:
+            return agent_id
+        if not _AGENT_ID_PATTERN.match(agent_id) or len(self._agent_ids) >= MAX_AGENT_IDS:
+            return OTHER
+        self._agent_ids.add(agent_id)
+        return agent_id
+
+    def record(
+        self,
+        mint: Optional[str],
+        agent_id: Optional[str],
+        amount: int,
+        latency_ms: int,
+        success: bool,
+        ts: Optional[float] = None,
+    ):
+        """Add a redemption to the current minute, hour and day buckets."""
+        ts = time.time() if ts is None else ts
+        key = (mint or UNKNOWN, self._normalize_agent_id(agent_id))
+        for granularity, size in GRANULARITIES.items():
+            start = int(ts // size * size)
+            buckets = self._buckets[granularity]
+            if start not in buckets:
+                buckets[start] = {}
+                self._prune(granularity, start)
+            buckets[start].setdefault(key, RollupBucket()).add(amount, latency_ms, success)
+        self._dirty = True
+
+    def _prune(self, granularity: str, newest_start: int):
+        cutoff = newest_start - self._retention[granularity] * GRANULARITIES[granularity]
+        buckets = self._buckets[granularity]
+        for start in [s for s in buckets if s <= cutoff]:
+            del buckets[start]
+
+    def query(
+        self,
+        granularity: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        group_by: Iterable[str] = DIMENSIONS,
+        mint: Optional[str] = None,
+        agent_id: Optional[str] = None,
+    ) -> list[dict]:
+        """Get rollups per time bucket.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            since: Only buckets starting at or after this Unix timestamp
+            until: Only buckets starting before this Unix timestamp
+            group_by: Dimensions to keep ("mint", "agent_id"); others are summed
+            mint: Only this mint
+            agent_id: Only this agent id
+
+        Returns:
+            Rows sorted by bucket start, each with `start`, the grouped
+            dimensions and count/failures/amount/latency_p50_ms/latency_p99_ms
+        """
+        group_by = [d for d in DIMENSIONS if d in set(group_by)]
+        rows = []
+        for start in sorted(self._buckets[granularity]):
+            if (since is not None and start < since) or (until is not None and start >= until):
+                continue
+            merged: dict[tuple, RollupBucket] = {}
+            for (bucket_mint, bucket_agent), bucket in self._buckets[granularity][start].items():
+                if (mint is not None and bucket_mint != mint) or (agent_id is not None and bucket_agent != agent_id):
+                    continue
+                dims = {"mint": bucket_mint, "agent_id": bucket_agent}
+                group = tuple(dims[d] for d in group_by)
+                merged.setdefault(group, RollupBucket()).merge(bucket)
+            for group, bucket in sorted(merged.items()):
+                rows.append({"start": start, **dict(zip(group_by, group)), **bucket.summary()})
+        return rows
+
+    def _to_dict(self) -> dict:
+        return {
+            "version": ROLLUPS_VERSION,
+            "saved_at": time.time(),
+            "granularities": {
+                granularity: [
+                    {
+                        "start": start,
+                        "mint": key[0],
+                        "agent_id": key[1],
+                        "count": bucket.count,
+                        "failures": bucket.failures,
+                        "amount": bucket.amount,
+                        "latency_hist": bucket.latency_hist,
+                    }
+                    for start, dims in buckets.items()
+                    for key, bucket in dims.items()
+                ]
+                for granularity, buckets in self._buckets.items()
+            },
+        }
+
+    def _load(self):
+        try:
+            data = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"[Rollups] Could not read {self._path}: {e}")
+            return
+        if data.get("version") != ROLLUPS_VERSION:
+            logger.info(f"[Rollups] Ignoring rollups with unsupported version: {data.get('version')}")
+            return
+
+        loaded = 0
+        for granularity, rows in data.get("granularities", {}).items():
+            if granularity not in GRANULARITIES:
+                continue
+            for row in rows:
+                self._agent_ids.add(row["agent_id"])
+                self._buckets[granularity].setdefault(row["start"], {})[(row["mint"], row["agent_id"])] = RollupBucket(
+                    count=row["count"],
+                    failures=row["failures"],
+                    amount=row["amount"],
+                    latency_hist=row["latency_hist"],
+                )
+                loaded += 1
+        self._agent_ids -= {UNKNOWN, OTHER}
+        logger.info(f"[Rollups] Loaded {loaded} buckets from {self._path}")
+
+    def _write(self, data: dict):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp_path, self._path)
+
+    async def flush(self):
+        """Write rollups to disk if they changed since the last flush."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, self._to_dict())
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"[Rollups] Failed to write {self._path}: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """Load persisted rollups and start the periodic flush."""
+        if self._flush_task is not None:
+            return
+        await asyncio.to_thread(self._load)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the periodic flush and write pending changes."""
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        await self.flush()
@@ -0,0 +1,112 @@
+"""Multi-output swaps.
+
+`Wallet.split()` swaps proofs into exactly two sets (keep and send), with the
+send set split into powers of two of a single amount. Minting many tokens of
+given amounts that way costs one mint round trip per token.
+
+`swap_proofs()` performs a single `/v1/swap` whose outputs are arbitrary
+groups of amounts - e.g. change plus one group per requested token - and
+returns the new proofs regrouped the same way. Like `Wallet.split()` it uses
+the wallet's deterministic secrets, stores the new proofs and invalidates the
+inputs.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cashu.core.base import Proof
+    from cashu.wallet.wallet import Wallet
+
+# Outputs per swap request. Mints cap request arrays (nutshell: 1000 by
+# default); stay well below so inputs and change still fit.
+DEFAULT_MAX_SWAP_OUTPUTS = 500
+
+# Inputs per swap request when consolidating proofs
+DEFAULT_MAX_SWAP_INPUTS = 500
+
+# Outputs reserved for change in each swap
+CHANGE_OUTPUT_RESERVE = 64
+
+
+def output_amounts(amount: int) -> list[int]:
+    """Denominations (powers of two) needed for a token of `amount` sats."""
+    from cashu.core.split import amount_split
+
+    return amount_split(amount)
+
+
+def amount_covering_fees(wallet: "Wallet", amount: int) -> int:
+    """Smallest value whose proofs (in the active keyset) cover `amount` plus
+    their own input fees when spent, e.g. as melt inputs."""
+    keyset = wallet.keysets[wallet.keyset_id]
+    value = amount
+    while value - wallet.get_fees_for_keyset(output_amounts(value), keyset) < amount:
+        value += 1
+    return value
+
+
+def plan_batches(amounts: list[int], max_outputs: int = DEFAULT_MAX_SWAP_OUTPUTS) -> list[list[int]]:
+    """Group token amounts into batches that each fit in one swap.
+
+    Args:
+        amounts: Requested token amounts, in order
+        max_outputs: Maximum outputs per swap (including change)
+
+    Returns:
+        Consecutive batches of `amounts`
+    """
+    budget = max(max_outputs - CHANGE_OUTPUT_RESERVE, 1)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for amount in amounts:
+        needed = len(output_amounts(amount))
+        if current and used + needed > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(amount)
+        used += needed
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def swap_proofs(
+    wallet: "Wallet",
+    proofs: list["Proof"],
+    output_groups: list[list[int]],
+) -> list[list["Proof"]]:
+    """Swap proofs for new proofs of the given amounts in one mint request.
+
+    Args:
+        wallet: Loaded wallet
+        proofs: Input proofs; their value must equal the outputs plus input fees
+        output_groups: Output amounts, grouped (e.g. [change, token 1, token 2])
+
+    Returns:
+        New proofs, one list per output group
+    """
+    from cashu.wallet.v1_api import LedgerAPI
+
+    amounts = [amount for group in output_groups for amount in group]
+    secrets, rs, derivation_paths = await wallet.generate_n_secrets(len(amounts))
+    await wallet._check_used_secrets(secrets)
+    outputs, rs = wallet._construct_outputs(amounts, secrets, rs, wallet.keyset_id)
+    proofs = wallet.sign_proofs_inplace_swap(list(proofs), outputs)
+
+    # Mints expect outputs sorted by amount; remember the original positions
+    order = sorted(range(len(outputs)), key=lambda i: outputs[i].amount)
+    sorted_promises = await LedgerAPI.split(wallet, proofs, [outputs[i] for i in order])
+    promises = [None] * len(outputs)
+    for position, index in enumerate(order):
+        promises[index] = sorted_promises[position]
+
+    new_proofs = await wallet._construct_proofs(promises, secrets, rs, derivation_paths)
+    await wallet.invalidate(proofs)
+
+    groups = []
+    offset = 0
+    for group in output_groups:
+        groups.append(new_proofs[offset:offset + len(group)])
+        offset += len(group)
+    return groups
@@ -0,0 +1,74 @@
+"""Tests for learned Lightning fee estimates in services/fee_model.py."""
+
+import pytest
+
+from src.services.fee_model import MIN_SAMPLES, FeeModel
+from src.services.lnurl import estimate_lightning_fee
+
+MINT = "http://mint.test"
+ALICE = "alice@wallet.test"
+BOB = "bob@other.test"
+
+
+@pytest.fixture
+def model(tmp_path) -> FeeModel:
+    return FeeModel(tmp_path / "fee_model.json")
+
+
+def record_rate(model: FeeModel, ln_address: str, fee_ppm: int, amounts=(1000, 2000, 3000, 4000, 5000)):
+    for amount in amounts:
+        model.record(MINT, ln_address, amount, fee_reserve=amount * fee_ppm // 1_000_000, predicted_fee=0)
+
+
+def test_falls_back_to_static_estimate(model):
+    assert model.estimate(1000, MINT, ALICE) == estimate_lightning_fee(1000)
+
+    record_rate(model, ALICE, 5000, amounts=(1000,) * (MIN_SAMPLES - 1))
+    assert model.estimate(1000, MINT, ALICE) == estimate_lightning_fee(1000)
+
+
+def test_learned_rate_per_destination(model):
+    record_rate(model, ALICE, 5000)
+    assert model.estimate(10_000, MINT, ALICE) == 50
+    # Too few samples for bob: the mint's samples are used
+    assert model.estimate(10_000, MINT, BOB) == 50
+
+
+def test_new_sample_invalidates_cached_fit(model):
+    record_rate(model, ALICE, 5000)
+    assert model.estimate(10_000, MINT, ALICE) == 50
+
+    record_rate(model, ALICE, 50_000)
+    assert model.estimate(10_000, MINT, ALICE) > 50
+    # The mint-wide fit behind other destinations is refreshed too
+    assert model.estimate(10_000, MINT, BOB) == model.estimate(10_000, MINT, ALICE)
+
+
+async def test_flush_and_load_restore_samples(model, tmp_path):
+    record_rate(model, ALICE, 5000)
+    await model.flush()
+
+    loaded = FeeModel(tmp_path / "fee_model.json")
+    await loaded.load()
+    assert loaded.estimate(10_000, MINT, ALICE) == model.estimate(10_000, MINT, ALICE)
+
+
+def test_floor_only_estimate_never_below_floor(model):
+    for amount in (100, 200, 300, 400, 500):
+        model.record(MINT, ALICE, amount, fee_reserve=10, predicted_fee=10)
+
+    assert model.estimate(500, MINT, ALICE) == 10
+    assert model.estimate(510, MINT, ALICE) == 10
+    assert model.estimate(100_000, MINT, ALICE) == estimate_lightning_fee(100_000)
+
+
+@pytest.mark.parametrize("fee_ppm", [None, 0, 5000, 200_000])
+def test_estimate_is_monotonic(model, fee_ppm):
+    if fee_ppm == 0:
+        for amount in (100, 200, 300, 400, 500):
+            model.record(MINT, ALICE, amount, fee_reserve=10, predicted_fee=10)
+    elif fee_ppm is not None:
+        record_rate(model, ALICE, fee_ppm)
+
+    estimates = [model.estimate(amount, MINT, ALICE) for amount in range(1, 20_000)]
+    assert all(a <= b for a, b in zip(estimates, estimates[1:]))
@@ -0,0 +1,77 @@
+"""Tests for the SQLite transaction ledger in services/ledger.py."""
+
+import asyncio
+
+import pytest
+
+from src.services.ledger import Ledger, LedgerEntry
+
+
+async def open_ledger(path, **kwargs) -> Ledger:
+    ledger = Ledger(path, **kwargs)
+    await ledger.start()
+    return ledger
+
+
+async def test_stop_flushes_in_flight_and_queued_entries(tmp_path):
+    # A long flush interval keeps the writer holding its first entry until stop()
+    ledger = await open_ledger(tmp_path / "ledger.sqlite3", flush_interval=60)
+    ledger.record(LedgerEntry(type="redeem", success=True, amount=1))
+    await asyncio.sleep(0)  # writer takes the first entry
+    for amount in (2, 3):
+        ledger.record(LedgerEntry(type="redeem", success=True, amount=amount))
+    await ledger.stop()
+
+    reopened = await open_ledger(tmp_path / "ledger.sqlite3")
+    entries, _ = await reopened.query()
+    await reopened.stop()
+    assert [entry.amount for entry in entries] == [3, 2, 1]
+
+
+async def test_stop_flushes_more_than_one_batch(tmp_path):
+    ledger = await open_ledger(tmp_path / "ledger.sqlite3", batch_size=10, flush_interval=60)
+    for amount in range(25):
+        ledger.record(LedgerEntry(type="withdraw", success=True, amount=amount))
+    await ledger.stop()
+
+    reopened = await open_ledger(tmp_path / "ledger.sqlite3")
+    entries, _ = await reopened.query(limit=100)
+    await reopened.stop()
+    assert len(entries) == 25
+
+
+@pytest.fixture
+async def filled_ledger(tmp_path):
+    ledger = await open_ledger(tmp_path / "ledger.sqlite3", flush_interval=60)
+    for i in range(30):
+        ledger.record(LedgerEntry(type="payout" if i % 3 == 0 else "redeem", success=True, amount=i, details={"i": i}))
+    await ledger.stop()
+    ledger = await open_ledger(tmp_path / "ledger.sqlite3")
+    yield ledger
+    await ledger.stop()
+
+
+async def test_keyset_pagination_with_type_filter(filled_ledger):
+    pages, before = [], None
+    while True:
+        entries, before = await filled_ledger.query(before=before, limit=4, entry_type="payout")
+        pages.append(entries)
+        if before is None:
+            break
+
+    amounts = [entry.amount for page in pages for entry in page]
+    assert amounts == [27, 24, 21, 18, 15, 12, 9, 6, 3, 0]
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert all(entry.type == "payout" for page in pages for entry in page)
+
+
+async def test_pages_are_newest_first_and_round_trip(filled_ledger):
+    entries, before = await filled_ledger.query(limit=5)
+    assert [entry.amount for entry in entries] == [29, 28, 27, 26, 25]
+    assert before == entries[-1].id
+    assert entries[0].details == {"i": 29}
+    assert entries[0].success is True
+
+    last_page, end = await filled_ledger.query(before=entries[-1].id, limit=100)
+    assert len(last_page) == 25
+    assert end is None
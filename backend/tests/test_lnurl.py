@@ -0,0 +1,75 @@
+"""Tests for payout splitting in services/lnurl.py."""
+
+import random
+
+import pytest
+
+from src.services.fee_model import FeeModel
+from src.services.lnurl import LNURLError, estimate_lightning_fee, plan_payout_parts
+
+MINT = "http://mint.test"
+ADDRESS = "alice@wallet.test"
+
+
+def pay_data(min_sats: int, max_sats: int) -> dict:
+    return {"callback_url": "https://wallet.test/cb", "min_sendable": min_sats * 1000, "max_sendable": max_sats * 1000}
+
+
+def test_single_part_when_amount_fits():
+    assert plan_payout_parts(400, pay_data(1, 1000)) == [(400, 400 - estimate_lightning_fee(400))]
+
+
+def test_parts_fit_and_cover_amount():
+    parts = plan_payout_parts(3500, pay_data(1, 1000))
+    assert len(parts) == 4
+    assert sum(total for total, _ in parts) == 3500
+    assert all(invoice <= 1000 for _, invoice in parts)
+
+
+def test_parts_capped_at_max_parts():
+    parts = plan_payout_parts(100_000, pay_data(1, 1000), max_parts=3)
+    assert len(parts) == 3
+    assert all(invoice <= 1000 for _, invoice in parts)
+
+
+def test_parts_below_min_sendable_rejected():
+    with pytest.raises(LNURLError):
+        plan_payout_parts(30, pay_data(20, 20))
+
+
+def test_floor_only_fee_model(tmp_path):
+    # Only the mint's 10 sat floor is learned, from quotes up to 500 sats
+    model = FeeModel(tmp_path / "fee_model.json")
+    for amount in (100, 200, 300, 400, 500):
+        model.record(MINT, ADDRESS, amount, fee_reserve=10, predicted_fee=10)
+
+    parts = plan_payout_parts(
+        2040, pay_data(1, 500), fee_estimate=lambda amount: model.estimate(amount, MINT, ADDRESS)
+    )
+
+    assert sum(total for total, _ in parts) == 2040
+    assert all(invoice <= 500 for _, invoice in parts)
+
+
+def test_fee_jump_keeps_every_part_within_max():
+    # A fee that jumps well above a sat per sat at 1000
+    def fee_estimate(amount: int) -> int:
+        return 5 if amount <= 1000 else 200
+
+    parts = plan_payout_parts(5000, pay_data(1, 990), fee_estimate=fee_estimate)
+    assert sum(total for total, _ in parts) == 5000
+    assert all(invoice <= 990 for _, invoice in parts)
+
+
+def test_random_fee_rates_fit():
+    rng = random.Random(1)
+    for _ in range(500):
+        max_sats = rng.randint(1, 5000)
+        fee_ppm = rng.choice([0, 1000, 10_000, 50_000])
+        floor = rng.randint(0, 20)
+        parts = plan_payout_parts(
+            rng.randint(1, 50_000),
+            pay_data(1, max_sats),
+            fee_estimate=lambda amount: max(floor, amount * fee_ppm // 1_000_000),
+        )
+        assert all(invoice <= max_sats for _, invoice in parts)
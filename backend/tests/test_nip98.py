@@ -0,0 +1,100 @@
+"""Tests for NIP-98 replay protection in auth/nip98.py."""
+
+import base64
+import hashlib
+import json
+import time
+
+import pytest
+from secp256k1 import PrivateKey
+
+from src.auth import nip98
+from src.auth.nip98 import SeenEventCache, verify_nip98_event
+
+URL = "http://testserver/api/admin/stats"
+
+
+@pytest.fixture(scope="module")
+def private_key() -> PrivateKey:
+    return PrivateKey()
+
+
+def make_header(private_key: PrivateKey, url: str, method: str, created_at: int | None = None) -> str:
+    """Signed NIP-98 Authorization header."""
+    event = {
+        "pubkey": private_key.pubkey.serialize()[1:].hex(),
+        "created_at": created_at or int(time.time()),
+        "kind": nip98.NIP98_KIND,
+        "tags": [["u", url], ["method", method], ["nonce", str(time.time_ns())]],
+        "content": "",
+    }
+    serialized = json.dumps(
+        [0, event["pubkey"], event["created_at"], event["kind"], event["tags"], event["content"]],
+        separators=(",", ":"),
+    )
+    event["id"] = hashlib.sha256(serialized.encode()).hexdigest()
+    event["sig"] = private_key.schnorr_sign(bytes.fromhex(event["id"]), bip340tag=None, raw=True).hex()
+    return "Nostr " + base64.b64encode(json.dumps(event).encode()).decode()
+
+
+def test_non_idempotent_reuse_rejected(private_key):
+    seen = SeenEventCache()
+    header = make_header(private_key, URL, "POST")
+
+    assert verify_nip98_event(header, URL, "POST", seen_events=seen).valid
+    result = verify_nip98_event(header, URL, "POST", seen_events=seen)
+    assert not result.valid
+    assert result.error == "Event already used"
+
+
+def test_identical_get_retry_accepted_without_reverifying(private_key, monkeypatch):
+    seen = SeenEventCache()
+    header = make_header(private_key, URL, "GET")
+    assert verify_nip98_event(header, URL, "GET", seen_events=seen).valid
+
+    def fail(event):
+        raise AssertionError("signature verified again")
+
+    monkeypatch.setattr(nip98, "verify_event_signature", fail)
+    assert verify_nip98_event(header, URL, "GET", seen_events=seen).valid
+
+
+def test_get_event_cannot_be_reused_for_post(private_key):
+    seen = SeenEventCache()
+    header = make_header(private_key, URL, "GET")
+    assert verify_nip98_event(header, URL, "GET", seen_events=seen).valid
+
+    assert verify_nip98_event(header, URL, "POST", seen_events=seen).error == "Event already used"
+
+
+def test_add_reports_duplicates():
+    seen = SeenEventCache()
+    assert seen.add("a", "fingerprint", int(time.time()))
+    assert not seen.add("a", "fingerprint", int(time.time()))
+    assert seen.get("a") == "fingerprint"
+
+
+def test_expired_buckets_evicted(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(nip98.time, "time", lambda: now)
+    seen = SeenEventCache(expiry_seconds=60, bucket_seconds=10)
+    seen.add("old", "f", int(now) - 50)
+    seen.add("new", "f", int(now))
+    assert len(seen) == 2
+
+    # 30s later "old" (created 80s ago) can no longer pass the expiry check
+    now += 30
+    assert seen.get("old") is None
+    assert seen.get("new") == "f"
+    assert len(seen) == 1
+
+
+def test_max_entries_evicts_oldest_bucket():
+    now = int(time.time())
+    seen = SeenEventCache(expiry_seconds=60, bucket_seconds=10, max_entries=3)
+    for i, age in enumerate((40, 30, 20, 10)):
+        seen.add(f"e{i}", "f", now - age)
+
+    assert len(seen) == 3
+    assert seen.get("e0") is None
+    assert seen.get("e3") == "f"
@@ -0,0 +1,77 @@
+"""Tests for admin session tokens in auth/session.py."""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from src.auth import admins, session
+from src.auth.session import SessionManager
+from src.routes.admin import verify_admin_auth
+
+PUBKEY = "ab" * 32
+
+
+@pytest.fixture
+def manager() -> SessionManager:
+    return SessionManager(secret=b"test-secret", ttl_seconds=60)
+
+
+def test_issued_token_verifies(manager):
+    token, issued = manager.issue(PUBKEY)
+    verified = manager.verify(token)
+    assert verified == issued
+    assert verified.pubkey == PUBKEY
+
+
+def test_tampered_signature_rejected(manager):
+    token, _ = manager.issue(PUBKEY)
+    payload, signature = token.split(".")
+    tampered = ("B" if signature[0] == "A" else "A") + signature[1:]
+    assert manager.verify(f"{payload}.{tampered}") is None
+
+
+def test_tampered_payload_rejected(manager):
+    token, _ = manager.issue(PUBKEY)
+    other, _ = manager.issue("cd" * 32)
+    assert manager.verify(f"{other.split('.')[0]}.{token.split('.')[1]}") is None
+
+
+def test_other_secret_rejected(manager):
+    token, _ = manager.issue(PUBKEY)
+    assert SessionManager(secret=b"other-secret", ttl_seconds=60).verify(token) is None
+
+
+def test_malformed_token_rejected(manager):
+    assert manager.verify("not-a-token") is None
+
+
+def test_expired_token_rejected(manager, monkeypatch):
+    token, _ = manager.issue(PUBKEY)
+    later = time.time() + 61
+    monkeypatch.setattr(session.time, "time", lambda: later)
+    assert manager.verify(token) is None
+
+
+def test_revoked_token_rejected(manager):
+    token, issued = manager.issue(PUBKEY)
+    other_token, _ = manager.issue(PUBKEY)
+    manager.revoke(issued)
+    assert manager.verify(token) is None
+    assert manager.verify(other_token) is not None
+
+
+async def test_session_ends_when_pubkey_leaves_allow_list(manager, monkeypatch):
+    monkeypatch.setattr(session, "_session_manager", manager)
+    monkeypatch.setattr(admins, "_admin_pubkeys", None)
+    monkeypatch.delenv("ADMIN_NPUBS_FILE", raising=False)
+    monkeypatch.setenv("ADMIN_NPUBS", PUBKEY)
+    token, _ = manager.issue(PUBKEY)
+
+    assert (await verify_admin_auth(None, f"Bearer {token}")).pubkey == PUBKEY
+
+    monkeypatch.setenv("ADMIN_NPUBS", "cd" * 32)
+    admins.reload_admin_pubkeys()
+    with pytest.raises(HTTPException) as excinfo:
+        await verify_admin_auth(None, f"Bearer {token}")
+    assert excinfo.value.status_code == 401
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Profile startup import time of a module and enforce an import-time budget.
+
+Imports the module in a fresh interpreter with `python -X importtime`, run
+from the package directory given by --cwd, reports the slowest imports and
+checks that the --forbid modules are not loaded at startup and that the
+import stays within --budget-ms.
+
+agents/scripts/profile_imports.py and backend/scripts/profile_imports.py call
+this with each package's entry module and heavy dependencies.
+
+Usage:
+    python scripts/profile_imports.py --cwd backend --module src.main --forbid cashu,httpx
+    python scripts/profile_imports.py --cwd agents --module src.plebchat.graph --top 50
+    python scripts/profile_imports.py --cwd backend --module src.main --budget-ms 1500
+    python scripts/profile_imports.py --cwd backend --module src.main --budget-ms 0     # no budget
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+# Import-time budget when --budget-ms is not given
+DEFAULT_BUDGET_MS = 2000.0
+
+
+def profile_import(module: str, cwd: Path) -> tuple[list[tuple[int, int, str]], set[str]]:
+    """Import `module` in a fresh interpreter started in `cwd`.
+
+    Returns:
+        Tuple of ([(self_us, cumulative_us, name), ...], loaded top-level packages)
+    """
+    probe = (
+        f"import {module}, sys; "
+        "print('\\n'.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr, file=sys.stderr)
+        raise SystemExit(f"Failed to import {module}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows, set(proc.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile module import time",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--module", "-m", required=True, help="Module to import, e.g. src.main")
+    parser.add_argument("--cwd", type=Path, default=Path.cwd(), help="Directory to import from (default: current)")
+    parser.add_argument("--top", type=int, default=25, help="Number of imports to show")
+    parser.add_argument("--runs", type=int, default=3, help="Runs to take the fastest of (default: 3)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Fail if the import takes longer than this, 0 to disable (default: {DEFAULT_BUDGET_MS:.0f})",
+    )
+    parser.add_argument(
+        "--forbid",
+        default="",
+        help="Comma-separated packages that must not be loaded at startup",
+    )
+    args = parser.parse_args()
+
+    # Take the fastest run to reduce noise from disk cache and CPU contention
+    best_rows, best_total, loaded = None, 0, set()
+    for _ in range(max(args.runs, 1)):
+        rows, loaded = profile_import(args.module, args.cwd)
+        total = next((c for _, c, n in rows if n.strip() == args.module), 0)
+        if best_rows is None or total < best_total:
+            best_rows, best_total = rows, total
+
+    print(f"{'self ms':>10} {'cumul ms':>10}  module")
+    print("-" * 70)
+    for self_us, cumulative_us, name in sorted(best_rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}  {name}")
+    print("-" * 70)
+    total_ms = best_total / 1000
+    print(f"Total import time for {args.module}: {total_ms:.1f} ms (best of {args.runs})")
+
+    failures = []
+    forbidden = [m.strip() for m in args.forbid.split(",") if m.strip()]
+    eager = sorted(m for m in forbidden if m in loaded)
+    if eager:
+        failures.append(f"Heavy modules imported at startup: {', '.join(eager)}")
+    if args.budget_ms and total_ms > args.budget_ms:
+        failures.append(f"Import time {total_ms:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())